@@ -0,0 +1,239 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import string
+import sys
+import time
+import tracemalloc
+
+from tfidf import Document
+from tfidf import Corpus
+
+#(number of documents, words per document) of each scale
+SCALES = {
+    'small': (200, 20),
+    'medium': (2000, 50),
+    'large': (10000, 100),
+}
+
+#benchmarks which do not depend on the ngram length, run only for the first one
+N_INDEPENDENT = ('document_init', 'document_init_unvalidated')
+
+def vocabulary(size, seed):
+    '''
+    Generates a vocabulary of distinct lowercase words.
+
+            Parameters:
+                    size (int): Number of words
+                    seed (int): Seed of the random generator
+            Returns:
+                    (list(str)): words of the vocabulary
+    '''
+    rng = random.Random(seed)
+    words = dict()
+    while len(words) < size:
+        words[''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 10)))] = None
+    return list(words)
+
+def contents(n_documents, n_words, seed, vocabulary_size=20000):
+    '''
+    Generates the contents of a synthetic corpus whose word frequencies follow Zipf's law, as in natural language.
+    The same arguments always generate the same contents.
+
+            Parameters:
+                    n_documents (int): Number of documents
+                    n_words (int): Average number of words of a document, the lengths vary between half and one and a half of it
+                    seed (int): Seed of the random generator
+                    vocabulary_size (int): Number of distinct words
+            Returns:
+                    (list(str)): contents of the documents
+    '''
+    words = vocabulary(vocabulary_size, seed)
+    weights = [1/(rank + 1) for rank in range(len(words))]
+    rng = random.Random(seed)
+    return [' '.join(rng.choices(words, weights, k=rng.randint(max(4, n_words//2), max(4, n_words*3//2)))) for _ in range(n_documents)]
+
+def measure(setup, repeat):
+    '''
+    Runs the call prepared by the given setup function the given number of times, then once more with tracemalloc to find its peak memory.
+    Only the call is timed and traced, and timings are made without tracemalloc since it slows down allocations.
+    The inputs and the result of the traced call are kept until the peak is read, so that freeing them does not hide the allocation.
+
+            Parameters:
+                    setup (callable): Function with no arguments, which creates fresh inputs and returns the call with no arguments to measure
+                    repeat (int): Number of timed runs
+            Returns:
+                    (dict): best and median seconds and the peak number of allocated bytes
+    '''
+    timings = list()
+    for _ in range(repeat):
+        call = setup()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+    call = setup()
+    tracemalloc.start()
+    result = call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del call, result
+    return {'best_seconds': min(timings), 'median_seconds': statistics.median(timings), 'peak_bytes': peak}
+
+def features():
+    '''
+    Detects the features of the installed version of the package, so that older versions can be benchmarked for a comparison.
+
+            Returns:
+                    (set(str)): names of the available features
+    '''
+    available = set()
+    try:
+        Document('lorem ipsum dolor', validate=False)
+        available.add('validate')
+    except TypeError:
+        pass
+    for name in ('document_frequency', 'fit'):
+        if hasattr(Corpus, name):
+            available.add(name)
+    try:
+        Corpus([Document('lorem ipsum dolor')]).tf_idf([Document('lorem ipsum dolor')], 1, output='csr')
+        available.add('csr_output')
+    except TypeError:
+        pass
+    return available
+
+def benchmarks(texts, n, available):
+    '''
+    Returns the benchmarked hot paths for the given contents, each with the number of items it processes and the features it needs.
+    Every benchmark is a setup function which creates its own documents, corpora and models, so that the ngrams cached by earlier runs
+    are not reused, and returns the benchmarked call, so that only the call is measured.
+
+            Parameters:
+                    texts (list(str)): Contents of the documents
+                    n (int): Ngram length
+                    available (set(str)): Names of the available features
+            Returns:
+                    (dict(str, tuple(callable, int, tuple(str)))): setup function, number of processed items and needed features of each benchmark
+    '''
+    queries = texts[:max(1, len(texts)//10)]
+    #the validation is skipped where it is optional, so that it is not measured by the other benchmarks
+    kwargs = {'validate': False} if 'validate' in available else dict()
+    #older versions only return dense rows
+    output = {'output': 'csr'} if 'csr_output' in available else dict()
+
+    def documents(contents):
+        return [Document(t, **kwargs) for t in contents]
+
+    def document_init():
+        return lambda: [Document(t) for t in texts]
+
+    def document_init_unvalidated():
+        return lambda: [Document(t, validate=False) for t in texts]
+
+    def n_gram():
+        docs = documents(texts)
+        return lambda: [d.n_gram(n) for d in docs]
+
+    def document_frequency():
+        corpus = Corpus(documents(texts))
+        return lambda: corpus.document_frequency(n)
+
+    def fit():
+        corpus = Corpus(documents(texts))
+        return lambda: corpus.fit(n)
+
+    def tf_idf():
+        corpus = Corpus(documents(texts))
+        docs = documents(queries)
+        return lambda: corpus.tf_idf(docs, n, **output)
+
+    def transform():
+        model = Corpus(documents(texts)).fit(n)
+        docs = documents(queries)
+        return lambda: model.transform(docs, output='csr')
+
+    return {
+        'document_init': (document_init, len(texts), ()),
+        'document_init_unvalidated': (document_init_unvalidated, len(texts), ('validate',)),
+        'n_gram': (n_gram, len(texts), ()),
+        'document_frequency': (document_frequency, len(texts), ('document_frequency',)),
+        'fit': (fit, len(texts), ('fit',)),
+        'tf_idf': (tf_idf, len(texts), ()),
+        'transform': (transform, len(queries), ('fit',)),
+    }
+
+def run(scales, ns, repeat, seed, selected=None):
+    '''
+    Runs the benchmarks for every combination of the given scales and ngram lengths.
+
+            Parameters:
+                    scales (list(str)): Names of the scales in SCALES
+                    ns (list(int)): Ngram lengths
+                    repeat (int): Number of timed runs of each benchmark
+                    seed (int): Seed of the synthetic corpora
+                    selected (list(str)): Names of the benchmarks to run, None for all of them
+            Returns:
+                    (list(dict)): one result for each benchmark, scale and ngram length
+    '''
+    results = list()
+    available = features()
+    for scale in scales:
+        n_documents, n_words = SCALES[scale]
+        texts = contents(n_documents, n_words, seed)
+        for n in ns:
+            for name, (setup, items, needed) in benchmarks(texts, n, available).items():
+                if (selected is not None and name not in selected) or (name in N_INDEPENDENT and n != ns[0]):
+                    continue
+                if not all(feature in available for feature in needed):
+                    print(f"{name:<26} {scale:<7} n={n}  skipped, needs {', '.join(needed)}", file=sys.stderr)
+                    continue
+                result = {'benchmark': name, 'scale': scale, 'n_documents': n_documents, 'n_words': n_words, 'n': n}
+                result.update(measure(setup, repeat))
+                result['items_per_second'] = items/result['best_seconds']
+                results.append(result)
+                print(f"{name:<26} {scale:<7} n={n}  {result['best_seconds']*1000:10.2f} ms  "
+                      f"{result['items_per_second']:12.0f} docs/s  {result['peak_bytes']/2**20:8.1f} MiB", file=sys.stderr)
+    return results
+
+def compare(results, baseline):
+    '''
+    Prints the speedup of each result over the matching result of a previous run, e.g. of another version of the package.
+
+            Parameters:
+                    results (list(dict)): Results of this run
+                    baseline (dict): Contents of the json file of a previous run
+    '''
+    previous = {(r['benchmark'], r['scale'], r['n']): r for r in baseline['results']}
+    for r in results:
+        old = previous.get((r['benchmark'], r['scale'], r['n']))
+        if old is not None:
+            print(f"{r['benchmark']:<26} {r['scale']:<7} n={r['n']}  speedup {old['best_seconds']/r['best_seconds']:6.2f}x  "
+                  f"memory {r['peak_bytes']/max(1, old['peak_bytes']):6.2f}x", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the hot paths of the package on synthetic corpora.')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small', 'medium'], help='corpus scales to run')
+    parser.add_argument('--n', nargs='+', type=int, default=[1, 2], help='ngram lengths to run')
+    parser.add_argument('--benchmarks', nargs='+', default=None, help='names of the benchmarks to run, all of them by default')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs of each benchmark')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic corpora')
+    parser.add_argument('--output', default=None, help='path of the json file to write the results to')
+    parser.add_argument('--compare', default=None, help='path of the json file of a previous run to compare with')
+    args = parser.parse_args()
+
+    results = run(args.scales, args.n, args.repeat, args.seed, args.benchmarks)
+    report = {'python': platform.python_version(), 'platform': platform.platform(), 'seed': args.seed, 'repeat': args.repeat,
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()), 'results': results}
+    if args.output is not None:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare is not None:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
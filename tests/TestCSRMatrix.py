@@ -0,0 +1,87 @@
+import unittest
+from tfidf import CSRMatrix
+import numpy as np
+
+class TestCSRMatrix(unittest.TestCase):
+    def test_initialization(self):
+        #initialization w/acceptable input
+        matrix = CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 2, 3], (3, 3))
+        self.assertEqual((3, 3), matrix.shape, 'Initialization test failed.')
+        self.assertEqual(3, matrix.nnz, 'Initialization test failed.')
+
+        #inconsistent arrays
+        with self.assertRaises(ValueError, msg='Initialization test failed because CSRMatrix accepted an indptr inconsistent with the shape.'):
+            CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 3], (3, 3))
+        with self.assertRaises(ValueError, msg='Initialization test failed because CSRMatrix accepted data and indices of different lengths.'):
+            CSRMatrix([1.0, 2.0], [0, 2, 1], [0, 2, 2, 3], (3, 3))
+        with self.assertRaises(ValueError, msg='Initialization test failed because CSRMatrix accepted an indptr inconsistent with data.'):
+            CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 2, 2], (3, 3))
+
+    def test_toarray(self):
+        matrix = CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 2, 3], (3, 3))
+        expected = np.array([[1.0, 0.0, 2.0], [0.0, 0.0, 0.0], [0.0, 3.0, 0.0]])
+
+        self.assertTrue(np.array_equal(expected, matrix.toarray()), 'To array test failed.')
+
+    def test_vstack(self):
+        m1 = CSRMatrix([1.0, 2.0], [0, 2], [0, 2, 2], (2, 3))
+        m2 = CSRMatrix([3.0], [1], [0, 1], (1, 3))
+        matrix = CSRMatrix.vstack([m1, m2])
+
+        self.assertEqual((3, 3), matrix.shape, 'Vstack test failed.')
+        self.assertTrue(np.array_equal(np.vstack([m1.toarray(), m2.toarray()]), matrix.toarray()), 'Vstack test failed.')
+        with self.assertRaises(ValueError, msg='Vstack test failed because matrices with different numbers of columns are stacked.'):
+            CSRMatrix.vstack([m1, CSRMatrix([3.0], [1], [0, 1], (1, 2))])
+        with self.assertRaises(ValueError, msg='Vstack test failed because an empty list is stacked.'):
+            CSRMatrix.vstack([])
+
+    def test_to_scipy(self):
+        matrix = CSRMatrix([1.0, 2.0, 3.0], [0, 2, 1], [0, 2, 2, 3], (3, 3))
+        try:
+            import scipy.sparse
+        except ImportError:
+            with self.assertRaises(ImportError, msg='To scipy test failed because ImportError is not raised without scipy.'):
+                matrix.to_scipy()
+        else:
+            self.assertTrue(np.array_equal(matrix.toarray(), matrix.to_scipy().toarray()), 'To scipy test failed.')
+
+    def test_cosine_similarity(self):
+        rng = np.random.default_rng(3)
+        dense = rng.random((40, 30))*(rng.random((40, 30)) < 0.15)
+        dense[5] = 0
+        matrix = CSRMatrix(dense[dense != 0], np.nonzero(dense)[1], np.concatenate([[0], np.cumsum(np.count_nonzero(dense, axis=1))]), dense.shape)
+        norms = np.linalg.norm(dense, axis=1, keepdims=True)
+        normalized = dense/np.where(norms == 0, 1, norms)
+        expected = normalized @ normalized.T
+
+        #any block size gives the same similarities
+        for max_memory in (1, 1000, 2**28):
+            similarities = matrix.cosine_similarity(max_memory=max_memory)
+            self.assertEqual((40, 40), similarities.shape, 'Cosine similarity test failed.')
+            self.assertTrue(np.allclose(expected, similarities.toarray()), f'Cosine similarity test failed for max_memory={max_memory}.')
+        self.assertEqual(np.count_nonzero(expected), matrix.cosine_similarity().nnz, 'Cosine similarity test failed because zeros are stored.')
+
+        #query rows against the matrix
+        query = CSRMatrix.vstack([matrix, matrix]).cosine_similarity(matrix, max_memory=500)
+        self.assertTrue(np.allclose(np.vstack([expected, expected]), query.toarray()), 'Cosine similarity test failed for another matrix.')
+
+        #threshold and top k
+        similarities = matrix.cosine_similarity(threshold=0.3, top_k=3, max_memory=1000).toarray()
+        for row, expected_row in zip(similarities, expected):
+            kept = np.sort(expected_row[expected_row >= 0.3])[::-1][:3]
+            self.assertTrue(np.allclose(kept, np.sort(row[row != 0])[::-1]), 'Cosine similarity test failed for threshold and top_k.')
+
+        #workers
+        self.assertTrue(np.allclose(expected, matrix.cosine_similarity(max_memory=1000, workers=2).toarray()), 'Cosine similarity test failed for workers.')
+
+        with self.assertRaises(ValueError, msg='Cosine similarity test failed because matrices with different numbers of columns are accepted.'):
+            matrix.cosine_similarity(CSRMatrix([1.0], [0], [0, 1], (1, 2)))
+        with self.assertRaises(TypeError, msg='Cosine similarity test failed because a dense array is accepted.'):
+            matrix.cosine_similarity(dense)
+        with self.assertRaises(ValueError, msg='Cosine similarity test failed because 0 is accepted as top_k.'):
+            matrix.cosine_similarity(top_k=0)
+        with self.assertRaises(ValueError, msg='Cosine similarity test failed because 0 is accepted as max_memory.'):
+            matrix.cosine_similarity(max_memory=0)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -1,8 +1,12 @@
 import unittest
 from tfidf import Document
 from tfidf import Corpus
+from tfidf import Profiler
 import math
 import numpy as np
+import os
+import subprocess
+import sys
 
 class TestCorpus(unittest.TestCase):
     def test_initialization(self):
@@ -130,6 +134,122 @@ class TestCorpus(unittest.TestCase):
         with self.assertRaises(TypeError, msg='Exists test failed because exists accepted str as input.'):
             corpus.exists([d1, 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua'])          
 
+    def test_document_id(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        d4 = Document('excepteur sint occaecat cupidatat non proident sunt in culpa qui officia deserunt mollit anim id est laborum')
+        corpus = Corpus([d1, d2])
+
+        id1, id2 = corpus.document_id(d1), corpus.document_id(d2)
+        self.assertNotEqual(id1, id2, 'Document id test failed.')
+        self.assertIs(d1, corpus.document(id1), 'Document id test failed.')
+
+        #ids do not change with additions and removals
+        corpus.add_documents([d3, d4])
+        corpus.remove_documents([d1])
+        self.assertEqual(id2, corpus.document_id(d2), 'Document id test failed because the id of a document is changed.')
+        self.assertEqual(4, len(set(corpus.document_id(d) for d in (d2, d3, d4)) | {id1}), 'Document id test failed because an id is reused.')
+        self.assertEqual((d2, d3, d4), corpus.documents, 'Document id test failed.')
+
+        with self.assertRaises(ValueError, msg='Document id test failed because a removed document has an id.'):
+            corpus.document_id(d1)
+        with self.assertRaises(ValueError, msg='Document id test failed because a removed id has a document.'):
+            corpus.document(id1)
+
+    def test_document_frequency(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        d4 = Document('excepteur sint occaecat cupidatat non proident sunt in culpa qui officia deserunt mollit anim id est laborum')
+        corpus = Corpus([d1, d2])
+
+        index = corpus.document_frequency(1)
+        self.assertIs(index, corpus.document_frequency(1), 'Document frequency test failed because the index is rebuilt.')
+        self.assertEqual(2, index.n_documents, 'Document frequency test failed.')
+        self.assertEqual(1, index['dolor'], 'Document frequency test failed.')
+
+        #index is updated by add_documents and remove_documents
+        corpus.add_documents([d3, d4])
+        corpus.remove_documents([d1])
+        self.assertIs(index, corpus.document_frequency(1), 'Document frequency test failed because the index is rebuilt.')
+        expected = Corpus([d2, d3, d4]).document_frequency(1)
+        self.assertEqual(expected.n_documents, index.n_documents, 'Document frequency test failed.')
+        self.assertEqual(dict(expected.counts), dict(index.counts), 'Document frequency test failed.')
+        self.assertEqual(2, index['in'], 'Document frequency test failed.')
+
+        with self.assertRaises(ValueError, msg='Document frequency test failed because document_frequency accepted 0 as input.'):
+            corpus.document_frequency(0)
+
+    def test_fit(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+
+        #check n value
+        with self.assertRaises(ValueError, msg='Fit test failed because fit accepted 0 as input.'):
+            corpus.fit(0)
+        with self.assertRaises(ValueError, msg='Fit test failed because fit accepted n > max len(doc) as input.'):
+            corpus.fit(100)
+        with self.assertRaises(ValueError, msg='Fit test failed because fit accepted str as input.'):
+            corpus.fit('2')
+
+        #transforming corpus documents gives the same values as tf_idf
+        model = corpus.fit(2)
+        self.assertEqual(set(corpus.document_frequency(2).counts), set(model.vocabulary), 'Fit test failed.')
+        docs = [d1, d3]
+        tf_idfs, unique_ngrams = corpus.tf_idf(docs, 2)
+        test_tf_idfs = model.transform(docs)
+        for i, tf_idf in enumerate(tf_idfs):
+            for col, seq in enumerate(unique_ngrams):
+                self.assertAlmostEqual(tf_idf[col], test_tf_idfs[i][model.vocabulary[seq]], msg='Fit test failed.')
+
+    def test_fit_workers(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        d4 = Document('excepteur sint occaecat cupidatat non proident sunt in culpa qui officia deserunt mollit anim id est laborum')
+
+        model = Corpus([d1, d2, d3, d4]).fit(1)
+        parallel_corpus = Corpus([d1, d2, d3, d4])
+        parallel_model = parallel_corpus.fit(1, workers=3)
+        self.assertEqual(model.vocabulary.terms, parallel_model.vocabulary.terms, 'Fit workers test failed.')
+        self.assertTrue(np.array_equal(model.idf, parallel_model.idf), 'Fit workers test failed.')
+        self.assertEqual(dict(Corpus([d1, d2, d3, d4]).document_frequency(1).counts), dict(parallel_corpus.document_frequency(1).counts), 'Fit workers test failed.')
+
+        with self.assertRaises(ValueError, msg='Fit workers test failed because fit accepted 0 workers.'):
+            parallel_corpus.fit(1, workers=0)
+
+    def test_ngram_range(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+
+        #a range has the features and idf values of its ngram lengths
+        model = corpus.fit((1, 2))
+        unigram_model, bigram_model = corpus.fit(1), corpus.fit(2)
+        self.assertEqual(set(unigram_model.vocabulary) | set(bigram_model.vocabulary), set(model.vocabulary), 'Ngram range test failed.')
+        for m in (unigram_model, bigram_model):
+            for col, seq in enumerate(m.vocabulary):
+                self.assertAlmostEqual(m.idf[col], model.idf[model.vocabulary[seq]], msg='Ngram range test failed.')
+        self.assertIs(corpus.document_frequency(2), corpus.document_frequency((2, 2)), 'Ngram range test failed because n and (n, n) have different indexes.')
+
+        #term frequencies are calculated over the ngrams of every length in the range
+        tf_idfs, unique_ngrams = corpus.tf_idf([d2], (1, 2))
+        ngram_list = d2.n_gram((1, 2))
+        self.assertAlmostEqual(2/len(ngram_list)*math.log(3/3), tf_idfs[0][unique_ngrams.index('ut')], msg='Ngram range test failed.')
+        self.assertAlmostEqual(1/len(ngram_list)*math.log(3/2), tf_idfs[0][unique_ngrams.index('enim')], msg='Ngram range test failed.')
+        self.assertAlmostEqual(1/len(ngram_list)*math.log(3/2), tf_idfs[0][unique_ngrams.index('ut enim')], msg='Ngram range test failed.')
+
+        with self.assertRaises(ValueError, msg='Ngram range test failed because tf_idf accepted min_n > max_n as input.'):
+            corpus.tf_idf([d2], (2, 1))
+        with self.assertRaises(ValueError, msg='Ngram range test failed because fit accepted max_n > max len(doc) as input.'):
+            corpus.fit((1, 100))
+        with self.assertRaises(ValueError, msg='Ngram range test failed because fit accepted a list as input.'):
+            corpus.fit([1, 2])
+
     def test_tf_idf(self):
         d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
         d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
@@ -166,7 +286,10 @@ class TestCorpus(unittest.TestCase):
         unique_ngrams = set()
         for d in corpus.documents + tuple(docs):
             unique_ngrams.update(d.n_gram(2))
-        unique_ngrams = list(unique_ngrams)
+        #sorted ngrams of the corpus, then the unseen ngrams of the documents in the order they are first seen
+        corpus_ngrams = sorted({ngram for d in corpus.documents for ngram in d.n_gram(2)})
+        unique_ngrams = corpus_ngrams + list(dict.fromkeys(ngram for d in docs for ngram in d.n_gram(2) if ngram not in corpus_ngrams))
+        self.assertEqual(len(set(unique_ngrams)), len(unique_ngrams))
 
         tf_idfs = list()
         for d in docs:
@@ -189,5 +312,217 @@ class TestCorpus(unittest.TestCase):
             self.assertTrue(np.array_equal(tf_idf, test_tf_idfs[i]))
         self.assertEqual(unique_ngrams, test_ngrams)
 
+        #sparse output
+        test_matrix, test_ngrams = corpus.tf_idf(docs, 2, output='csr')
+        self.assertEqual((len(docs), len(unique_ngrams)), test_matrix.shape)
+        self.assertTrue(np.array_equal(np.array(tf_idfs), test_matrix.toarray()))
+        self.assertEqual(unique_ngrams, test_ngrams)
+        with self.assertRaises(ValueError, msg='TF-IDF documents test failed because TF-IDF accepted an unknown output.'):
+            corpus.tf_idf(docs, 2, output='coo')
+
+    def test_feature_hashing(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+
+        model = corpus.fit(1, n_features=2**20)
+        self.assertEqual(2**20, len(model.idf), 'Feature hashing test failed.')
+        self.assertEqual(2**20, model.vocabulary.n_features, 'Feature hashing test failed.')
+        self.assertAlmostEqual(math.log(3/3), model.idf[model.vocabulary['dolor']], msg='Feature hashing test failed.')
+        self.assertAlmostEqual(math.log(3/2), model.idf[model.vocabulary['lorem']], msg='Feature hashing test failed.')
+        self.assertIsNot(corpus.document_frequency(1), corpus.document_frequency(1, 2**20), 'Feature hashing test failed because hashed and plain indexes are shared.')
+
+        #hashed indexes are kept up to date
+        corpus.remove_documents([d1])
+        self.assertEqual(0, corpus.document_frequency(1, 2**20)['lorem'], 'Feature hashing test failed for remove_documents.')
+
+        parallel_model = Corpus([d1, d2, d3]).fit(1, workers=2, n_features=2**20)
+        self.assertTrue(np.array_equal(Corpus([d1, d2, d3]).fit(1, n_features=2**20).idf, parallel_model.idf), 'Feature hashing test failed for workers.')
+        with self.assertRaises(ValueError, msg='Feature hashing test failed because 0 is accepted as n_features.'):
+            corpus.fit(1, n_features=0)
+
+    def test_fit_pruning(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+
+        model = corpus.fit(1, min_df=2)
+        self.assertEqual(['dolor', 'dolore', 'ut'], model.vocabulary.terms, 'Fit pruning test failed for min_df.')
+        self.assertAlmostEqual(math.log(3/3), model.idf[model.vocabulary['dolor']], msg='Fit pruning test failed.')
+        self.assertFalse('dolor' in corpus.fit(1, max_df=0.5).vocabulary, 'Fit pruning test failed for max_df.')
+        self.assertEqual(2, len(corpus.fit(1, max_features=2).vocabulary), 'Fit pruning test failed for max_features.')
+
+        #pruned ngrams are unseen ngrams of the model
+        row = model.transform([d3], output='csr')
+        self.assertEqual(2, row.nnz, 'Fit pruning test failed because pruned ngrams are transformed.')
+        with self.assertRaises(ValueError, msg='Fit pruning test failed because pruned ngrams are not unseen.'):
+            corpus.fit(1, unseen='error', min_df=2).transform([d3])
+        with self.assertRaises(ValueError, msg='Fit pruning test failed because min_df > max_df is accepted.'):
+            corpus.fit(1, min_df=0.9, max_df=0.1)
+        with self.assertRaises(ValueError, msg='Fit pruning test failed because a hashed vocabulary is pruned.'):
+            corpus.fit(1, n_features=16, max_features=2)
+
+        #invalid pruning options are rejected before the document frequencies are counted
+        with Profiler() as profiler:
+            with self.assertRaises(ValueError, msg='Fit pruning test failed because a negative min_df is accepted.'):
+                corpus.fit(2, min_df=-1)
+        self.assertFalse('documents_counted' in profiler.stats().counters, 'Fit pruning test failed because the documents are counted.')
+
+    def test_tf_idf_weighting(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+        n_words = len(d2.words)
+
+        tf_idfs, unique_ngrams = corpus.tf_idf([d2], 1, sublinear_tf=True, smooth_idf=True)
+        self.assertAlmostEqual((1 + math.log(2))/n_words*(math.log(4/3) + 1), tf_idfs[0][unique_ngrams.index('ut')], msg='Tf-idf weighting test failed.')
+        self.assertAlmostEqual(1/n_words*(math.log(4/2) + 1), tf_idfs[0][unique_ngrams.index('enim')], msg='Tf-idf weighting test failed.')
+
+        for norm, order in (('l1', 1), ('l2', 2)):
+            tf_idfs, unique_ngrams = corpus.tf_idf([d1, d2], 1, norm=norm)
+            plain, _ = corpus.tf_idf([d1, d2], 1)
+            for row, plain_row in zip(tf_idfs, plain):
+                self.assertAlmostEqual(1.0, np.linalg.norm(row, order), msg=f'Tf-idf weighting test failed for {norm} norm.')
+                self.assertTrue(np.allclose(plain_row/np.linalg.norm(plain_row, order), row), f'Tf-idf weighting test failed for {norm} norm.')
+        matrix, _ = corpus.tf_idf([d1, d2], 1, output='csr', norm='l2')
+        self.assertTrue(np.allclose(np.array(tf_idfs), matrix.toarray()), 'Tf-idf weighting test failed for csr output.')
+
+        with self.assertRaises(ValueError, msg='Tf-idf weighting test failed because an unknown norm is accepted.'):
+            corpus.tf_idf([d2], 1, norm='max')
+        with self.assertRaises(ValueError, msg='Tf-idf weighting test failed because a string is accepted as sublinear_tf.'):
+            corpus.tf_idf([d2], 1, sublinear_tf='yes')
+        with self.assertRaises(ValueError, msg='Tf-idf weighting test failed because a string is accepted as smooth_idf.'):
+            corpus.fit(1, smooth_idf='yes')
+
+    def test_most_similar(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        corpus = Corpus([d1, d2, d3])
+
+        result = corpus.most_similar(Document('lorem in reprehenderit in voluptate'), 1, k=5)
+        self.assertEqual([corpus.document_id(d3), corpus.document_id(d1)], [i for i, _, _ in result], 'Most similar test failed.')
+        self.assertIs(d3, result[0][1], 'Most similar test failed.')
+        self.assertTrue(result[0][2] > result[1][2] > 0, 'Most similar test failed.')
+        self.assertIs(corpus.similarity_index(1), corpus.similarity_index(1), 'Most similar test failed because the index is not kept.')
+
+        #the index is rebuilt after the corpus changes
+        index = corpus.similarity_index(1)
+        corpus.remove_documents([d3])
+        self.assertIsNot(index, corpus.similarity_index(1), 'Most similar test failed because the index is not rebuilt.')
+        self.assertFalse(any(d == d3 for _, d, _ in corpus.most_similar(Document('lorem in reprehenderit in voluptate'), 1)), 'Most similar test failed after remove.')
+
+        #a document sharing no ngram with the corpus has no similar documents
+        self.assertEqual([], corpus.most_similar(Document('x y z'), 1), 'Most similar test failed for a document without known ngrams.')
+
+        with self.assertRaises(ValueError, msg='Most similar test failed because a document shorter than n is accepted.'):
+            corpus.most_similar(Document('dolor'), 2)
+
+        #n is checked against the shortest length of the corpus, which is kept up to date
+        short = Document('dolor sit')
+        corpus.add_documents([short])
+        with self.assertRaises(ValueError, msg='Most similar test failed because n is not checked against an added document.'):
+            corpus.most_similar(Document('lorem ipsum dolor'), 2)
+        corpus.remove_documents([short])
+        self.assertIsInstance(corpus.most_similar(Document('lorem ipsum dolor'), 2), list, 'Most similar test failed after removing the shortest document.')
+
+    def test_transform(self):
+        d1 = Document('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua')
+        d2 = Document('ut enim ad minim veniam quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat')
+        d3 = Document('duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur')
+        query = Document('lorem dolor in voluptate elit')
+        corpus = Corpus([d1, d2], max_transforms=2)
+
+        expected = corpus.fit(1).transform([query, d1])
+        tf_idfs = corpus.transform([query, d1], 1)
+        self.assertTrue(np.allclose(np.array(expected), np.array(tf_idfs)), 'Transform test failed.')
+        self.assertEqual((0, 2, 2, 2), tuple(corpus.transform_cache_info()), 'Transform test failed.')
+        self.assertTrue(np.allclose(np.array(expected), corpus.transform([query, d1], 1, output='csr').toarray()), 'Transform test failed for memoized rows.')
+        self.assertEqual((2, 2), tuple(corpus.transform_cache_info())[:2], 'Transform test failed because rows are not memoized.')
+
+        #memoized rows are invalidated when the corpus changes
+        version = corpus.version
+        corpus.add_documents([d3])
+        self.assertEqual(version + 1, corpus.version, 'Transform test failed because the version is not updated.')
+        self.assertEqual(0, corpus.transform_cache_info().size, 'Transform test failed because memoized rows are kept.')
+        self.assertTrue(np.allclose(np.array(corpus.fit(1).transform([query])), np.array(corpus.transform([query], 1))), 'Transform test failed after add.')
+        corpus.remove_documents([d3])
+        self.assertTrue(np.allclose(np.array(expected[:1]), np.array(corpus.transform([query], 1))), 'Transform test failed after remove.')
+
+        with self.assertRaises(ValueError, msg='Transform test failed because a document shorter than n is accepted.'):
+            corpus.transform([Document('lorem')], 1)
+        with self.assertRaises(TypeError, msg='Transform test failed because a string is accepted.'):
+            corpus.transform(['lorem ipsum'], 1)
+
+        #the shortest length of the corpus is kept up to date without a scan of the documents
+        short = Document('lorem ipsum')
+        corpus.add_documents([short])
+        with self.assertRaises(ValueError, msg='Transform test failed because n is not checked against an added document.'):
+            corpus.transform([query], 2)
+        corpus.remove_documents([short])
+        self.assertEqual(len(corpus.fit(2).vocabulary), corpus.transform([query], 2, output='csr').shape[1], 'Transform test failed after removing the shortest document.')
+
+    def test_changed_terms(self):
+        corpus = Corpus([Document('lorem ipsum dolor'), Document('ipsum dolor sit'), Document('sit amet consectetur')])
+        with self.assertRaises(ValueError, msg='Changed terms test failed because changes are reported before the index is built.'):
+            corpus.changed_terms(1, corpus.version)
+        corpus.fit(1)
+        fitted = corpus.version
+
+        corpus.add_documents([Document('lorem adipiscing elit')])
+        added = corpus.version
+        corpus.remove_documents([Document('ipsum dolor sit')])
+        self.assertEqual({'lorem', 'adipiscing', 'elit', 'ipsum', 'dolor', 'sit'}, corpus.changed_terms(1, fitted), 'Changed terms test failed.')
+        self.assertEqual({'ipsum', 'dolor', 'sit'}, corpus.changed_terms(1, added), 'Changed terms test failed.')
+        self.assertEqual(set(), corpus.changed_terms(1, corpus.version), 'Changed terms test failed.')
+
+        with self.assertRaises(ValueError, msg='Changed terms test failed because changes before the index is built are reported.'):
+            corpus.changed_terms(1, fitted - 1)
+        with self.assertRaises(ValueError, msg='Changed terms test failed because changes of an index that is not built are reported.'):
+            corpus.changed_terms(2, fitted)
+
+    def test_stable_columns(self):
+        code = ("from tfidf import Document, Corpus\n"
+                "corpus = Corpus([Document('lorem ipsum dolor sit amet'), Document('ipsum dolor sit amet elit')])\n"
+                "print(corpus.tf_idf([Document('sed do lorem ipsum')], 1, output='csr')[1])")
+        columns = set()
+        for seed in ('0', '1', '2'):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            columns.add(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, check=True).stdout)
+        self.assertEqual(1, len(columns), 'Stable columns test failed because the columns depend on the hash seed.')
+        self.assertEqual(str(['amet', 'dolor', 'elit', 'ipsum', 'lorem', 'sit', 'sed', 'do']), columns.pop().strip(), 'Stable columns test failed.')
+
+        #the columns follow the changes of the corpus
+        corpus = Corpus([Document('lorem ipsum dolor sit amet'), Document('ipsum dolor sit amet elit')])
+        corpus.add_documents([Document('sed do lorem ipsum')])
+        _, unique_ngrams = corpus.tf_idf([Document('sed do lorem ipsum')], 1)
+        self.assertEqual(['amet', 'do', 'dolor', 'elit', 'ipsum', 'lorem', 'sed', 'sit'], unique_ngrams, 'Stable columns test failed after a change of the corpus.')
+
+        #unseen ngrams of a query are not kept for the next queries
+        matrix, unique_ngrams = corpus.tf_idf([Document('tempor lorem magna tempor')], 1, output='csr')
+        self.assertEqual(['amet', 'do', 'dolor', 'elit', 'ipsum', 'lorem', 'sed', 'sit', 'tempor', 'magna'], unique_ngrams, 'Stable columns test failed for unseen ngrams.')
+        self.assertAlmostEqual(2/4*math.log(3/1), matrix.toarray()[0][8], msg='Stable columns test failed for the idf value of an unseen ngram.')
+        _, unique_ngrams = corpus.tf_idf([Document('magna lorem ipsum')], 1)
+        self.assertEqual(['amet', 'do', 'dolor', 'elit', 'ipsum', 'lorem', 'sed', 'sit', 'magna'], unique_ngrams, 'Stable columns test failed for unseen ngrams.')
+
+    def test_tf_idf_after_changes(self):
+        corpus = Corpus([Document('lorem ipsum dolor sit'), Document('ipsum dolor sit amet')])
+        doc = Document('lorem ipsum elit sed')
+        for smooth_idf in (False, True):
+            corpus.tf_idf([doc], 1, smooth_idf=smooth_idf)
+
+        #the idf values calculated for the previous documents are not reused
+        corpus.add_documents([Document('dolor sit amet elit')])
+        for smooth_idf in (False, True):
+            matrix, unique_ngrams = corpus.tf_idf([doc], 1, output='csr', smooth_idf=smooth_idf)
+            expected = Corpus(list(corpus.documents)).tf_idf([doc], 1, output='csr', smooth_idf=smooth_idf)[0]
+            self.assertTrue(np.allclose(expected.toarray(), matrix.toarray()), 'TF-IDF after changes test failed after add_documents.')
+        corpus.remove_documents([Document('lorem ipsum dolor sit')])
+        matrix, unique_ngrams = corpus.tf_idf([doc], 1, output='csr')
+        self.assertAlmostEqual(1/4*math.log(2/1), matrix.toarray()[0][unique_ngrams.index('lorem')], msg='TF-IDF after changes test failed after remove_documents.')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,6 @@
 import unittest
 from tfidf import Document
+import pickle
 
 class TestDocument(unittest.TestCase):
     def test_initialization(self):
@@ -71,6 +72,23 @@ class TestDocument(unittest.TestCase):
             text9 = '\t\n\r\x0b\x0c'
             Document(text9)
 
+    def test_initialization_without_validation(self):
+        #unicode letters are accepted
+        Document('çay ve kahve için ünlü bir şehir')
+
+        #checks are skipped for trusted content
+        text = 'Lorem ipsum, dolor sit amet.'
+        doc = Document(text, validate=False)
+        self.assertEqual(text, doc.content, 'Initialization without validation test failed.')
+        with self.assertRaises(ValueError, msg='Initialization without validation test failed because content is not validated by default.'):
+            Document(text)
+
+        #type checking is not skipped
+        with self.assertRaises(TypeError, msg='Initialization without validation test failed because Document object accepted empty string as input.'):
+            Document('', validate=False)
+        with self.assertRaises(TypeError, msg='Initialization without validation test failed because Document object accepted None as input.'):
+            Document(None, validate=False)
+
     def test_get_content(self):
         text = 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua'
         doc = Document(text)
@@ -110,6 +128,64 @@ class TestDocument(unittest.TestCase):
         ngrams = doc.n_gram(len(text.split())-1)
         self.assertEqual([' '.join(text.split()[:-1]), ' '.join(text.split()[1:])], ngrams, 'Ngram test failed because ngram function failed to generate unigrams.')
 
+    def test_get_ngram_range(self):
+        text = 'lorem ipsum dolor sit'
+        doc = Document(text)
+
+        self.assertEqual(['lorem', 'lorem ipsum', 'ipsum', 'ipsum dolor', 'dolor', 'dolor sit', 'sit'], doc.n_gram((1, 2)), 'Ngram range test failed.')
+        self.assertEqual(sorted(doc.n_gram(2) + doc.n_gram(3)), sorted(doc.n_gram((2, 3))), 'Ngram range test failed.')
+        self.assertEqual(doc.n_gram(2), doc.n_gram((2, 2)), 'Ngram range test failed.')
+
+        with self.assertRaises(TypeError, msg='Ngram range test failed because ngram accepted a list as input.'):
+            doc.n_gram([1, 2])
+        with self.assertRaises(TypeError, msg='Ngram range test failed because ngram accepted a tuple of three ints as input.'):
+            doc.n_gram((1, 2, 3))
+        with self.assertRaises(ValueError, msg='Ngram range test failed because ngram accepted min_n > max_n as input.'):
+            doc.n_gram((2, 1))
+        with self.assertRaises(ValueError, msg='Ngram range test failed because ngram accepted max_n > len(content) as input.'):
+            doc.n_gram((1, 4))
+        with self.assertRaises(ValueError, msg='Ngram range test failed because ngram accepted 0 as min_n.'):
+            doc.n_gram((0, 2))
+
+    def test_ngram_cache(self):
+        text = 'lorem ipsum dolor sit amet lorem ipsum'
+        doc = Document(text)
+
+        bigrams = doc.n_gram(2)
+        bigrams.append('consectetur adipiscing')
+        self.assertEqual(['lorem ipsum', 'ipsum dolor', 'dolor sit', 'sit amet', 'amet lorem', 'lorem ipsum'], doc.n_gram(2), 'Ngram cache test failed because the cached ngrams are changed.')
+        with self.assertRaises(TypeError, msg='Ngram cache test failed because ngram accepted float as input after caching.'):
+            doc.n_gram(2.0)
+
+    def test_get_ngram_ids(self):
+        text = 'lorem ipsum dolor sit amet lorem ipsum'
+        doc = Document(text)
+        other = Document('ipsum lorem')
+
+        self.assertEqual(len(text.split()), doc.n_words, 'Ngram ids test failed.')
+        self.assertEqual(len(text.split()), len(doc.token_ids), 'Ngram ids test failed.')
+        self.assertEqual(list(reversed(other.token_ids)), list(doc.token_ids[:2]), 'Ngram ids test failed because same words have different token ids.')
+
+        bigram_ids = doc.n_gram_ids(2)
+        self.assertEqual(6, len(bigram_ids), 'Ngram ids test failed.')
+        self.assertEqual(bigram_ids[0], bigram_ids[-1], 'Ngram ids test failed.')
+        self.assertEqual(len(set(doc.n_gram(2))), len(set(bigram_ids)), 'Ngram ids test failed.')
+        with self.assertRaises(ValueError, msg='Ngram ids test failed because ngram ids accepted > len(content) as input.'):
+            doc.n_gram_ids(len(text.split()))
+        with self.assertRaises(TypeError, msg='Ngram ids test failed because ngram ids accepted str as input.'):
+            doc.n_gram_ids('1')
+
+    def test_pickle(self):
+        text = 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua'
+        doc = Document(text)
+        doc.n_gram(2)
+        loaded = pickle.loads(pickle.dumps(doc))
+
+        self.assertEqual(doc, loaded, 'Pickle test failed.')
+        self.assertEqual(doc.words, loaded.words, 'Pickle test failed.')
+        self.assertEqual(doc.n_gram(2), loaded.n_gram(2), 'Pickle test failed.')
+        self.assertFalse(hasattr(doc, '__dict__'), 'Pickle test failed because documents have a __dict__.')
+
     def test_equality(self):
         text = 'lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore et dolore magna aliqua'
         doc1 = Document(text)
@@ -119,5 +195,39 @@ class TestDocument(unittest.TestCase):
         self.assertEqual(doc1, doc2, 'Equality (equal) test failed.')
         self.assertNotEqual(doc1, doc3, 'Equality (not equal) test failed.')
 
+    def test_from_texts(self):
+        texts = ['lorem ipsum dolor', 'Lorem ipsum', 'sit amet', '', 'consectetur <b>adipiscing</b>', None, 'elit sed']
+        docs, rejected = Document.from_texts(texts, errors='collect')
+        self.assertEqual([Document('lorem ipsum dolor'), Document('sit amet'), Document('elit sed')], docs, 'From texts test failed.')
+        self.assertEqual(['lorem', 'ipsum', 'dolor'], docs[0].words, 'From texts test failed for the words.')
+        self.assertEqual([1, 3, 4, 5], [i for i, _ in rejected], 'From texts test failed for the rejected texts.')
+        self.assertEqual('Document cannot be created because text includes HTML.', rejected[2][1], 'From texts test failed for the error messages.')
+
+        #a newline inside a text is not taken for the separator of the batch
+        self.assertEqual([(0, 'Document cannot be created because text includes whitespace other than space.')],
+                         Document.from_texts(['abc\ndef', 'hello world'], errors='collect')[1], 'From texts test failed for a newline in a text.')
+
+        #skipped texts are not reported
+        self.assertEqual((docs, []), Document.from_texts(iter(texts), errors='skip'), 'From texts test failed for skip.')
+        with self.assertRaises(ValueError, msg='From texts test failed because a rejected text is not raised.'):
+            Document.from_texts(texts)
+        with self.assertRaises(TypeError, msg='From texts test failed because an empty text is not raised as a TypeError.'):
+            Document.from_texts(['lorem ipsum', ''])
+        with self.assertRaises(ValueError, msg='From texts test failed because an unknown errors option is accepted.'):
+            Document.from_texts(texts, errors='ignore')
+
+        #checks are skipped for trusted content, except type checking
+        docs, rejected = Document.from_texts(texts, validate=False, errors='collect')
+        self.assertEqual(['Lorem ipsum', 'consectetur <b>adipiscing</b>'], [docs[1].content, docs[3].content], 'From texts test failed without validation.')
+        self.assertEqual([3, 5], [i for i, _ in rejected], 'From texts test failed without validation.')
+
+        #batches with a single rejected text and parallel checks give the same results
+        many = ['lorem ipsum dolor sit']*2500 + ['lorem, ipsum'] + ['sit amet']*2500
+        expected = [Document(t) for t in many if t != 'lorem, ipsum']
+        for workers in (1, 2):
+            docs, rejected = Document.from_texts(many, errors='collect', workers=workers)
+            self.assertEqual(expected, docs, f'From texts test failed for {workers} worker/s.')
+            self.assertEqual([(2500, 'Document cannot be created because text includes punctuation.')], rejected, f'From texts test failed for {workers} worker/s.')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
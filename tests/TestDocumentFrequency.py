@@ -0,0 +1,219 @@
+import unittest
+from tfidf import Document
+from tfidf import DocumentFrequency
+from tfidf import Corpus
+from tfidf import IdfModel
+import math
+import os
+import tempfile
+import numpy as np
+
+class TestDocumentFrequency(unittest.TestCase):
+    def test_initialization(self):
+        #initialization w/acceptable input
+        index = DocumentFrequency(2)
+        self.assertEqual(2, index.n, 'Initialization test failed.')
+        self.assertEqual(0, index.n_documents, 'Initialization test failed.')
+        self.assertEqual(0, len(index), 'Initialization test failed.')
+
+        #type checking
+        with self.assertRaises(TypeError, msg='Initialization test failed because a DocumentFrequency is created without any parameters.'):
+            DocumentFrequency()
+        with self.assertRaises(ValueError, msg='Initialization test failed because DocumentFrequency object accepted 0 as input.'):
+            DocumentFrequency(0)
+        with self.assertRaises(ValueError, msg='Initialization test failed because DocumentFrequency object accepted str as input.'):
+            DocumentFrequency('2')
+
+    def test_add_remove_documents(self):
+        d1 = Document('lorem ipsum dolor sit amet lorem ipsum')
+        d2 = Document('ipsum dolor sit amet consectetur')
+        d3 = Document('lorem')
+        index = DocumentFrequency(2)
+
+        index.add_documents([d1, d2, d3])
+        self.assertEqual(3, index.n_documents, 'Add documents test failed.')
+        self.assertEqual(1, index['lorem ipsum'], 'Add documents test failed because ngrams are counted more than once per document.')
+        self.assertEqual(2, index['ipsum dolor'], 'Add documents test failed.')
+        self.assertEqual(0, index['consectetur lorem'], 'Add documents test failed.')
+        self.assertTrue('sit amet' in index, 'Add documents test failed.')
+
+        index.remove_documents([d1])
+        self.assertEqual(2, index.n_documents, 'Remove documents test failed.')
+        self.assertEqual(0, index['lorem ipsum'], 'Remove documents test failed.')
+        self.assertFalse('lorem ipsum' in index, 'Remove documents test failed because zero counts are kept.')
+        self.assertEqual(1, index['ipsum dolor'], 'Remove documents test failed.')
+
+    def test_update(self):
+        d1 = Document('lorem ipsum dolor sit amet')
+        d2 = Document('ipsum dolor sit amet consectetur')
+        d3 = Document('dolor sit')
+        index = DocumentFrequency(2)
+        index.add_documents([d1])
+        other = DocumentFrequency(2)
+        other.add_documents([d2, d3])
+        expected = DocumentFrequency(2)
+        expected.add_documents([d1, d2, d3])
+
+        index.update(other)
+        self.assertEqual(expected.n_documents, index.n_documents, 'Update test failed.')
+        self.assertEqual(dict(expected.counts), dict(index.counts), 'Update test failed.')
+
+        with self.assertRaises(ValueError, msg='Update test failed because indexes of different ngram lengths are added.'):
+            index.update(DocumentFrequency(1))
+        with self.assertRaises(TypeError, msg='Update test failed because a Counter is added.'):
+            index.update(other.counts)
+
+    def test_from_stream(self):
+        contents = ['lorem ipsum dolor sit amet', 'ipsum dolor sit amet consectetur', 'dolor sit']
+        expected = DocumentFrequency(2)
+        expected.add_documents([Document(c) for c in contents])
+
+        #generator of documents and contents
+        for source in ((Document(c) for c in contents), iter(contents), [contents[0], Document(contents[1]), contents[2]]):
+            index = DocumentFrequency.from_stream(source, 2)
+            self.assertEqual(expected.n_documents, index.n_documents, 'From stream test failed.')
+            self.assertEqual(dict(expected.counts), dict(index.counts), 'From stream test failed.')
+
+        #text file
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'corpus.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(contents) + '\n\n')
+            index = DocumentFrequency.from_stream(path, 2)
+            self.assertEqual(expected.n_documents, index.n_documents, 'From stream test failed for a text file.')
+            self.assertEqual(dict(expected.counts), dict(index.counts), 'From stream test failed for a text file.')
+
+        #type checking
+        with self.assertRaises(TypeError, msg='From stream test failed because from_stream accepted None as input.'):
+            DocumentFrequency.from_stream(None, 2)
+        with self.assertRaises(TypeError, msg='From stream test failed because from_stream accepted a list of ints as input.'):
+            DocumentFrequency.from_stream([1, 2], 2)
+        with self.assertRaises(ValueError, msg='From stream test failed because from_stream accepted an invalid content.'):
+            DocumentFrequency.from_stream(['Lorem ipsum'], 2)
+
+    def test_idf(self):
+        d1 = Document('lorem ipsum dolor sit amet')
+        d2 = Document('ipsum dolor sit amet consectetur')
+        index = DocumentFrequency(1)
+        index.add_documents([d1, d2])
+
+        self.assertEqual(math.log(2/3), index.idf('ipsum'), 'IDF test failed.')
+        self.assertEqual(math.log(2/2), index.idf('lorem'), 'IDF test failed.')
+        self.assertEqual(math.log(2/1), index.idf('elit'), 'IDF test failed for an ngram that is not counted.')
+
+    def test_feature_hashing(self):
+        d1 = Document('lorem ipsum dolor sit amet')
+        d2 = Document('ipsum dolor sit amet consectetur')
+        index = DocumentFrequency(1, n_features=64)
+        index.add_documents([d1, d2])
+
+        self.assertEqual(64, index.hasher.n_features, 'Feature hashing test failed.')
+        self.assertEqual((64,), index.counts.shape, 'Feature hashing test failed.')
+        self.assertEqual(2, index.n_documents, 'Feature hashing test failed.')
+        self.assertEqual(len(d1.unique_words | d2.unique_words), int(index.counts.sum()) - len(d1.unique_words & d2.unique_words), 'Feature hashing test failed.')
+        self.assertTrue(index['ipsum'] >= 2, 'Feature hashing test failed.')
+        self.assertTrue('lorem' in index, 'Feature hashing test failed.')
+
+        index.remove_documents([d1])
+        expected = DocumentFrequency(1, n_features=64)
+        expected.add_documents([d2])
+        self.assertTrue(np.array_equal(expected.counts, index.counts), 'Feature hashing test failed for remove_documents.')
+
+        other = DocumentFrequency(1, n_features=64)
+        other.add_documents([d1])
+        index.update(other)
+        self.assertEqual(2, index.n_documents, 'Feature hashing test failed for update.')
+        with self.assertRaises(ValueError, msg='Feature hashing test failed because indexes of different hashers are added.'):
+            index.update(DocumentFrequency(1, n_features=32))
+        with self.assertRaises(ValueError, msg='Feature hashing test failed because a hashed and a plain index are added.'):
+            index.update(DocumentFrequency(1))
+        with self.assertRaises(ValueError, msg='Feature hashing test failed because 0 is accepted as n_features.'):
+            DocumentFrequency(1, n_features=0)
+
+        index = DocumentFrequency.from_stream(['lorem ipsum dolor', 'ipsum dolor sit'], 2, n_features=64)
+        self.assertEqual(2, int(index.counts[index.hasher['ipsum dolor']]), 'Feature hashing test failed for from_stream.')
+
+    def test_terms(self):
+        contents = ['lorem ipsum dolor sit', 'ipsum dolor sit amet', 'dolor sit amet elit', 'sit amet elit sed']
+        index = DocumentFrequency.from_stream(contents, 1)
+
+        self.assertEqual(sorted(index.counts), index.terms(), 'Terms test failed.')
+        self.assertEqual(['amet', 'dolor', 'elit', 'ipsum', 'sit'], index.terms(min_df=2), 'Terms test failed for min_df.')
+        self.assertEqual(['amet', 'dolor', 'elit', 'ipsum', 'lorem', 'sed'], index.terms(max_df=0.75), 'Terms test failed for max_df.')
+        self.assertEqual(['amet', 'dolor', 'elit', 'ipsum'], index.terms(min_df=0.5, max_df=3), 'Terms test failed for min_df and max_df.')
+        self.assertEqual(['amet', 'dolor', 'sit'], index.terms(max_features=3), 'Terms test failed for max_features.')
+
+        with self.assertRaises(ValueError, msg='Terms test failed because min_df > max_df is accepted.'):
+            index.terms(min_df=3, max_df=2)
+        with self.assertRaises(ValueError, msg='Terms test failed because a ratio bigger than 1 is accepted.'):
+            index.terms(max_df=1.5)
+        with self.assertRaises(ValueError, msg='Terms test failed because a string is accepted as min_df.'):
+            index.terms(min_df='2')
+        with self.assertRaises(ValueError, msg='Terms test failed because 0 is accepted as max_features.'):
+            index.terms(max_features=0)
+        with self.assertRaises(ValueError, msg='Terms test failed because the ngrams of a hashed index are pruned.'):
+            DocumentFrequency.from_stream(contents, 1, n_features=16).terms(min_df=2)
+
+    def test_max_ngrams(self):
+        contents = ['lorem ipsum dolor sit', 'ipsum dolor sit amet', 'dolor sit amet elit', 'sit amet elit sed', 'sit dolor amet tempor']
+        index = DocumentFrequency.from_stream(contents, 1, max_ngrams=6)
+
+        self.assertTrue(len(index) <= 6, 'Max ngrams test failed because the number of ngrams is not bounded.')
+        self.assertEqual(5, index.n_documents, 'Max ngrams test failed.')
+        self.assertEqual(5, index['sit'], 'Max ngrams test failed because a frequent ngram is not counted exactly.')
+        exact = DocumentFrequency.from_stream(contents, 1)
+        self.assertTrue(all(index[seq] <= exact[seq] for seq in index.counts), 'Max ngrams test failed because a count is overestimated.')
+        self.assertEqual(dict(exact.counts), dict(DocumentFrequency.from_stream(contents, 1, max_ngrams=100).counts), 'Max ngrams test failed.')
+
+        with self.assertRaises(ValueError, msg='Max ngrams test failed because 0 is accepted as max_ngrams.'):
+            DocumentFrequency.from_stream(contents, 1, max_ngrams=0)
+
+    def test_serialization(self):
+        docs = [Document('lorem ipsum dolor sit amet'), Document('ipsum dolor sit amet consectetur'), Document('dolor sit'),
+                Document('çay ve kahve için ünlü bir şehir')]
+        for n, n_features in ((1, None), ((1, 2), None), (2, 16)):
+            index = DocumentFrequency(n, n_features)
+            index.add_documents(docs)
+            loaded = DocumentFrequency.from_bytes(index.to_bytes())
+            self.assertEqual((index.n, index.n_documents, index.hasher), (loaded.n, loaded.n_documents, loaded.hasher), 'Serialization test failed.')
+            if n_features is None:
+                self.assertEqual(dict(index.counts), dict(loaded.counts), 'Serialization test failed.')
+            else:
+                self.assertEqual(index.counts.tolist(), loaded.counts.tolist(), 'Serialization test failed.')
+
+        #counts of ngrams are stored as uint32 without the json overhead of every ngram
+        self.assertLess(len(index.to_bytes()), 200, 'Serialization test failed for the size.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'df.bin')
+            index.save(path)
+            self.assertEqual(index.to_bytes(), DocumentFrequency.load(path).to_bytes(), 'Serialization test failed for save and load.')
+        with self.assertRaises(ValueError, msg='Serialization test failed because data without the magic bytes is accepted.'):
+            DocumentFrequency.from_bytes(b'lorem ipsum dolor sit amet')
+
+    def test_merge(self):
+        docs = [Document(t) for t in ('lorem ipsum dolor sit amet', 'ipsum dolor sit amet consectetur', 'dolor sit',
+                                      'consectetur adipiscing elit', 'sed do eiusmod tempor', 'lorem lorem ipsum')]
+        shards = [DocumentFrequency.from_bytes(DocumentFrequency.from_stream(docs[i:i + 2], 1).to_bytes()) for i in range(0, len(docs), 2)]
+        single = DocumentFrequency.from_stream(docs, 1)
+
+        #merging is associative and commutative
+        merged = DocumentFrequency.merge(shards)
+        self.assertEqual(single.to_bytes(), merged.to_bytes(), 'Merge test failed.')
+        self.assertEqual(merged.to_bytes(), DocumentFrequency.merge([shards[2], DocumentFrequency.merge([shards[1], shards[0]])]).to_bytes(),
+                         'Merge test failed because merging is not associative.')
+        self.assertEqual(6, shards[0].n_documents + shards[1].n_documents + shards[2].n_documents, 'Merge test failed because the shards are changed.')
+
+        #the merged index gives the same model as a single corpus
+        expected = Corpus(docs).fit(1, min_df=2, smooth_idf=True)
+        model = IdfModel.from_document_frequency(merged, min_df=2, smooth_idf=True)
+        self.assertEqual(expected.vocabulary.terms, model.vocabulary.terms, 'Merge test failed for the model.')
+        np.testing.assert_array_equal(expected.idf, model.idf, 'Merge test failed for the model.')
+
+        with self.assertRaises(TypeError, msg='Merge test failed because an empty list is merged.'):
+            DocumentFrequency.merge([])
+        with self.assertRaises(ValueError, msg='Merge test failed because indexes of different ngram lengths are merged.'):
+            DocumentFrequency.merge([shards[0], DocumentFrequency(2)])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
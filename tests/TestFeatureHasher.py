@@ -0,0 +1,41 @@
+import unittest
+from tfidf import FeatureHasher
+from zlib import crc32
+
+class TestFeatureHasher(unittest.TestCase):
+    def test_initialization(self):
+        hasher = FeatureHasher(16)
+        self.assertEqual(16, hasher.n_features, 'Initialization test failed.')
+        self.assertEqual(16, len(hasher), 'Initialization test failed.')
+        self.assertTrue(hasher.frozen, 'Initialization test failed.')
+        self.assertIs(hasher, hasher.freeze(), 'Initialization test failed.')
+        self.assertEqual(FeatureHasher(16), hasher, 'Initialization test failed.')
+        self.assertNotEqual(FeatureHasher(8), hasher, 'Initialization test failed.')
+
+        for n_features in (0, -1, 2**31 + 1, 1.5, '16', None):
+            with self.assertRaises(ValueError, msg=f'Initialization test failed because {n_features!r} is accepted as n_features.'):
+                FeatureHasher(n_features)
+
+    def test_lookup(self):
+        hasher = FeatureHasher(16)
+
+        self.assertEqual(crc32('lorem'.encode('utf-8')) % 16, hasher['lorem'], 'Lookup test failed.')
+        self.assertEqual(hasher['ünlü'], FeatureHasher(16).get('ünlü'), 'Lookup test failed because columns are not stable.')
+        self.assertTrue(all(0 <= hasher[seq] < 16 for seq in ('lorem', 'ipsum', 'dolor', 'sit amet')), 'Lookup test failed.')
+        self.assertEqual({hasher['lorem'], hasher['ipsum']}, hasher.columns(['lorem', 'ipsum', 'lorem']), 'Lookup test failed.')
+        self.assertEqual(-1 if crc32(b'lorem') & 0x80000000 else 1, hasher.sign('lorem'), 'Lookup test failed.')
+
+    def test_count(self):
+        hasher = FeatureHasher(2**20)
+        self.assertEqual({hasher['lorem']: 2*hasher.sign('lorem'), hasher['ipsum']: hasher.sign('ipsum')},
+                         hasher.count(['lorem', 'ipsum', 'lorem']), 'Count test failed.')
+
+        #colliding ngrams of opposite signs cancel out
+        hasher = FeatureHasher(1)
+        terms = ['lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur']
+        positive = next(t for t in terms if hasher.sign(t) == 1)
+        negative = next(t for t in terms if hasher.sign(t) == -1)
+        self.assertEqual({}, hasher.count([positive, negative]), 'Count test failed because colliding ngrams did not cancel out.')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
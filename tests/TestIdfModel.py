@@ -0,0 +1,280 @@
+import unittest
+from tfidf import Document
+from tfidf import DocumentFrequency
+from tfidf import Corpus
+from tfidf import IdfModel
+from tfidf import Vocabulary
+import math
+import pickle
+import os
+import tempfile
+import numpy as np
+
+class TestIdfModel(unittest.TestCase):
+    def test_initialization(self):
+        #initialization w/acceptable input
+        model = IdfModel(Vocabulary(['lorem', 'ipsum']), [0.5, 0.25], 1, 2)
+        self.assertTrue(model.vocabulary.frozen, 'Initialization test failed because the vocabulary is not frozen.')
+        self.assertEqual('ignore', model.unseen, 'Initialization test failed.')
+        with self.assertRaises(ValueError, msg='Initialization test failed because idf values of the model can be changed.'):
+            model.idf[0] = 1.0
+
+        #type checking
+        with self.assertRaises(TypeError, msg='Initialization test failed because IdfModel accepted a list as vocabulary.'):
+            IdfModel(['lorem', 'ipsum'], [0.5, 0.25], 1, 2)
+        with self.assertRaises(ValueError, msg='Initialization test failed because IdfModel accepted idf values that do not match the vocabulary.'):
+            IdfModel(Vocabulary(['lorem', 'ipsum']), [0.5], 1, 2)
+        with self.assertRaises(ValueError, msg='Initialization test failed because IdfModel accepted an unknown unseen policy.'):
+            IdfModel(Vocabulary(['lorem', 'ipsum']), [0.5, 0.25], 1, 2, unseen='add')
+
+    def test_from_document_frequency(self):
+        index = DocumentFrequency(1)
+        index.add_documents([Document('lorem ipsum dolor'), Document('ipsum dolor sit')])
+        model = IdfModel.from_document_frequency(index)
+
+        self.assertEqual(['dolor', 'ipsum', 'lorem', 'sit'], model.vocabulary.terms, 'From document frequency test failed.')
+        self.assertTrue(np.allclose([math.log(2/3), math.log(2/3), math.log(2/2), math.log(2/2)], model.idf), 'From document frequency test failed.')
+        self.assertEqual(2, model.n_documents, 'From document frequency test failed.')
+
+    def test_fit_stream(self):
+        contents = ['lorem ipsum dolor', 'ipsum dolor sit', 'amet sit']
+        model = IdfModel.fit_stream((c for c in contents), 1, unseen='warn')
+        index = DocumentFrequency(1)
+        index.add_documents([Document(c) for c in contents])
+        expected = IdfModel.from_document_frequency(index)
+
+        self.assertEqual(expected.vocabulary.terms, model.vocabulary.terms, 'Fit stream test failed.')
+        self.assertTrue(np.array_equal(expected.idf, model.idf), 'Fit stream test failed.')
+        self.assertEqual((1, 3, 'warn'), (model.n, model.n_documents, model.unseen), 'Fit stream test failed.')
+
+        #empty sources
+        with self.assertRaisesRegex(ValueError, 'no documents', msg='Fit stream test failed for an empty source.'):
+            IdfModel.fit_stream([], 1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'empty.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n\n')
+            with self.assertRaisesRegex(ValueError, 'no documents', msg='Fit stream test failed for an empty file.'):
+                IdfModel.fit_stream(path, 1)
+
+        #invalid options are rejected before the source is consumed
+        for options in ({'unseen': 'raise'}, {'min_df': -1}, {'min_df': 3, 'max_df': 2}, {'max_df': 1.5}, {'max_features': 0},
+                        {'n_features': 1024, 'min_df': 2}, {'smooth_idf': 1}, {'norm': 'l3'}):
+            source = iter(contents)
+            with self.assertRaises(ValueError, msg=f'Fit stream test failed because {options} is accepted.'):
+                IdfModel.fit_stream(source, 1, **options)
+            self.assertEqual(contents, list(source), f'Fit stream test failed because the source is consumed for {options}.')
+
+    def test_transform(self):
+        index = DocumentFrequency(1)
+        index.add_documents([Document('lorem ipsum dolor'), Document('ipsum dolor sit'), Document('amet sit')])
+        model = IdfModel.from_document_frequency(index)
+        doc = Document('lorem lorem sit elit')
+
+        expected = np.zeros(len(model.vocabulary))
+        expected[model.vocabulary['lorem']] = 2/4*math.log(3/2)
+        expected[model.vocabulary['sit']] = 1/4*math.log(3/3)
+        tf_idfs = model.transform([doc])
+        self.assertEqual(1, len(tf_idfs), 'Transform test failed.')
+        self.assertTrue(np.allclose(expected, tf_idfs[0]), 'Transform test failed.')
+        self.assertTrue(np.allclose(expected, model.transform([doc], output='csr').toarray()[0]), 'Transform test failed for csr output.')
+
+        #unseen policies
+        with self.assertWarns(UserWarning, msg='Transform test failed because warning is not produced for unseen ngrams.'):
+            IdfModel(model.vocabulary, model.idf, 1, 3, unseen='warn').transform([doc])
+        with self.assertRaises(ValueError, msg='Transform test failed because error is not raised for unseen ngrams.'):
+            IdfModel(model.vocabulary, model.idf, 1, 3, unseen='error').transform([doc])
+        IdfModel(model.vocabulary, model.idf, 1, 3, unseen='error').transform([Document('lorem sit')])
+
+        #type checking
+        with self.assertRaises(TypeError, msg='Transform test failed because transform accepted None as input.'):
+            model.transform(None)
+        with self.assertRaises(TypeError, msg='Transform test failed because transform accepted empty list as input.'):
+            model.transform([])
+        with self.assertRaises(ValueError, msg='Transform test failed because transform accepted a document shorter than n.'):
+            model.transform([Document('lorem')])
+
+    def test_transform_workers(self):
+        index = DocumentFrequency(1)
+        index.add_documents([Document('lorem ipsum dolor'), Document('ipsum dolor sit'), Document('amet sit')])
+        model = IdfModel.from_document_frequency(index, unseen='warn')
+        docs = [Document('lorem lorem sit'), Document('ipsum amet'), Document('dolor sit amet'), Document('sit elit')]
+
+        #'sit elit' has an unseen ngram
+        with self.assertWarns(UserWarning, msg='Transform workers test failed because warning is not produced for unseen ngrams.'):
+            matrix = model.transform(docs, output='csr', workers=2)
+        with self.assertWarns(UserWarning, msg='Transform workers test failed because warning is not produced for unseen ngrams.'):
+            expected = model.transform(docs, output='csr')
+        self.assertTrue(np.array_equal(expected.indptr, matrix.indptr), 'Transform workers test failed.')
+        self.assertTrue(np.array_equal(expected.indices, matrix.indices), 'Transform workers test failed.')
+        self.assertTrue(np.array_equal(expected.data, matrix.data), 'Transform workers test failed.')
+        with self.assertWarns(UserWarning, msg='Transform workers test failed because warning is not produced for unseen ngrams.'):
+            model.transform(docs, workers=2)
+        with self.assertRaises(ValueError, msg='Transform workers test failed because transform accepted 0 workers.'):
+            model.transform(docs, workers=0)
+
+    def test_pickle(self):
+        index = DocumentFrequency(2)
+        index.add_documents([Document('lorem ipsum dolor'), Document('ipsum dolor sit')])
+        model = IdfModel.from_document_frequency(index, unseen='warn')
+        loaded = pickle.loads(pickle.dumps(model))
+
+        self.assertEqual(model.vocabulary.terms, loaded.vocabulary.terms, 'Pickle test failed.')
+        self.assertTrue(np.array_equal(model.idf, loaded.idf), 'Pickle test failed.')
+        self.assertEqual((2, 2, 'warn'), (loaded.n, loaded.n_documents, loaded.unseen), 'Pickle test failed.')
+
+    def test_save_load(self):
+        index = DocumentFrequency(1)
+        index.add_documents([Document('lorem ipsum dolor'), Document('ipsum dolor sit'), Document('sit amet ünlü')])
+        model = IdfModel.from_document_frequency(index, unseen='warn')
+        doc = Document('lorem lorem sit ünlü')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.tfidf')
+            model.save(path)
+            for mmap in (True, False):
+                loaded = IdfModel.load(path, mmap=mmap)
+                self.assertEqual(model.vocabulary.terms, loaded.vocabulary.terms, 'Save load test failed.')
+                self.assertTrue(np.array_equal(model.idf, loaded.idf), 'Save load test failed.')
+                self.assertEqual((1, 3, 'warn'), (loaded.n, loaded.n_documents, loaded.unseen), 'Save load test failed.')
+                self.assertEqual(model.vocabulary['ünlü'], loaded.vocabulary['ünlü'], 'Save load test failed.')
+                self.assertFalse('elit' in loaded.vocabulary, 'Save load test failed.')
+                self.assertTrue(np.array_equal(model.transform([doc], output='csr').toarray(), loaded.transform([doc], output='csr').toarray()), 'Save load test failed.')
+
+            #ngram ranges are kept
+            IdfModel.from_document_frequency(DocumentFrequency.from_stream(['lorem ipsum dolor', 'ipsum dolor sit'], (1, 2))).save(path)
+            self.assertEqual((1, 2), IdfModel.load(path).n, 'Save load test failed for an ngram range.')
+            model.save(path)
+
+            #mapped models are pickled by reference to the file
+            loaded = pickle.loads(pickle.dumps(IdfModel.load(path)))
+            self.assertEqual(model.vocabulary.terms, loaded.vocabulary.terms, 'Save load test failed for pickled mapped model.')
+            self.assertTrue(np.array_equal(model.idf, loaded.idf), 'Save load test failed for pickled mapped model.')
+            self.assertFalse(loaded.idf.flags.writeable, 'Save load test failed because the idf values of a pickled mapped model are writeable.')
+            self.assertTrue(isinstance(loaded.idf.base, np.memmap), 'Save load test failed because the idf values of a pickled mapped model are copied.')
+            self.assertTrue(len(pickle.dumps(loaded)) < len(pickle.dumps(IdfModel.load(path, mmap=False))), 'Save load test failed because the idf values of a mapped model are pickled.')
+
+            #loading a file that is not a model
+            other = os.path.join(directory, 'other.txt')
+            with open(other, 'wb') as f:
+                f.write(b'lorem ipsum dolor sit amet')
+            with self.assertRaises(ValueError, msg='Save load test failed because a file that is not a model is loaded.'):
+                IdfModel.load(other)
+
+    def test_feature_hashing(self):
+        index = DocumentFrequency.from_stream(['lorem ipsum dolor', 'ipsum dolor sit', 'sit amet ünlü'], 1, n_features=1024)
+        model = IdfModel.from_document_frequency(index, unseen='warn')
+        docs = [Document('lorem lorem sit ünlü'), Document('elit sed')]
+
+        matrix = model.transform(docs, output='csr')
+        self.assertEqual((2, 1024), matrix.shape, 'Feature hashing test failed.')
+        col = model.vocabulary['lorem']
+        self.assertAlmostEqual(model.vocabulary.sign('lorem')*2/4*math.log(3/2), matrix.toarray()[0][col], msg='Feature hashing test failed.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.tfidf')
+            model.save(path)
+            for mmap in (True, False):
+                loaded = IdfModel.load(path, mmap=mmap)
+                self.assertEqual(model.vocabulary, loaded.vocabulary, 'Feature hashing test failed for save load.')
+                self.assertTrue(np.array_equal(model.idf, loaded.idf), 'Feature hashing test failed for save load.')
+                self.assertTrue(np.array_equal(matrix.toarray(), loaded.transform(docs, output='csr').toarray()), 'Feature hashing test failed for save load.')
+
+    def test_fit_stream_pruning(self):
+        contents = ['lorem ipsum dolor sit', 'ipsum dolor sit amet', 'dolor sit amet elit', 'sit amet elit sed', 'sit dolor amet tempor']
+        model = IdfModel.fit_stream(contents, 1, max_features=3, max_ngrams=6)
+
+        self.assertEqual(['amet', 'dolor', 'sit'], model.vocabulary.terms, 'Fit stream pruning test failed.')
+        self.assertTrue(np.array_equal(IdfModel.fit_stream(contents, 1, max_features=3).idf, model.idf), 'Fit stream pruning test failed.')
+        self.assertEqual(['elit', 'ipsum'], IdfModel.fit_stream(contents, 1, min_df=2, max_df=0.5).vocabulary.terms, 'Fit stream pruning test failed.')
+
+        #the pruning options are checked before the approximate counting of the source
+        source = iter(contents)
+        with self.assertRaises(ValueError, msg='Fit stream pruning test failed because an invalid max_features is accepted.'):
+            IdfModel.fit_stream(source, 1, max_features=0, max_ngrams=6)
+        self.assertEqual(contents, list(source), 'Fit stream pruning test failed because the source is consumed.')
+
+    def test_weighting(self):
+        index = DocumentFrequency.from_stream(['lorem ipsum dolor', 'ipsum dolor sit', 'sit amet elit'], 1)
+        model = IdfModel.from_document_frequency(index, smooth_idf=True, sublinear_tf=True, norm='l2')
+        doc = Document('lorem lorem ipsum sit')
+
+        self.assertAlmostEqual(math.log(4/2) + 1, model.idf[model.vocabulary['lorem']], msg='Weighting test failed for smooth idf.')
+        row = model.transform([doc])[0]
+        expected = np.zeros(len(model.vocabulary))
+        expected[model.vocabulary['lorem']] = (1 + math.log(2))*(math.log(4/2) + 1)
+        expected[model.vocabulary['ipsum']] = math.log(4/3) + 1
+        expected[model.vocabulary['sit']] = math.log(4/3) + 1
+        self.assertTrue(np.allclose(expected/np.linalg.norm(expected), row), 'Weighting test failed.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'model.tfidf')
+            model.save(path)
+            loaded = IdfModel.load(path)
+            self.assertEqual((True, 'l2'), (loaded.sublinear_tf, loaded.norm), 'Weighting test failed for save load.')
+            self.assertTrue(np.allclose(row, loaded.transform([doc])[0]), 'Weighting test failed for save load.')
+
+        #rows without any ngram of the vocabulary stay zero
+        for norm in ('l1', 'l2'):
+            empty = IdfModel.from_document_frequency(index, norm=norm).transform([Document('x y z')], output='csr')
+            self.assertEqual((0, [0.0]*len(model.vocabulary)), (empty.nnz, list(empty.toarray()[0])), f'Weighting test failed for an empty row with {norm} norm.')
+
+        with self.assertRaises(ValueError, msg='Weighting test failed because an unknown norm is accepted.'):
+            IdfModel.from_document_frequency(index, norm='l3')
+        with self.assertRaises(ValueError, msg='Weighting test failed because an unknown norm is accepted by fit_stream.'):
+            IdfModel.fit_stream(['lorem ipsum dolor'], 1, norm='l3')
+
+    def test_rescore(self):
+        texts = ['lorem ipsum dolor sit amet', 'ipsum dolor sit amet consectetur', 'dolor sit amet adipiscing', 'consectetur adipiscing elit sed',
+                 'sed do eiusmod tempor', 'lorem ipsum sed do', 'tempor incididunt ut labore']
+        docs = [Document(t) for t in texts]
+        for n, norm, smooth_idf in ((1, None, False), (1, 'l2', False), ((1, 2), 'l1', True)):
+            corpus = Corpus(docs[:5])
+            previous = corpus.fit(n, norm=norm, smooth_idf=smooth_idf)
+            matrix = previous.transform(docs[:5], output='csr')
+            corpus.add_documents(docs[5:])
+            corpus.remove_documents([docs[4]])
+            model = corpus.fit(n, norm=norm, smooth_idf=smooth_idf)
+
+            #values of the documents are the same as transforming them with the new model
+            rescored = model.rescore(matrix, previous, docs[:5])
+            expected = model.transform(docs[:5], output='csr')
+            np.testing.assert_allclose(expected.toarray(), rescored.toarray(), atol=1e-12, err_msg=f'Rescore test failed for n={n} and norm={norm}.')
+            self.assertEqual((5, len(model.vocabulary)), rescored.shape, 'Rescore test failed for the shape.')
+
+        #rows with a previous idf value of zero need their documents
+        corpus = Corpus(docs[:3])
+        previous = corpus.fit(1)
+        self.assertEqual(0, previous.idf[previous.vocabulary['ipsum']], 'Rescore test failed.')
+        corpus.add_documents(docs[3:])
+        np.testing.assert_allclose(corpus.fit(1).transform(docs[:3]), corpus.fit(1).rescore(previous.transform(docs[:3], output='csr'), previous, docs[:3]).toarray(),
+                                   atol=1e-12, err_msg='Rescore test failed for rows with a zero idf value.')
+        with self.assertRaises(ValueError, msg='Rescore test failed because a row with a zero idf value is rescaled without its document.'):
+            corpus.fit(1).rescore(previous.transform(docs[:3], output='csr'), previous)
+        with self.assertRaises(ValueError, msg='Rescore test failed because a matrix of a model with other weighting options is rescored.'):
+            corpus.fit(1, norm='l2').rescore(previous.transform(docs[:3], output='csr'), previous, docs[:3])
+        with self.assertRaises(TypeError, msg='Rescore test failed because a list of arrays is rescored.'):
+            corpus.fit(1).rescore(previous.transform(docs[:3]), previous, docs[:3])
+
+    def test_rescore_pruning(self):
+        texts = ['lorem ipsum dolor sit amet', 'ipsum dolor sit amet elit', 'dolor sit amet sed', 'lorem elit sed do', 'sit amet lorem elit']
+        docs = [Document(t) for t in texts]
+        for norm in (None, 'l2'):
+            corpus = Corpus(docs[:3])
+            previous = corpus.fit(1, min_df=2, smooth_idf=True, norm=norm)
+            matrix = previous.transform(docs[:3], output='csr')
+            corpus.add_documents(docs[3:])
+            model = corpus.fit(1, min_df=2, smooth_idf=True, norm=norm)
+            self.assertTrue('lorem' not in previous.vocabulary and 'lorem' in model.vocabulary, 'Rescore pruning test failed.')
+
+            #ngrams pruned by the previous model are added from the documents
+            rescored = model.rescore(matrix, previous, docs[:3])
+            np.testing.assert_allclose(model.transform(docs[:3], output='csr').toarray(), rescored.toarray(), atol=1e-12,
+                                       err_msg=f'Rescore pruning test failed for norm={norm}.')
+            with self.assertRaises(ValueError, msg='Rescore pruning test failed because a matrix is rescored without the documents of the new ngrams.'):
+                model.rescore(matrix, previous)
+            with self.assertRaises(TypeError, msg='Rescore pruning test failed because a list of strings is accepted as documents.'):
+                model.rescore(matrix, previous, texts[:3])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
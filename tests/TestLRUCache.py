@@ -0,0 +1,34 @@
+import unittest
+from tfidf import LRUCache
+
+class TestLRUCache(unittest.TestCase):
+    def test_initialization(self):
+        cache = LRUCache(2)
+        self.assertEqual((0, 0, 2, 0), tuple(cache.cache_info()), 'Initialization test failed.')
+
+        with self.assertRaises(ValueError, msg='Initialization test failed because a negative max_size is accepted.'):
+            LRUCache(-1)
+        with self.assertRaises(ValueError, msg='Initialization test failed because a float max_size is accepted.'):
+            LRUCache(2.0)
+
+    def test_eviction(self):
+        cache = LRUCache(2)
+        cache.put('lorem', 1)
+        cache.put('ipsum', 2)
+        self.assertEqual(1, cache.get('lorem'), 'Eviction test failed.')
+        cache.put('dolor', 3)
+
+        #ipsum is the least recently used entry
+        self.assertEqual(None, cache.get('ipsum'), 'Eviction test failed because the least recently used entry is kept.')
+        self.assertEqual(1, cache.get('lorem'), 'Eviction test failed.')
+        self.assertEqual(3, cache.get('dolor'), 'Eviction test failed.')
+        self.assertEqual((3, 1, 2, 2), tuple(cache.cache_info()), 'Eviction test failed.')
+
+        cache.clear()
+        self.assertEqual(0, len(cache), 'Eviction test failed for clear.')
+        disabled = LRUCache(0)
+        disabled.put('lorem', 1)
+        self.assertFalse('lorem' in disabled, 'Eviction test failed because a disabled cache keeps an entry.')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import unittest
+from tfidf import Document
+from tfidf import Corpus
+from tfidf import IdfModel
+from tfidf import NgramCache
+from collections import Counter
+import os
+import pickle
+import sqlite3
+import tempfile
+import numpy as np
+
+class TestNgramCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'ngrams.sqlite')
+        self.docs = [Document('lorem ipsum dolor sit amet ipsum dolor'), Document('ipsum dolor sit amet ünlü'), Document('dolor sit amet elit')]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_counts(self):
+        cache = NgramCache(self.path)
+        expected = [dict(Counter(d.n_gram(2))) for d in self.docs]
+
+        self.assertEqual(expected, cache.counts(self.docs, 2), 'Counts test failed.')
+        self.assertEqual((0, 3), (cache.hits, cache.misses), 'Counts test failed.')
+        self.assertEqual(expected, cache.counts(self.docs, (2, 2)), 'Counts test failed because n and (n, n) have different keys.')
+        self.assertEqual((3, 3), (cache.hits, cache.misses), 'Counts test failed.')
+        self.assertEqual([dict(Counter(self.docs[0].n_gram((1, 2))))], cache.counts([self.docs[0]], (1, 2)), 'Counts test failed for a range.')
+        self.assertEqual(4, len(cache), 'Counts test failed.')
+        cache.close()
+
+        #counts are kept in the file
+        cache = NgramCache(self.path)
+        self.assertEqual(expected, cache.counts([Document(d.content) for d in self.docs], 2), 'Counts test failed after reopening.')
+        self.assertEqual((3, 0), (cache.hits, cache.misses), 'Counts test failed after reopening.')
+        self.assertEqual(expected, pickle.loads(pickle.dumps(cache)).counts(self.docs, 2), 'Counts test failed for pickled cache.')
+        cache.clear()
+        self.assertEqual(0, len(cache), 'Counts test failed for clear.')
+
+        with self.assertRaises(ValueError, msg='Counts test failed because 0 is accepted as max_bytes.'):
+            NgramCache(self.path, max_bytes=0)
+
+    def test_eviction(self):
+        cache = NgramCache(self.path, max_bytes=120)
+        cache.counts(self.docs[:1], 1)
+        cache.counts(self.docs[1:2], 1)
+        cache.counts(self.docs[:1], 1)
+        cache.counts(self.docs[2:], 1)
+
+        #the least recently used counts are evicted first
+        self.assertTrue(len(cache) < 3, 'Eviction test failed because the cache is not bounded.')
+        cache.counts(self.docs[1:2], 1)
+        self.assertEqual(4, cache.misses, 'Eviction test failed because the least recently used counts are kept.')
+
+    def test_corpus(self):
+        cache = NgramCache(self.path)
+        corpus = Corpus(self.docs, cache=cache)
+        plain = Corpus(self.docs)
+
+        model = corpus.fit(1)
+        self.assertEqual(3, cache.misses, 'Corpus test failed because the counts are not stored.')
+        self.assertEqual(plain.fit(1).vocabulary.terms, model.vocabulary.terms, 'Corpus test failed.')
+        self.assertTrue(np.array_equal(plain.fit(1).idf, model.idf), 'Corpus test failed.')
+
+        tf_idfs, unique_ngrams = corpus.tf_idf(self.docs[:1], 1)
+        expected, expected_ngrams = plain.tf_idf(self.docs[:1], 1)
+        self.assertEqual(3, cache.misses, 'Corpus test failed because documents in the cache are split into ngrams again.')
+        self.assertEqual(sorted(expected_ngrams), sorted(unique_ngrams), 'Corpus test failed.')
+        for seq in expected_ngrams:
+            self.assertAlmostEqual(expected[0][expected_ngrams.index(seq)], tf_idfs[0][unique_ngrams.index(seq)], msg='Corpus test failed.')
+
+        self.assertTrue(np.array_equal(model.transform(self.docs, output='csr').toarray(), model.transform(self.docs, output='csr', cache=cache).toarray()),
+                        'Corpus test failed for transform.')
+        self.assertTrue(np.array_equal(Corpus(self.docs, cache=cache).fit(1, workers=2).idf, model.idf), 'Corpus test failed for workers.')
+
+    def test_encoding(self):
+        cache = NgramCache(self.path)
+        docs = [Document('lorem a\x00b ipsum', validate=False), Document('ünlü dolor ünlü')]
+        expected = [dict(Counter(d.n_gram(1))) for d in docs]
+        self.assertEqual(expected, cache.counts(docs, 1), 'Encoding test failed.')
+        self.assertEqual(expected, cache.counts(docs, 1), 'Encoding test failed.')
+
+        #counts of ngrams with a null character, which separates the encoded ngrams, are not stored
+        self.assertEqual((1, 3), (cache.hits, cache.misses), 'Encoding test failed for an ngram with a null character.')
+        cache.close()
+
+        #files of an older encoding are emptied
+        connection = sqlite3.connect(self.path)
+        connection.execute('PRAGMA user_version = 1')
+        connection.commit()
+        connection.close()
+        cache = NgramCache(self.path)
+        self.assertEqual(0, len(cache), 'Encoding test failed because the counts of an older encoding are kept.')
+        cache.close()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+import unittest
+from tfidf import Document
+from tfidf import Corpus
+from tfidf import NgramCache
+from tfidf import Profiler
+import os
+import tempfile
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.texts = ['lorem ipsum dolor sit amet', 'ipsum dolor sit amet consectetur', 'dolor sit amet adipiscing elit']
+
+    def test_initialization(self):
+        profiler = Profiler()
+        self.assertFalse(profiler.enabled, 'Initialization test failed because a new profiler is enabled.')
+        self.assertEqual(({}, {}, None), tuple(profiler.stats()), 'Initialization test failed.')
+
+        with self.assertRaises(ValueError, msg='Initialization test failed because a callback that is not callable is accepted.'):
+            Profiler(callback='print')
+        with self.assertRaises(ValueError, msg='Initialization test failed because a trace_memory that is not a bool is accepted.'):
+            Profiler(trace_memory=1)
+
+    def test_stages_and_counters(self):
+        finished = list()
+        with Profiler(callback=lambda name, seconds: finished.append(name)) as profiler:
+            self.assertTrue(profiler.enabled, 'Stages and counters test failed because the profiler is not enabled.')
+            corpus = Corpus([Document(t) for t in self.texts])
+            query = Document('lorem ipsum elit')
+            corpus.tf_idf([query], 1)
+            corpus.transform([query], 1)
+            corpus.transform([query], 1)
+        self.assertFalse(profiler.enabled, 'Stages and counters test failed because the profiler is not disabled.')
+
+        stats = profiler.stats()
+        for stage in ('document.validate', 'document.n_gram', 'document_frequency.add_documents', 'tf_idf.ngram_counts',
+                      'tf_idf.vocabulary', 'tf_idf.weighting', 'tf_idf.output', 'fit', 'idf_model.transform'):
+            self.assertTrue(stage in stats.timers, f'Stages and counters test failed for the {stage} stage.')
+        self.assertEqual(4, stats.timers['document.validate'][0], 'Stages and counters test failed for the number of calls.')
+        self.assertEqual(sorted(finished), sorted(name for name, (calls, _) in stats.timers.items() for _ in range(calls)),
+                         'Stages and counters test failed because the callback is not called for every stage.')
+
+        self.assertEqual(4, stats.counters['documents'], 'Stages and counters test failed for the documents.')
+        self.assertEqual(18, stats.counters['ngrams'], 'Stages and counters test failed for the ngrams.')
+        self.assertEqual(3, stats.counters['documents_counted'], 'Stages and counters test failed for the counted documents.')
+        self.assertEqual((1, 1), (stats.counters['transform_cache_hits'], stats.counters['transform_cache_misses']),
+                         'Stages and counters test failed for the transform cache.')
+        self.assertEqual(len(corpus.fit(1).vocabulary), stats.counters['vocabulary_size'], 'Stages and counters test failed for the vocabulary size.')
+        self.assertTrue(stats.counters['ngram_memo_hits'] > 0, 'Stages and counters test failed for the ngrams cached by documents.')
+
+        #nothing is reported when the profiler is disabled
+        Corpus([Document(t) for t in self.texts]).tf_idf([Document('lorem ipsum elit')], 1)
+        self.assertEqual(stats, profiler.stats(), 'Stages and counters test failed because a disabled profiler is reported to.')
+        profiler.reset()
+        self.assertEqual(({}, {}, None), tuple(profiler.stats()), 'Stages and counters test failed for reset.')
+
+    def test_nesting(self):
+        outer, inner = Profiler(), Profiler()
+        with outer:
+            with inner:
+                Document('lorem ipsum')
+            Document('dolor sit')
+        self.assertEqual(1, inner.stats().counters['documents'], 'Nesting test failed.')
+        self.assertEqual(1, outer.stats().counters['documents'], 'Nesting test failed because the outer profiler is not restored.')
+        self.assertFalse(outer.enabled or inner.enabled, 'Nesting test failed.')
+
+    def test_memory_and_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = NgramCache(os.path.join(directory, 'ngrams.db'))
+            with Profiler(trace_memory=True) as profiler:
+                corpus = Corpus([Document(t) for t in self.texts], cache=cache)
+                corpus.tf_idf([Document('lorem ipsum elit')], 1)
+                corpus.tf_idf([Document('lorem ipsum elit')], 1)
+                #a new corpus of the same documents reads their counts from the cache
+                Corpus([Document(t) for t in self.texts], cache=cache).tf_idf([Document('lorem ipsum elit')], 1)
+            cache.close()
+        stats = profiler.stats()
+        self.assertEqual(4, stats.counters['ngram_cache_misses'], 'Memory and cache test failed for the cache misses.')
+        self.assertTrue(stats.counters['ngram_cache_hits'] >= 4, 'Memory and cache test failed for the cache hits.')
+        self.assertTrue(stats.peak_bytes > 0, 'Memory and cache test failed because the peak allocation is not traced.')
+        self.assertTrue('tf_idf.weighting' in profiler.report(), 'Memory and cache test failed for the report.')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
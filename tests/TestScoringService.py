@@ -0,0 +1,123 @@
+import unittest
+from tfidf import Document
+from tfidf import Corpus
+from tfidf import ScoringService
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import json
+import threading
+
+class TestScoringService(unittest.TestCase):
+    def setUp(self):
+        self.corpus = Corpus([Document('lorem ipsum dolor sit amet'), Document('ipsum dolor sit'), Document('lorem lorem amet consectetur'),
+                              Document('consectetur adipiscing elit'), Document('sed do eiusmod tempor'), Document('incididunt ut labore et dolore')])
+        self.model = self.corpus.fit(1)
+
+    def expected(self, doc):
+        '''Returns the tfidf values of the given document calculated with a single call of the model.'''
+        row = self.model.transform([doc])[0]
+        return {self.model.vocabulary.term(col): value for col, value in enumerate(row) if value != 0}
+
+    def test_initialization(self):
+        service = ScoringService(self.model, max_batch_size=8, max_delay=0.01)
+        self.assertEqual((8, 0.01), (service.max_batch_size, service.max_delay), 'Initialization test failed.')
+
+        with self.assertRaises(TypeError, msg='Initialization test failed because a Corpus object is accepted.'):
+            ScoringService(self.corpus)
+        with self.assertRaises(ValueError, msg='Initialization test failed because a max_batch_size of 0 is accepted.'):
+            ScoringService(self.model, max_batch_size=0)
+        with self.assertRaises(ValueError, msg='Initialization test failed because a negative max_delay is accepted.'):
+            ScoringService(self.model, max_delay=-1)
+
+    def test_score(self):
+        docs = [Document('lorem ipsum amet'), Document('dolor sit sit'), Document('consectetur lorem dolor')]*5
+
+        async def score():
+            async with ScoringService(self.model, max_batch_size=4, max_delay=0.05) as service:
+                results = await asyncio.gather(*(service.score(d) for d in docs))
+                with self.assertRaises(ValueError, msg='Score test failed because a document shorter than the ngrams is accepted.'):
+                    await service.score(Document('lorem'))
+                return results, service.stats()
+
+        results, stats = asyncio.run(score())
+        for d, result in zip(docs, results):
+            self.assertEqual(self.expected(d).keys(), result.keys(), 'Score test failed.')
+            for term, value in result.items():
+                self.assertAlmostEqual(self.expected(d)[term], value, msg='Score test failed.')
+
+        #concurrent requests are coalesced into batches of at most max_batch_size documents
+        self.assertEqual(15, stats['n_requests'], 'Score test failed for the number of requests.')
+        self.assertEqual(4, stats['n_batches'], 'Score test failed because concurrent requests are not batched.')
+        self.assertTrue(0 < stats['p50'] <= stats['p90'] <= stats['p99'] <= stats['max'], 'Score test failed for the latency percentiles.')
+
+    def test_unseen(self):
+        model = self.corpus.fit(1, unseen='error')
+
+        async def score():
+            async with ScoringService(model, max_delay=0.05) as service:
+                return await asyncio.gather(service.score(Document('lorem ipsum')), service.score(Document('lorem unseen')), return_exceptions=True)
+
+        #a failing document does not fail the other documents of its batch
+        seen, unseen = asyncio.run(score())
+        self.assertEqual({'lorem', 'ipsum'}, seen.keys(), 'Unseen test failed.')
+        self.assertTrue(isinstance(unseen, ValueError), 'Unseen test failed because an unseen ngram is accepted.')
+
+    def test_serve(self):
+        async def request(port, method, path, body=b''):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            head, _, payload = response.partition(b'\r\n\r\n')
+            return int(head.split(b' ')[1]), json.loads(payload)
+
+        async def serve():
+            service = ScoringService(self.model)
+            server = await service.serve(port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                responses = [await request(port, 'POST', '/score', json.dumps({'contents': ['lorem ipsum amet', 'dolor sit sit']}).encode('utf-8')),
+                             await request(port, 'POST', '/score', b'{"text": "lorem ipsum"}'),
+                             await request(port, 'GET', '/stats'),
+                             await request(port, 'GET', '/unknown')]
+            finally:
+                server.close()
+                await server.wait_closed()
+                await service.stop()
+            return responses
+
+        scores, invalid, stats, unknown = asyncio.run(serve())
+        self.assertEqual(200, scores[0], 'Serve test failed.')
+        self.assertEqual(2, len(scores[1]['scores']), 'Serve test failed.')
+        for value, expected in zip(scores[1]['scores'][1].values(), self.expected(Document('dolor sit sit')).values()):
+            self.assertAlmostEqual(expected, value, msg='Serve test failed.')
+        self.assertEqual(400, invalid[0], 'Serve test failed because a request without content is accepted.')
+        self.assertEqual((200, 2), (stats[0], stats[1]['n_requests']), 'Serve test failed for the statistics.')
+        self.assertEqual(404, unknown[0], 'Serve test failed for an unknown endpoint.')
+
+    def test_stop(self):
+        executor = ThreadPoolExecutor(1)
+        release = threading.Event()
+
+        async def stop():
+            service = ScoringService(self.model, max_delay=0, executor=executor)
+            #the executor is busy, so the batch of the request is running when the service is stopped
+            executor.submit(release.wait, 10)
+            request = asyncio.ensure_future(service.score(Document('lorem ipsum amet')))
+            await asyncio.sleep(0.05)
+            await service.stop()
+            try:
+                await asyncio.wait_for(request, 1)
+            except asyncio.CancelledError:
+                return True
+            return False
+
+        try:
+            self.assertTrue(asyncio.run(stop()), 'Stop test failed because a request of the running batch is not cancelled.')
+        finally:
+            release.set()
+            executor.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
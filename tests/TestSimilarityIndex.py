@@ -0,0 +1,61 @@
+import unittest
+from tfidf import Document
+from tfidf import DocumentFrequency
+from tfidf import IdfModel
+from tfidf import SimilarityIndex
+import itertools
+import random
+import numpy as np
+
+WORDS = [''.join(letters) for letters in itertools.product('lorem', 'ipsum', 'dolor')]
+
+class TestSimilarityIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        #ngrams with zipfian frequencies, so that the postings of the query ngrams have very different lengths
+        weights = [1/(i + 1) for i in range(len(WORDS))]
+        self.docs = list({Document(' '.join(rng.choices(WORDS, weights, k=rng.randint(4, 12)))): None for _ in range(200)})
+        self.queries = [Document(' '.join(rng.choices(WORDS, weights, k=rng.randint(3, 8)))) for _ in range(10)]
+
+    def brute_force(self, model, doc):
+        '''Returns the cosine similarities of the given document to the indexed documents.'''
+        matrix = np.array(model.transform(self.docs))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        query = model.transform([doc])[0]
+        return matrix @ (query/np.linalg.norm(query))
+
+    def test_initialization(self):
+        model = IdfModel.from_document_frequency(DocumentFrequency.from_stream(self.docs, 1))
+        index = SimilarityIndex(model, self.docs)
+        self.assertEqual(len(self.docs), len(index), 'Initialization test failed.')
+        self.assertIs(model, index.model, 'Initialization test failed.')
+
+        with self.assertRaises(TypeError, msg='Initialization test failed because SimilarityIndex accepted a DocumentFrequency as model.'):
+            SimilarityIndex(DocumentFrequency(1), self.docs)
+        with self.assertRaises(TypeError, msg='Initialization test failed because SimilarityIndex accepted a list of strings.'):
+            SimilarityIndex(model, ['lorem ipsum'])
+
+    def test_most_similar(self):
+        for n_features in (None, 8):
+            model = IdfModel.from_document_frequency(DocumentFrequency.from_stream(self.docs, 1, n_features=n_features))
+            index = SimilarityIndex(model, self.docs)
+            for doc in self.queries:
+                similarities = self.brute_force(model, doc)
+                for k in (1, 3, 100):
+                    result = index.most_similar(doc, k)
+                    self.assertEqual(min(k, int(np.count_nonzero(np.abs(similarities) > 1e-12))), len(result), 'Most similar test failed.')
+                    expected = np.sort(similarities[similarities != 0])[::-1][:k]
+                    self.assertTrue(np.allclose(expected, [score for _, _, score in result]), 'Most similar test failed.')
+                    for i, d, score in result:
+                        self.assertIs(self.docs[i], d, 'Most similar test failed.')
+                        self.assertAlmostEqual(similarities[i], score, msg='Most similar test failed.')
+
+        self.assertAlmostEqual(1.0, index.most_similar(self.docs[0], 1)[0][2], msg='Most similar test failed for an indexed document.')
+        with self.assertRaises(ValueError, msg='Most similar test failed because 0 is accepted as k.'):
+            index.most_similar(self.docs[0], 0)
+        with self.assertRaises(TypeError, msg='Most similar test failed because a string is accepted as document.'):
+            index.most_similar('lorem ipsum', 1)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
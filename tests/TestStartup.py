@@ -0,0 +1,39 @@
+import unittest
+import os
+import subprocess
+import sys
+
+#budget for the cumulative import time of the tfidf package, in microseconds
+IMPORT_TIME_BUDGET = 100000
+
+class TestStartup(unittest.TestCase):
+    def run_python(self, code):
+        '''Runs the given code in a new interpreter with -X importtime and returns the process.'''
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([root, os.environ.get('PYTHONPATH', '')]))
+        return subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True, env=env, check=True)
+
+    def test_lazy_imports(self):
+        process = self.run_python("import sys, tfidf; tfidf.Document('lorem ipsum'); print(sorted(m for m in ('bs4', 'numpy') if m in sys.modules))")
+        self.assertEqual('[]', process.stdout.strip(), 'Lazy imports test failed because heavy dependencies are imported with the package.')
+
+        process = self.run_python("import sys, tfidf; print(tfidf.IdfModel.__name__, 'numpy' in sys.modules)")
+        self.assertEqual('IdfModel True', process.stdout.strip(), 'Lazy imports test failed because lazily imported classes cannot be accessed.')
+
+    def test_lazy_imports_after_submodules(self):
+        #importing a module of the package binds it to the name of its class until the class is accessed
+        process = self.run_python("import tfidf.Corpus; from tfidf import Corpus; print(Corpus.__name__)")
+        self.assertEqual('Corpus', process.stdout.strip(), 'Lazy imports after submodules test failed because the module is returned.')
+
+        process = self.run_python("from tfidf.DocumentFrequency import DocumentFrequency; from tfidf import FeatureHasher; print(FeatureHasher.__name__)")
+        self.assertEqual('FeatureHasher', process.stdout.strip(), 'Lazy imports after submodules test failed because the module is returned.')
+
+    def test_import_time(self):
+        process = self.run_python('import tfidf')
+        times = [line.split('|') for line in process.stderr.splitlines() if line.startswith('import time:')]
+        cumulative = [int(t[1]) for t in times if t[2].strip() == 'tfidf']
+        self.assertEqual(1, len(cumulative), 'Import time test failed because the import time of the package is not reported.')
+        self.assertLess(cumulative[0], IMPORT_TIME_BUDGET, f'Import time test failed because importing the package took {cumulative[0]} us.')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
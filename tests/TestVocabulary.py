@@ -0,0 +1,47 @@
+import unittest
+from tfidf import Vocabulary
+
+class TestVocabulary(unittest.TestCase):
+    def test_initialization(self):
+        vocabulary = Vocabulary(['lorem', 'ipsum', 'lorem', 'dolor'])
+
+        self.assertEqual(['lorem', 'ipsum', 'dolor'], vocabulary.terms, 'Initialization test failed because the order of ngrams is not kept.')
+        self.assertEqual(3, len(vocabulary), 'Initialization test failed.')
+        self.assertFalse(vocabulary.frozen, 'Initialization test failed.')
+        self.assertEqual(0, len(Vocabulary()), 'Initialization test failed.')
+
+    def test_lookup(self):
+        vocabulary = Vocabulary(['lorem', 'ipsum', 'dolor'])
+
+        self.assertEqual(1, vocabulary['ipsum'], 'Lookup test failed.')
+        self.assertEqual(1, vocabulary.get('ipsum'), 'Lookup test failed.')
+        self.assertEqual(None, vocabulary.get('amet'), 'Lookup test failed.')
+        self.assertEqual('dolor', vocabulary.term(2), 'Lookup test failed.')
+        self.assertTrue('lorem' in vocabulary, 'Lookup test failed.')
+        self.assertFalse('amet' in vocabulary, 'Lookup test failed.')
+        self.assertEqual(['lorem', 'ipsum', 'dolor'], list(vocabulary), 'Lookup test failed.')
+        with self.assertRaises(KeyError, msg='Lookup test failed because a missing ngram is found.'):
+            vocabulary['amet']
+
+    def test_freeze(self):
+        vocabulary = Vocabulary(['lorem', 'ipsum'])
+        self.assertEqual(2, vocabulary.add('dolor'), 'Freeze test failed.')
+        self.assertIs(vocabulary, vocabulary.freeze(), 'Freeze test failed.')
+        self.assertTrue(vocabulary.frozen, 'Freeze test failed.')
+
+        self.assertEqual(0, vocabulary.add('lorem'), 'Freeze test failed because a present ngram is rejected.')
+        with self.assertRaises(ValueError, msg='Freeze test failed because a frozen vocabulary accepted a new ngram.'):
+            vocabulary.add('amet')
+
+    def test_count(self):
+        vocabulary = Vocabulary(['lorem', 'ipsum'])
+
+        self.assertEqual({0: 2, 1: 1, 2: 1}, vocabulary.count(['lorem', 'ipsum', 'lorem', 'dolor']), 'Count test failed.')
+        self.assertEqual(['lorem', 'ipsum', 'dolor'], vocabulary.terms, 'Count test failed because new ngrams are not added.')
+
+        vocabulary.freeze()
+        self.assertEqual({0: 1}, vocabulary.count(['lorem', 'amet']), 'Count test failed because a frozen vocabulary counted a new ngram.')
+        self.assertEqual(3, len(vocabulary), 'Count test failed because a frozen vocabulary is changed.')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
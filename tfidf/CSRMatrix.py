@@ -0,0 +1,245 @@
+from ._parallel import check_workers
+from ._weighting import normalize
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+#upper bound of the bytes used for each product of a value of the left matrix with a posting of the right matrix
+_BYTES_PER_PRODUCT = 64
+
+_worker_operands = None
+
+def _set_worker_operands(operands):
+    '''Sets the operands used by _similarity_block in a worker process.'''
+    global _worker_operands
+    _worker_operands = operands
+
+def _worker_similarity_block(start, end, threshold, top_k):
+    '''Calculates the similarities of a block of rows in a worker process.'''
+    return _similarity_block(*_worker_operands, start, end, threshold, top_k)
+
+def _similarity_block(left, right, n_columns, start, end, threshold, top_k):
+    '''
+    Calculates the similarities of the rows from start to end of the left matrix with the rows of the right matrix.
+    Every product of a value of a row with the postings of its column in the right matrix is generated with array operations
+    and the products of the same pair of rows are added up, so only the pairs sharing a column are ever stored.
+
+            Parameters:
+                    left (tuple(np.array, np.array, np.array)): indptr, indices and data of the left matrix
+                    right (tuple(np.array, np.array, np.array)): offsets of the columns, and the rows and values of the postings
+                            of each column of the right matrix
+                    n_columns (int): Number of rows of the right matrix, which are the columns of the result
+                    start (int): First row of the block
+                    end (int): Row after the last row of the block
+                    threshold (float): Minimum kept similarity, None to keep every non-zero similarity
+                    top_k (int): Number of highest similarities kept in each row, None to keep all of them
+            Returns:
+                    indptr (np.array(int)): offsets of the rows of the block
+                    indices (np.array(int)): columns of the similarities
+                    data (np.array(float)): similarities
+    '''
+    indptr, indices, data = left
+    offsets, posting_rows, posting_values = right
+    lo, hi = indptr[start], indptr[end]
+    rows = np.repeat(np.arange(end - start), np.diff(indptr[start:end + 1]))
+    columns = indices[lo:hi]
+    counts = offsets[columns + 1] - offsets[columns]
+    total = int(counts.sum())
+    positions = np.repeat(offsets[columns] - (np.cumsum(counts) - counts), counts) + np.arange(total)
+    keys = np.repeat(rows, counts)*n_columns + posting_rows[positions]
+    keys, inverse = np.unique(keys, return_inverse=True)
+    similarities = np.bincount(inverse, np.repeat(data[lo:hi], counts)*posting_values[positions], minlength=len(keys))
+
+    kept = similarities != 0 if threshold is None else similarities >= threshold
+    keys, similarities = keys[kept], similarities[kept]
+    rows, columns = keys // n_columns, keys % n_columns
+    if top_k is not None:
+        order = np.lexsort((-similarities, rows))
+        rows, columns, similarities = rows[order], columns[order], similarities[order]
+        row_starts = np.searchsorted(rows, rows)
+        kept = np.arange(len(rows)) - row_starts < top_k
+        rows, columns, similarities = rows[kept], columns[kept], similarities[kept]
+        order = np.lexsort((columns, rows))
+        rows, columns, similarities = rows[order], columns[order], similarities[order]
+    block_indptr = np.zeros(end - start + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=end - start), out=block_indptr[1:])
+    return block_indptr, columns, similarities
+
+class CSRMatrix:
+    '''
+    A class to represent a sparse matrix in compressed sparse row format.
+    Values of the row i are data[indptr[i]:indptr[i+1]] and their columns are indices[indptr[i]:indptr[i+1]].
+
+    Attributes
+    ----------
+    __data: np.array(float)
+        Non-zero values of the matrix
+    __indices: np.array(int)
+        Column indices of the non-zero values
+    __indptr: np.array(int)
+        Offsets of the rows in data and indices
+    __shape: tuple(int, int)
+        Number of rows and columns of the matrix
+    '''
+    def __init__(self, data, indices, indptr, shape):
+        '''
+        Constructor for the CSRMatrix object.
+
+                Parameters:
+                        data (array-like(float)): Non-zero values of the matrix
+                        indices (array-like(int)): Column indices of the non-zero values
+                        indptr (array-like(int)): Offsets of the rows, of length number of rows + 1
+                        shape (tuple(int, int)): Number of rows and columns of the matrix
+                Raises:
+                        ValueError: if the arrays are inconsistent with each other or with the shape
+        '''
+        data = np.asarray(data, dtype=np.float64)
+        indices = np.asarray(indices, dtype=np.int64)
+        indptr = np.asarray(indptr, dtype=np.int64)
+        shape = tuple(int(i) for i in shape)
+        if len(shape) != 2 or len(indptr) != shape[0] + 1 or len(data) != len(indices) or indptr[0] != 0 or indptr[-1] != len(data):
+            raise ValueError('CSR matrix arrays are inconsistent with each other or with the shape.')
+        self.__data = data
+        self.__indices = indices
+        self.__indptr = indptr
+        self.__shape = shape
+
+    @classmethod
+    def vstack(cls, matrices):
+        '''
+        Stacks the rows of the given matrices into a single matrix.
+
+                Parameters:
+                        matrices (list(CSRMatrix)): Matrices with the same number of columns
+                Returns:
+                        (CSRMatrix): the stacked matrix
+                Raises:
+                        ValueError: if there are no matrices or their numbers of columns are different
+        '''
+        if len(matrices) == 0 or len(set(m.shape[1] for m in matrices)) != 1:
+            raise ValueError('Only a non empty list of matrices with the same number of columns can be stacked.')
+        offsets = np.cumsum([0] + [m.nnz for m in matrices[:-1]])
+        indptr = np.concatenate([[0]] + [m.indptr[1:] + offset for m, offset in zip(matrices, offsets)])
+        return cls(np.concatenate([m.data for m in matrices]), np.concatenate([m.indices for m in matrices]),
+                   indptr, (sum(m.shape[0] for m in matrices), matrices[0].shape[1]))
+
+    @property
+    def data(self):
+        '''The getter method for the __data variable.'''
+        return self.__data
+
+    @property
+    def indices(self):
+        '''The getter method for the __indices variable.'''
+        return self.__indices
+
+    @property
+    def indptr(self):
+        '''The getter method for the __indptr variable.'''
+        return self.__indptr
+
+    @property
+    def shape(self):
+        '''The getter method for the __shape variable.'''
+        return self.__shape
+
+    @property
+    def nnz(self):
+        '''Returns the number of stored values.'''
+        return len(self.data)
+
+    def cosine_similarity(self, other=None, threshold=None, top_k=None, max_memory=2**28, workers=1):
+        '''
+        Calculates and returns the cosine similarities of the rows of the matrix with the rows of the given matrix,
+        or with its own rows if other is None, as a sparse matrix.
+        The rows are processed in blocks whose products take at most about max_memory bytes, so the memory does not grow
+        with the number of rows. Only pairs of rows sharing a column are calculated and stored.
+        With more than one worker the blocks are calculated in a process pool, which gives the same values as a single worker.
+
+                Parameters:
+                        other (CSRMatrix): A matrix with the same number of columns, None for the matrix itself
+                        threshold (int or float): Minimum similarity to keep, None to keep every non-zero similarity
+                        top_k (int): Number of highest similarities to keep in each row, None to keep all of them
+                        max_memory (int): Approximate maximum number of bytes used for the products of a block
+                        workers (int or None): Number of worker processes, None for the number of CPUs
+                Returns:
+                        (CSRMatrix): similarity of each row of the matrix, one column for each row of other
+                Raises:
+                        TypeError: if other is not None or a CSRMatrix object
+                        ValueError: if the numbers of columns are different, threshold is not None or a number,
+                                    top_k is not None or an int bigger than 0, max_memory is not an int bigger than 0
+                                    or workers is not None or an int bigger than 0
+        '''
+        if other is None:
+            other = self
+        if not isinstance(other, CSRMatrix):
+            raise TypeError('Cosine similarity can only be calculated with a CSRMatrix object.')
+        if other.shape[1] != self.shape[1]:
+            raise ValueError('Cosine similarity can only be calculated for matrices with the same number of columns.')
+        if threshold is not None and type(threshold) not in (int, float):
+            raise ValueError('threshold should be None or a number.')
+        if top_k is not None and (type(top_k) != int or top_k < 1):
+            raise ValueError('top_k should be None or an int bigger than 0.')
+        if type(max_memory) != int or max_memory < 1:
+            raise ValueError('max_memory should be an int bigger than 0.')
+        workers = check_workers(workers)
+
+        left = (self.indptr, self.indices, normalize(self.indptr, self.data.copy(), 'l2'))
+        right_rows = np.repeat(np.arange(other.shape[0]), np.diff(other.indptr))
+        order = np.argsort(other.indices, kind='stable')
+        offsets = np.zeros(other.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(other.indices, minlength=other.shape[1]), out=offsets[1:])
+        right = (offsets, right_rows[order], normalize(other.indptr, other.data.copy(), 'l2')[order])
+
+        #blocks of consecutive rows whose numbers of products add up to the limit, with at least one row each
+        column_sizes = np.diff(offsets)
+        products = np.cumsum(np.bincount(np.repeat(np.arange(self.shape[0]), np.diff(self.indptr)),
+                                         column_sizes[self.indices], minlength=self.shape[0]))
+        limit = max(1, max_memory // _BYTES_PER_PRODUCT)
+        bounds = [0]
+        while bounds[-1] < self.shape[0]:
+            done = products[bounds[-1] - 1] if bounds[-1] > 0 else 0
+            bounds.append(max(bounds[-1] + 1, int(np.searchsorted(products, done + limit, side='right'))))
+        starts, ends = bounds[:-1], bounds[1:]
+
+        if workers > 1 and len(starts) > 1:
+            with ProcessPoolExecutor(workers, initializer=_set_worker_operands, initargs=((left, right, other.shape[0]),)) as executor:
+                blocks = list(executor.map(_worker_similarity_block, starts, ends, repeat(threshold), repeat(top_k)))
+        else:
+            blocks = [_similarity_block(left, right, other.shape[0], start, end, threshold, top_k) for start, end in zip(starts, ends)]
+
+        if len(blocks) == 0:
+            return CSRMatrix([], [], [0], (self.shape[0], other.shape[0]))
+        return CSRMatrix.vstack([CSRMatrix(block[2], block[1], block[0], (end - start, other.shape[0]))
+                                 for block, start, end in zip(blocks, starts, ends)])
+
+    def toarray(self):
+        '''
+        Calculates and returns the dense representation of the matrix.
+
+                Returns:
+                        (np.array): 2 dimensional array of the matrix
+        '''
+        dense = np.zeros(self.shape)
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        dense[rows, self.indices] = self.data
+        return dense
+
+    def to_scipy(self):
+        '''
+        Returns the matrix as a scipy.sparse.csr_matrix sharing the same arrays.
+
+                Returns:
+                        (scipy.sparse.csr_matrix): the matrix
+                Raises:
+                        ImportError: if scipy is not installed
+        '''
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError:
+            raise ImportError('scipy is required to convert a CSRMatrix into a scipy.sparse matrix.')
+        return csr_matrix((self.data, self.indices, self.indptr), shape=self.shape)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'CSRMatrix(shape={self.shape}, nnz={self.nnz})'
@@ -1,38 +1,100 @@
-from .Document import Document
-import math
+from .Document import Document, _ngram_bounds
+from .DocumentFrequency import DocumentFrequency
+from .CSRMatrix import CSRMatrix
+from .Vocabulary import Vocabulary
+from .IdfModel import IdfModel
+from .SimilarityIndex import SimilarityIndex
+from .LRUCache import LRUCache
+from ._parallel import check_workers, shards
+from ._weighting import check_options, check_pruning, idf_values, count_arrays, weight
+from . import _profiling
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from itertools import repeat
 import warnings
 import numpy as np
 
+def _document_frequency(docs, n, n_features, cache):
+    '''Counts and returns the document frequencies of a shard of documents in a worker process.'''
+    index = DocumentFrequency(n, n_features, cache)
+    index.add_documents(docs)
+    return index
+
 class Corpus:
     '''
     A class to represent a collection of Document objects.
 
     Attributes
     ----------
-    __documents: tuple(Document)
+    __ids: dict(Document, int)
+        Id of each Document object in the corpus, in the order the documents are added
+    __store: dict(int, Document)
+        Document object of each id in the corpus
+    documents: tuple(Document)
         Document objects in the corpus
     n_documents: int
         Number of Document objects in the corpus
+    __lengths: Counter
+        Number of documents in the corpus of each length in words, so that the shortest length is known without a scan of the documents
+    __document_frequencies: dict(int or tuple, DocumentFrequency)
+        Document frequency indexes of the corpus for the ngram lengths and numbers of hashed columns used so far
+    __term_versions: dict(int or tuple, tuple(int, dict(str or int, int)))
+        Version each index was built at and the last version the document frequency of each of its ngrams, or columns, changed at
+    __similarity_indexes: dict(int or tuple, SimilarityIndex)
+        Similarity indexes of the corpus for the ngram lengths used so far, dropped when the corpus changes
+    __vocabularies: dict(int or tuple, Vocabulary)
+        Vocabularies of the sorted ngrams of the corpus used by tf_idf for the ngram lengths used so far, dropped when the corpus changes
+    __idfs: dict(tuple(int or tuple, bool), np.array(float))
+        IDF values of the columns of the vocabularies for the ngram lengths and idf formulas used so far, dropped when the corpus changes
+    __models: dict(int or tuple, IdfModel)
+        Models used by transform for the ngram lengths used so far, dropped when the corpus changes
+    version: int
+        Number of changes of the documents of the corpus, which identifies the models fitted on the current documents
+    __transforms: LRUCache
+        Rows of the documents transformed by transform, keyed by the version, the ngram length and the document
+    cache: NgramCache
+        Persistent cache of the ngram counts of documents used by fit and tf_idf, None to split every document into ngrams
     '''
-    def __init__(self, docs):
+    def __init__(self, docs, cache=None, max_transforms=1024):
         '''
         Constructor for the Corpus object. 
-        Calls the setter method for the __documents property.
+        Calls the setter method for the documents property.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s.
+                        cache (NgramCache): Persistent cache of the ngram counts of documents, None to split every document into ngrams
+                        max_transforms (int): Maximum number of transformed documents memoized by transform, 0 to disable memoization
+                Raises:
+                        TypeError: if docs is not a list of Document object/s.
+                        ValueError: if max_transforms is not an int bigger than or equal to 0
         '''
+        self.__cache = cache
+        self.__transforms = LRUCache(max_transforms)
+        self.__version = 0
         self.documents = docs
 
+    @property
+    def cache(self):
+        '''The getter method for the __cache variable.'''
+        return self.__cache
+
+    @property
+    def version(self):
+        '''The getter method for the __version variable.'''
+        return self.__version
+
     @property
     def documents(self):
-        '''The getter method for the __documents variable.'''
+        '''Returns the documents in the corpus as a tuple, which is built once after each change of the corpus.'''
+        if self.__documents is None:
+            self.__documents = tuple(self.__ids)
         return self.__documents
 
     @documents.setter
     def documents(self, docs):
         '''
         Sets the documents of the corpus to the given list of documents. Ignores duplicates.
+        Documents are given new ids and the document frequency indexes of the corpus are dropped.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s.
@@ -42,29 +104,64 @@ class Corpus:
                         UserWarning: if there duplicate documents.
         '''
         if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
-            self.__documents = tuple(set(docs))
+            self.__ids = dict()
+            self.__store = dict()
+            self.__next_id = 0
+            self.__lengths = Counter()
+            self.__document_frequencies = dict()
+            self.__term_versions = dict()
+            self.__insert(dict.fromkeys(docs))
             if self.n_documents != len(docs):
                 warnings.warn('Unable to add duplicate document/s.')
         else:
             raise TypeError('Corpus documents can only be set with a list of Document object/s.')
 
+    def __insert(self, docs):
+        '''Gives ids to the given documents, which are not present in the corpus, and stores them.'''
+        for d in docs:
+            self.__ids[d] = self.__next_id
+            self.__store[self.__next_id] = d
+            self.__next_id += 1
+            self.__lengths[d.n_words] += 1
+        if len(docs) > 0:
+            self.__changed()
+
+    def __changed(self):
+        '''Drops the documents tuple and everything calculated from the documents, after a change of the documents of the corpus.'''
+        self.__version += 1
+        self.__documents = None
+        self.__similarity_indexes = dict()
+        self.__vocabularies = dict()
+        self.__idfs = dict()
+        self.__models = dict()
+        self.__transforms.clear()
+
     def add_documents(self, docs):
         '''
-        Adds the documents in the given Document list to the corpus.
+        Adds the documents in the given Document list to the corpus. Ignores duplicates.
+        Document frequency indexes of the corpus are updated with the added documents.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s.
                 Raises:
                         TypeError: if docs is not a list of Document object/s.
+                Warns:
+                        UserWarning: if there duplicate documents.
         '''
         if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
-            self.documents = list(self.documents) + docs
+            added = [d for d in dict.fromkeys(docs) if d not in self.__ids]
+            if len(added) != len(docs):
+                warnings.warn('Unable to add duplicate document/s.')
+            self.__insert(added)
+            for key, index in self.__document_frequencies.items():
+                self.__track(key, index.add_documents(added))
         else:
             raise TypeError('Only a list of Document object/s can be added to the corpus.')
 
     def remove_documents(self, docs):
         '''
         Removes the documents in the given Document list from the corpus.
+        Document frequency indexes of the corpus are updated with the removed documents.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s.
@@ -73,18 +170,23 @@ class Corpus:
                         ValueError: if removing docs results in removing all of the Documents in the corpus.
         '''
         if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
-            idxs = list()
+            removed = dict()
             for d in docs:
-                try:
-                    idxs.append(self.documents.index(d))
-                except ValueError:
+                if d in self.__ids:
+                    removed[d] = None
+                else:
                     warnings.warn('Document cannot be removed because it is not present in corpus.')
-                finally:
-                    continue
 
-            updated_docs = [d for i,d in enumerate(self.documents) if i not in idxs]
-            if len(updated_docs) > 0:
-                self.documents = updated_docs
+            if len(removed) < self.n_documents:
+                for d in removed:
+                    del self.__store[self.__ids.pop(d)]
+                    self.__lengths[d.n_words] -= 1
+                    if self.__lengths[d.n_words] == 0:
+                        del self.__lengths[d.n_words]
+                if len(removed) > 0:
+                    self.__changed()
+                for key, index in self.__document_frequencies.items():
+                    self.__track(key, index.remove_documents(removed))
             else:
                 raise ValueError('Remove cannot be done because it will remove all of the documents in the corpus.')
         else:
@@ -92,8 +194,8 @@ class Corpus:
 
     @property
     def n_documents(self):
-        '''Calculates and return the number of documents in the corpus.'''
-        return len(self.documents)
+        '''Returns the number of documents in the corpus.'''
+        return len(self.__ids)
 
     def exists(self, docs):
         '''
@@ -107,80 +209,401 @@ class Corpus:
                         TypeError: if docs is not a list of Document object/s.
         '''
         if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
-            return [d in self.documents for d in docs]
+            return [d in self.__ids for d in docs]
         else:
             raise TypeError('Only a list of Document object/s can be checked.')
 
-    def __idf(self, seq, n):
+    def document_id(self, doc):
+        '''
+        Returns the id of the given document in the corpus. Ids do not change until the document is removed.
+
+                Parameters:
+                        doc (Document): A Document object
+                Returns:
+                        (int): id of the document
+                Raises:
+                        ValueError: if the document is not present in the corpus
+        '''
+        try:
+            return self.__ids[doc]
+        except KeyError:
+            raise ValueError('Document is not present in corpus.')
+
+    def document(self, doc_id):
+        '''
+        Returns the document with the given id in the corpus.
+
+                Parameters:
+                        doc_id (int): id of a document
+                Returns:
+                        (Document): the document
+                Raises:
+                        ValueError: if there is no document with the id in the corpus
+        '''
+        try:
+            return self.__store[doc_id]
+        except KeyError:
+            raise ValueError('There is no document with the given id in corpus.')
+
+    def document_frequency(self, n, n_features=None):
+        '''
+        Returns the document frequency index of the corpus for the ngrams of length n.
+        The index is built on first use and is kept up to date by add_documents and remove_documents afterwards.
+
+                Parameters:
+                        n (int or tuple(int, int)): An integer bigger than 0 or a range (min_n, max_n) of such integers
+                        n_features (int): Number of columns to hash the ngrams into, None to count the ngrams themselves
+                Returns:
+                        (DocumentFrequency): document frequency index of the ngrams of length n
+                Raises:
+                        ValueError: if n is not an int or a range of ints, n < 1, min_n > max_n or n_features is invalid
+        '''
+        key = self.__index_key(n, n_features)
+        if key not in self.__document_frequencies:
+            index = DocumentFrequency(n, n_features, self.__cache)
+            index.add_documents(self.__ids)
+            self.__set_index(key, index)
+        return self.__document_frequencies[key]
+
+    def __set_index(self, key, index):
+        '''Stores the given document frequency index, built on the current documents, and starts tracking the changes of its ngrams.'''
+        self.__document_frequencies[key] = index
+        self.__term_versions[key] = (self.__version, dict())
+
+    def __track(self, key, changed):
+        '''Records the current version as the last change of the given ngrams, or columns, of the index of the given key.'''
+        versions = self.__term_versions[key][1]
+        for seq in changed:
+            versions[seq] = self.__version
+
+    def changed_terms(self, n, since_version, n_features=None):
+        '''
+        Returns the ngrams whose document frequencies changed after the given version of the corpus, e.g. the version a model was fitted at.
+        The idf values of these ngrams moved with their document frequencies, while the idf values of the other ngrams
+        only moved with the number of documents, if it changed.
+        Changes are tracked since the document frequency index of n is built, which fit and document_frequency do on first use.
+
+                Parameters:
+                        n (int or tuple(int, int)): An integer bigger than 0 or a range (min_n, max_n) of such integers
+                        since_version (int): A version of the corpus
+                        n_features (int): Number of columns of the index, None for an index of the ngrams themselves
+                Returns:
+                        (set(str) or set(int)): ngrams, or columns if n_features is given, whose document frequencies changed
+                Raises:
+                        ValueError: if the index of n and n_features is not built or since_version is not an int
+                                    or is older than the version the index was built at
+        '''
+        key = self.__index_key(n, n_features)
+        if key not in self.__term_versions:
+            raise ValueError('Changes are not tracked since there is no document frequency index for the given n and n_features.')
+        built, versions = self.__term_versions[key]
+        if type(since_version) != int or since_version < built:
+            raise ValueError(f'since_version should be an int bigger than or equal to {built}, the version the changes are tracked since.')
+        return {seq for seq, version in versions.items() if version > since_version}
+
+    @staticmethod
+    def __index_key(n, n_features=None):
+        '''Returns the key of the document frequency index of n and n_features, which is the same for n and (n, n).'''
+        bounds = _ngram_bounds(n)
+        if bounds is not None and bounds[0] == bounds[1]:
+            n = bounds[0]
+        return n if n_features is None else (n, n_features)
+
+    def __valid_n(self, n, docs=()):
+        '''Returns whether n is an int or a range of ints bigger than 0 and less than the length of the shortest document in corpus and docs.'''
+        bounds = _ngram_bounds(n)
+        if bounds is None:
+            return False
+        min_length = min(min(self.__lengths), min([d.n_words for d in docs], default=bounds[1] + 1))
+        return 0 < bounds[0] <= bounds[1] < min_length
+
+    def __idf(self, n, smooth_idf=False):
         '''
-        Calculates and returns the idf value for the given sequence according to the documents in the corpus.
+        Returns the idf values of the ngrams of the corpus in the order of the columns of the corpus vocabulary.
         In order to eliminate division-by-zero errors for sequences not present in corpus the formula is adjusted into 
         log(total number of documents in the corpus/(1 + number of documents where sequence appears)).
+        The values are calculated once after each change of the corpus.
 
                 Parameters:
-                        seq (str): An ngram.
-                        n (int): An integer in range 1 to len(content)-1
+                        n (int or tuple(int, int)): An ngram length or range of ngram lengths
+                        smooth_idf (bool): whether to use log((1 + N)/(1 + df)) + 1 instead
                 Returns:
-                        (float): IDF value for the given sequence according to the documents in the corpus
+                        (np.array(float)): IDF value of each sequence according to the documents in the corpus
         '''
-        d_count = 1
-        for d in self.documents:
-            if seq in d.n_gram(n):
-                d_count += 1
+        key = (self.__index_key(n), smooth_idf)
+        idf = self.__idfs.get(key)
+        if idf is None:
+            index = self.document_frequency(n)
+            terms = self.__corpus_vocabulary(n).terms
+            df = np.fromiter((index[seq] for seq in terms), dtype=np.float64, count=len(terms))
+            idf = self.__idfs[key] = idf_values(df, index.n_documents, smooth_idf)
+            idf.setflags(write=False)
+        return idf
 
-        return math.log(self.n_documents/d_count)
+    def fit(self, n, unseen='ignore', workers=1, n_features=None, min_df=1, max_df=1.0, max_features=None,
+            smooth_idf=False, sublinear_tf=False, norm=None):
+        '''
+        Fits and returns an immutable idf model of the ngrams in the corpus. 
+        The model scores new documents with its transform method without recalculating the corpus statistics.
+        With more than one worker the documents are split into shards whose document frequencies are
+        counted in a process pool and merged, which gives the same model as a single worker.
+        With n_features the ngrams are hashed into a fixed number of columns instead of keeping a vocabulary.
+        The vocabulary can be pruned by document frequency, which leaves out rare or too common ngrams from the columns
+        of the model. Pruned ngrams are unseen ngrams of the model.
+
+                Parameters:
+                        n (int or tuple(int, int)): An integer in range 1 to min len(content)-1 for the Documents in the corpus
+                                or a range (min_n, max_n) of such integers
+                        unseen (str): Policy of the model for ngrams that are not in the corpus, one of 'ignore', 'warn' or 'error'
+                        workers (int or None): Number of worker processes, None for the number of CPUs
+                        n_features (int): Number of columns to hash the ngrams into, None to keep a vocabulary of the ngrams
+                        min_df (int or float): Minimum number, or ratio if it is a float, of documents an ngram appears in
+                        max_df (int or float): Maximum number, or ratio if it is a float, of documents an ngram appears in
+                        max_features (int): Number of ngrams with the highest document frequencies to keep, None to keep every ngram
+                        smooth_idf (bool): whether to calculate the idf values with log((1 + N)/(1 + df)) + 1 instead of log(N/(1 + df))
+                        sublinear_tf (bool): whether the model calculates term frequencies with 1 + log(count) instead of the counts
+                        norm (str): None, 'l1' or 'l2' for the model to divide the transformed rows by their norms
+                Returns:
+                        (IdfModel): idf model of the corpus
+                Raises:
+                        ValueError: if n is not an int or a range of ints, n < 1, n > min len(content)-1 for the Documents in the corpus,
+                                    unseen is unknown, workers is not None or an int bigger than 0, n_features is invalid
+                                    or the pruning or weighting options are invalid
+        '''
+        workers = check_workers(workers)
+        #the pruning options are checked before the document frequencies are counted
+        check_pruning(min_df, max_df, max_features)
+        check_options(sublinear_tf, norm)
+        if self.__valid_n(n):
+            key = self.__index_key(n, n_features)
+            if workers > 1 and key not in self.__document_frequencies:
+                index = DocumentFrequency(n, n_features, self.__cache)
+                with ProcessPoolExecutor(workers) as executor:
+                    for shard_index in executor.map(_document_frequency, shards(self.documents, workers), repeat(n), repeat(n_features),
+                                                    repeat(self.__cache)):
+                        index.update(shard_index)
+                self.__set_index(key, index)
+            with _profiling.stage('fit'):
+                model = IdfModel.from_document_frequency(self.document_frequency(n, n_features), unseen, min_df, max_df, max_features,
+                                                         smooth_idf, sublinear_tf, norm)
+            _profiling.gauge('vocabulary_size', len(model.vocabulary))
+            return model
+        else:
+            raise ValueError('n value should be int or a range of ints, should be bigger than 0 and less than the length of the shortest document in corpus.')
 
-    def __unique_ngrams(self, docs, n):
+    def similarity_index(self, n):
         '''
-        Calculates and returns unique ngrams present in the corpus and the given document list.
+        Returns the similarity index of the documents in the corpus for the ngrams of length n.
+        The index is built with the model of the corpus on first use and is rebuilt after the corpus changes.
+
+                Parameters:
+                        n (int or tuple(int, int)): An integer in range 1 to min len(content)-1 for the Documents in the corpus
+                                or a range (min_n, max_n) of such integers
+                Returns:
+                        (SimilarityIndex): similarity index of the corpus
+                Raises:
+                        ValueError: if n is not an int or a range of ints, n < 1 or n > min len(content)-1 for the Documents in the corpus
+        '''
+        key = self.__index_key(n)
+        if key not in self.__similarity_indexes:
+            self.__similarity_indexes[key] = SimilarityIndex(self.fit(n), list(self.documents))
+        return self.__similarity_indexes[key]
+
+    def most_similar(self, doc, n, k=10):
+        '''
+        Finds and returns the k documents in the corpus most similar to the given document by the cosine similarity
+        of their tfidf vectors. Query time depends on the postings of the ngrams of the document instead of the size of the corpus.
+        A document of the corpus is the most similar document to itself.
+
+                Parameters:
+                        doc (Document): A Document object
+                        n (int or tuple(int, int)): An integer in range 1 to min len(content)-1 for the Documents in the corpus and doc
+                                or a range (min_n, max_n) of such integers
+                        k (int): Number of documents to return, an integer bigger than 0
+                Returns:
+                        (list(tuple(int, Document, float))): id, document and similarity of the most similar documents,
+                                in decreasing order of similarity
+                Raises:
+                        TypeError: if doc is not a Document object
+                        ValueError: if n is not an int or a range of ints, n < 1, n > min len(content)-1 for the Documents
+                                    in the corpus and doc or k is not an int bigger than 0
+        '''
+        if not isinstance(doc, Document):
+            raise TypeError('Similar documents can only be found for a Document object.')
+        if not self.__valid_n(n, [doc]):
+            raise ValueError('n value should be int or a range of ints, should be bigger than 0 and less than the length of the shortest document in corpus and given document.')
+        index = self.similarity_index(n)
+        return [(self.__ids[d], d, score) for _, d, score in index.most_similar(doc, k)]
+
+    def transform(self, docs, n, output='dense'):
+        '''
+        Calculates and returns tfidf values for the given list of documents with the model of the corpus.
+        Unlike tf_idf the columns are the ngrams of the corpus only, so the values of a document do not depend on the other given documents
+        and are memoized in a bounded cache with least recently used eviction. The cache is keyed by the version of the corpus,
+        so it is invalidated when documents are added or removed.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s
-                        n (int): An integer in range 1 to len(content)-1
+                        n (int or tuple(int, int)): An integer in range 1 to min len(content)-1 for the Documents in the corpus and docs
+                                or a range (min_n, max_n) of such integers
+                        output (str): 'dense' for a list of arrays, 'csr' for a CSRMatrix or 'scipy' for a scipy.sparse.csr_matrix
                 Returns:
-                        (str): list of unique ngrams of the content
+                        tf_idfs (list(np.array) or CSRMatrix or scipy.sparse.csr_matrix): tfidf values for the ngrams in the vocabulary of the model
+                Raises:
+                        TypeError: if docs is not a list of Document object/s.
+                        ValueError: if n is not an int or a range of ints, n < 1, n > min len(content)-1 for the Documents in the corpus and docs
+                                    or output is unknown
+                        ImportError: if output is 'scipy' and scipy is not installed
         '''
-        unique_ngrams = set()
-        for d in self.documents:
-            unique_ngrams.update(d.n_gram(n))
-        for d in docs:
-            unique_ngrams.update(d.n_gram(n))
-        return list(unique_ngrams)
+        if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
+            if output not in ('dense', 'csr', 'scipy'):
+                raise ValueError("output should be one of 'dense', 'csr' or 'scipy'.")
+            if not self.__valid_n(n, docs):
+                raise ValueError('n value should be int or a range of ints, should be bigger than 0 and less than the length of the shortest document in corpus and given documents.')
+            key = self.__index_key(n)
+            if key not in self.__models:
+                self.__models[key] = self.fit(n)
+            model = self.__models[key]
+
+            rows = [self.__transforms.get((self.__version, key, d)) for d in docs]
+            missing = list(dict.fromkeys(d for d, row in zip(docs, rows) if row is None))
+            _profiling.count('transform_cache_hits', sum(row is not None for row in rows))
+            _profiling.count('transform_cache_misses', len(docs) - sum(row is not None for row in rows))
+            if len(missing) > 0:
+                matrix = model.transform(missing, output='csr', cache=self.__cache)
+                computed = dict()
+                for i, d in enumerate(missing):
+                    start, end = matrix.indptr[i], matrix.indptr[i + 1]
+                    computed[d] = (matrix.indices[start:end].copy(), matrix.data[start:end].copy())
+                    self.__transforms.put((self.__version, key, d), computed[d])
+                rows = [computed[d] if row is None else row for d, row in zip(docs, rows)]
+
+            indptr = np.zeros(len(docs) + 1, dtype=np.int64)
+            np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+            matrix = CSRMatrix(np.concatenate([data for _, data in rows]), np.concatenate([indices for indices, _ in rows]),
+                               indptr, (len(docs), len(model.vocabulary)))
+            if output == 'csr':
+                return matrix
+            if output == 'scipy':
+                return matrix.to_scipy()
+            return list(matrix.toarray())
+        else:
+            raise TypeError('Tf-idf values can only be calculated for a list of Document objects.')
+
+    def transform_cache_info(self):
+        '''Returns the hit and miss counters, the maximum size and the number of entries of the cache of transform.'''
+        return self.__transforms.cache_info()
+
+    def __ngram_counts(self, docs, n):
+        '''Returns the number of occurrences of each ngram of each of the given documents, read from the cache if there is one.'''
+        if self.__cache is not None:
+            return self.__cache.counts(docs, n)
+        return [Counter(d.n_gram(n)) for d in docs]
+
+    def __corpus_vocabulary(self, n):
+        '''Returns the frozen vocabulary of the sorted ngrams of the corpus, which is built once after each change of the corpus.'''
+        key = self.__index_key(n)
+        vocabulary = self.__vocabularies.get(key)
+        if vocabulary is None:
+            #the ngrams of the corpus are the keys of its document frequency index, which is kept up to date
+            vocabulary = self.__vocabularies[key] = Vocabulary(sorted(self.document_frequency(n).counts)).freeze()
+        return vocabulary
+
+    def __unseen(self, counts, vocabulary):
+        '''
+        Returns the columns of the ngrams of the given documents that are not in the corpus vocabulary.
+        They follow the columns of the corpus vocabulary in the order they are first seen, so that the vocabulary is not copied.
 
-    def tf_idf(self, docs, n):
+                Parameters:
+                        counts (list(dict(str, int))): ngram counts of the given documents
+                        vocabulary (Vocabulary): frozen vocabulary of the sorted ngrams of the corpus
+                Returns:
+                        (dict(str, int)): column of each ngram only present in the given documents
+        '''
+        unseen = dict()
+        for c in counts:
+            for ngram in c:
+                if ngram not in vocabulary and ngram not in unseen:
+                    unseen[ngram] = len(vocabulary) + len(unseen)
+        return unseen
+
+    def __sparse_tf_idf(self, counts, n, vocabulary, unseen, smooth_idf, sublinear_tf, norm):
+        '''
+        Calculates and returns tfidf values for the given list of documents as a sparse matrix, without creating dense rows.
+        Only the counting of the ngrams loops over the documents, the weighting is done with array operations.
+
+                Parameters:
+                        counts (list(dict(str, int))): ngram counts of the documents
+                        n (int or tuple(int, int)): An ngram length or range of ngram lengths
+                        vocabulary (Vocabulary): frozen vocabulary of the sorted ngrams of the corpus
+                        unseen (dict(str, int)): column of each ngram only present in the documents
+                        smooth_idf (bool): whether to use the smooth idf formula
+                        sublinear_tf (bool): whether to calculate term frequencies with 1 + log(count)
+                        norm (str): None, 'l1' or 'l2' for the normalization of the rows
+                Returns:
+                        (CSRMatrix): tfidf values of the documents, one row per document and one column per ngram
+        '''
+        rows = [vocabulary.count(c) for c in counts]
+        if len(unseen) > 0:
+            for c, row in zip(counts, rows):
+                row.update((unseen[ngram], count) for ngram, count in c.items() if ngram in unseen)
+        indptr, indices, data = count_arrays(rows)
+        lengths = np.fromiter((sum(c.values()) for c in counts), dtype=np.int64, count=len(counts))
+        idf = self.__idf(n, smooth_idf)
+        if len(unseen) > 0:
+            #the ngrams only present in the documents appear in no document of the corpus
+            idf = np.concatenate((idf, idf_values(np.zeros(len(unseen)), self.n_documents, smooth_idf)))
+        weight(indptr, indices, data, lengths, idf, sublinear_tf, norm)
+        return CSRMatrix(data, indices, indptr, (len(counts), len(vocabulary) + len(unseen)))
+
+    def tf_idf(self, docs, n, output='dense', smooth_idf=False, sublinear_tf=False, norm=None):
         '''
         Calculates and returns tfidf values for the given list of documents.
+        Term frequencies can be sublinear, the idf values smoothed and the rows normalized to unit l1 or l2 norm.
 
                 Parameters:
                         docs (list(Document)): List of Document object/s
-                        n (int): An integer in range 1 to min len(content)-1 for the Documents in the corpus and docs
+                        n (int or tuple(int, int)): An integer in range 1 to min len(content)-1 for the Documents in the corpus and docs
+                                or a range (min_n, max_n) of such integers
+                        output (str): 'dense' for a list of arrays, 'csr' for a CSRMatrix or 'scipy' for a scipy.sparse.csr_matrix
+                        smooth_idf (bool): whether to calculate the idf values with log((1 + N)/(1 + df)) + 1 instead of log(N/(1 + df))
+                        sublinear_tf (bool): whether to calculate term frequencies with 1 + log(count) instead of the counts
+                        norm (str): None, 'l1' or 'l2' to divide the rows by their norms
                 Returns:
-                        tf_idfs (list(np.array)): list of tfidf values for the unique ngrams in the corpus and docs
-                        unique_ngrams (list(str)): list of unique ngrams in the corpus and docs
+                        tf_idfs (list(np.array) or CSRMatrix or scipy.sparse.csr_matrix): tfidf values for the unique ngrams in the corpus and docs
+                        unique_ngrams (list(str)): list of unique ngrams in the corpus and docs, the sorted ngrams of the corpus
+                                followed by the ngrams only in docs in the order they are first seen
                 Raises:
                         TypeError: if docs is not a list of Document object/s.
-                        ValueError: if n is not an int, n < 1, n > min len(content)-1 for the Documents in the corpus and docs
+                        ValueError: if n is not an int or a range of ints, n < 1, n > min len(content)-1 for the Documents in the corpus and docs,
+                                    output is unknown or the weighting options are invalid
+                        ImportError: if output is 'scipy' and scipy is not installed
 
         '''
         if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
-            min_n = min(min([len(d.words) for d in self.documents]), min([len(d.words) for d in docs]))
-            if type(n) == int and n > 0 and n < min_n:
-                unique_ngrams = self.__unique_ngrams(docs, n)
-                tf_idfs = list()
-                idfs = dict()
-                for d in docs:
-                    tfidf = np.zeros(len(unique_ngrams))
-                    ngram_list = d.n_gram(n)
-                    for item in ngram_list:
-                        tf = ngram_list.count(item)/len(ngram_list)
-                        if item not in idfs:
-                            idfs[item] = self.__idf(item, n)
-                        tfidf[unique_ngrams.index(item)] = tf*idfs[item]
-                    tf_idfs.append(tfidf)
-
-                return tf_idfs, unique_ngrams
+            if output not in ('dense', 'csr', 'scipy'):
+                raise ValueError("output should be one of 'dense', 'csr' or 'scipy'.")
+            check_options(sublinear_tf, norm)
+            if self.__valid_n(n, docs):
+                with _profiling.stage('tf_idf.ngram_counts'):
+                    counts = self.__ngram_counts(docs, n)
+                with _profiling.stage('tf_idf.vocabulary'):
+                    vocabulary = self.__corpus_vocabulary(n)
+                    unseen = self.__unseen(counts, vocabulary)
+                _profiling.gauge('vocabulary_size', len(vocabulary) + len(unseen))
+                with _profiling.stage('tf_idf.weighting'):
+                    matrix = self.__sparse_tf_idf(counts, n, vocabulary, unseen, smooth_idf, sublinear_tf, norm)
+                with _profiling.stage('tf_idf.output'):
+                    unique_ngrams = vocabulary.terms + list(unseen)
+                    if output == 'csr':
+                        return matrix, unique_ngrams
+                    if output == 'scipy':
+                        return matrix.to_scipy(), unique_ngrams
+
+                    tf_idfs = list(matrix.toarray())
+                    return tf_idfs, unique_ngrams
             else:
-                raise ValueError('n value should be int, should be bigger than 0 and less than the length of the shortest document in corpus and given documents.')
+                raise ValueError('n value should be int or a range of ints, should be bigger than 0 and less than the length of the shortest document in corpus and given documents.')
         else:
             raise TypeError('Tf-idf values can only be calculated for a list of Document objects.')
 
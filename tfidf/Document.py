@@ -1,8 +1,159 @@
+from ._parallel import check_workers, shards
+from . import _profiling
 import warnings
 import math
-from bs4 import BeautifulSoup
 import re
 import string
+import threading
+from array import array
+
+#interning table shared by all documents of the process, mapping words to token ids and token ids to words
+_token_ids = dict()
+_tokens = list()
+_tokens_lock = threading.Lock()
+
+#content made of lowercase ascii letters separated by single spaces, which passes all of the checks of _validate
+_PLAIN_TEXT = re.compile(r' ?[a-z]+(?: [a-z]+)* ?')
+_URL = re.compile(r'\w+://\w+\.\w+\.\w+/?[\w\.\?=#]*')
+_EMAIL = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+_PUNCTUATION = re.compile('[' + re.escape(string.punctuation) + ']')
+_WHITESPACE = re.compile('[' + re.escape(string.whitespace.replace(' ', '')) + ']|  ')
+#a batch of plain contents joined by newlines, which plain content cannot include, accepted with a single match
+_PLAIN_TEXTS = re.compile(r'(?: ?[a-z]+(?: [a-z]+)* ?\n)*')
+#number of contents checked with a single match of _PLAIN_TEXTS
+_BATCH_SIZE = 1024
+
+def _validate(content):
+    '''
+    Checks whether the given content can be the content of a document.
+    Plain content is accepted with a single regular expression match, other content is checked in detail
+    with cheap tests run before the expensive ones, e.g. HTML is only parsed if the content includes '<'.
+    BeautifulSoup is imported on first use, so that importing the package does not pay for it.
+
+            Parameters:
+                    content (str): A non empty string
+            Raises:
+                    ValueError: if content is HTML or is not lowercased or includes urls, emails, punctuation, numbers or whitespace other than space.
+    '''
+    if _PLAIN_TEXT.fullmatch(content):
+        return
+
+    #check for HTML
+    if '<' in content:
+        from bs4 import BeautifulSoup
+        if BeautifulSoup(content, "html.parser").find():
+            raise ValueError('Document cannot be created because text includes HTML.')
+
+    #check for URLs
+    if _URL.search(content):
+        raise ValueError('Document cannot be created because text includes URL/s.')
+
+    #check for emails
+    if '@' in content and _EMAIL.search(content):
+        raise ValueError('Document cannot be created because text includes email address/es.')
+
+    #check if lowercase
+    if not content.islower():
+        raise ValueError('Document cannot be created because text is not in lowercase.')
+
+    #check if punctuation is removed
+    if _PUNCTUATION.search(content):
+        raise ValueError('Document cannot be created because text includes punctuation.')
+
+    #check if numbers are removed
+    if any(map(str.isdigit, content)):
+        raise ValueError('Document cannot be created because text includes numbers.')
+
+    #check whitespace
+    if _WHITESPACE.search(content):
+        raise ValueError('Document cannot be created because text includes whitespace other than space.')
+
+def _rejections(texts, offset=0):
+    '''
+    Checks whether the given texts can be the contents of documents and returns the rejected ones.
+    Texts are checked in batches, a batch of plain contents is accepted with a single regular expression match
+    and only the texts of the other batches are checked one by one.
+
+            Parameters:
+                    texts (list): List of texts
+                    offset (int): Index of the first text, added to the indices of the rejected texts
+            Returns:
+                    (list(tuple(int, str))): index and error message of each rejected text
+    '''
+    rejected = list()
+    for start in range(0, len(texts), _BATCH_SIZE):
+        batch = texts[start:start + _BATCH_SIZE]
+        if all(type(t) == str for t in batch):
+            joined = '\n'.join(batch) + '\n'
+            #a newline inside a text would be taken for a separator
+            if joined.count('\n') == len(batch) and _PLAIN_TEXTS.fullmatch(joined):
+                continue
+        for i, t in enumerate(batch, offset + start):
+            if type(t) != str or len(t) == 0:
+                rejected.append((i, 'A document object can only be created wit a non empty string.'))
+                continue
+            try:
+                _validate(t)
+            except ValueError as e:
+                rejected.append((i, str(e)))
+    return rejected
+
+def _ngram_bounds(n):
+    '''
+    Returns the smallest and the largest ngram lengths of the given n value.
+
+            Parameters:
+                    n (int or tuple(int, int)): An ngram length or a range (min_n, max_n) of ngram lengths
+            Returns:
+                    (tuple(int, int)): smallest and largest ngram lengths or None if n is not an int or a tuple of two ints
+    '''
+    if type(n) == int:
+        return n, n
+    if type(n) == tuple and len(n) == 2 and all(type(i) == int for i in n):
+        return n
+    return None
+
+def _intern(words):
+    '''
+    Returns the token ids of the given words, adding the words that are not present to the interning table.
+
+            Parameters:
+                    words (list(str)): List of words
+            Returns:
+                    (array('I')): token ids of the words
+    '''
+    ids = array('I')
+    get = _token_ids.get
+    for w in words:
+        i = get(w)
+        if i is None:
+            with _tokens_lock:
+                i = _token_ids.get(w)
+                if i is None:
+                    i = len(_tokens)
+                    _tokens.append(w)
+                    _token_ids[w] = i
+        ids.append(i)
+    return ids
+
+def _intern_many(word_lists):
+    '''
+    Returns the token ids of the words of each of the given lists, adding the words that are not present to the interning table.
+    New words are added once for all of the lists, so the ids are looked up without a Python loop over the words.
+
+            Parameters:
+                    word_lists (list(list(str))): List of lists of words
+            Returns:
+                    (list(array('I'))): token ids of the words of each list
+    '''
+    new = set().union(*word_lists).difference(_token_ids)
+    if new:
+        with _tokens_lock:
+            for w in sorted(new):
+                if w not in _token_ids:
+                    _token_ids[w] = len(_tokens)
+                    _tokens.append(w)
+    return [array('I', map(_token_ids.__getitem__, words)) for words in word_lists]
 
 class Document:
     '''
@@ -12,18 +163,25 @@ class Document:
     ----------
     __content: str
         Content of the document.
+    __tokens: array('I')
+        Token ids of the words in the document, according to the interning table shared by the documents of the process.
+    __ngrams: dict(int, tuple(str))
+        Ngrams of the document calculated so far, by n.
     words: list(str)
         List of words in the document.
     unique_words: list(str)
         List of unique words in the document.
     '''
-    def __init__(self, content):
+    __slots__ = ('__content', '__tokens', '__ngrams')
+
+    def __init__(self, content, validate=True):
         '''
         Constructor for the Document object. 
         Sets the __content property.
 
                 Parameters:
                         content (str): content of the document
+                        validate (bool): whether to check the content, False only for content that is known to be clean
                 Raises:
                         TypeError: if content is not string or empty string
                         ValueError: if content is HTML or is not lowercased or includes urls, emails, punctuation, numbers or whitespace other than space.
@@ -32,35 +190,85 @@ class Document:
         if type(content) != str or len(content) == 0:
             raise TypeError('A document object can only be created wit a non empty string.')
 
-        #check for HTML
-        if BeautifulSoup(content, "html.parser").find():
-            raise ValueError('Document cannot be created because text includes HTML.')
+        profiler = _profiling.active
+        if profiler is None:
+            if validate:
+                _validate(content)
+        else:
+            if validate:
+                with profiler.stage('document.validate'):
+                    _validate(content)
+            profiler.count('documents')
+
+        self.__set_content(content)
 
-        #check for URLs
-        if len(re.findall(r'\w+://\w+\.\w+\.\w+/?[\w\.\?=#]*', content)) > 0:
-            raise ValueError('Document cannot be created because text includes URL/s.')
+    @classmethod
+    def from_texts(cls, texts, validate=True, errors='raise', workers=1):
+        '''
+        Creates and returns documents from the given texts, checking them in batches instead of one constructor call each.
+        With more than one worker the texts are split into shards which are checked in a process pool,
+        the documents are created in the calling process since token ids are only valid in the process that interns them.
 
-        #check for emails
-        if len(re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', content)) > 0:
-            raise ValueError('Document cannot be created because text includes email address/es.')
+                Parameters:
+                        texts (iterable(str)): Contents of the documents
+                        validate (bool): whether to check the contents, False only for contents that are known to be clean
+                        errors (str): 'raise' to raise the error of the first rejected text, 'skip' to leave rejected texts out
+                                      or 'collect' to leave them out and report them
+                        workers (int or None): Number of worker processes, None for the number of CPUs
+                Returns:
+                        docs (list(Document)): documents of the accepted texts, in the order of the texts
+                        rejected (list(tuple(int, str))): index and error message of each rejected text if errors is 'collect', otherwise empty
+                Raises:
+                        TypeError: if errors is 'raise' and a text is not string or empty string
+                        ValueError: if errors is not 'raise', 'skip' or 'collect', workers is not None or an int bigger than 0
+                                    or errors is 'raise' and a text is HTML or is not lowercased or includes urls, emails,
+                                    punctuation, numbers or whitespace other than space.
+        '''
+        if errors not in ('raise', 'skip', 'collect'):
+            raise ValueError("errors should be one of 'raise', 'skip' or 'collect'.")
+        workers = check_workers(workers)
+        with _profiling.stage('document.from_texts'):
+            docs, rejected = cls.__from_texts(list(texts), validate, errors, workers)
+        _profiling.count('documents', len(docs))
+        return docs, rejected
 
-        #check if lowercase
-        if not content.islower():
-            raise ValueError('Document cannot be created because text is not in lowercase.')
+    @classmethod
+    def __from_texts(cls, texts, validate, errors, workers):
+        '''Checks the given texts and creates the documents of the accepted ones, see from_texts.'''
 
-        #check if punctuation is removed
-        if len([i for i in content if i in string.punctuation]) > 0:
-            raise ValueError('Document cannot be created because text includes punctuation.')
+        if not validate:
+            rejected = [(i, 'A document object can only be created wit a non empty string.') for i, t in enumerate(texts)
+                        if type(t) != str or len(t) == 0]
+        elif workers > 1 and len(texts) > _BATCH_SIZE:
+            from concurrent.futures import ProcessPoolExecutor
+            parts = shards(texts, workers)
+            offsets = [sum(len(p) for p in parts[:i]) for i in range(len(parts))]
+            with ProcessPoolExecutor(workers) as executor:
+                rejected = [r for part in executor.map(_rejections, parts, offsets) for r in part]
+        else:
+            rejected = _rejections(texts)
 
-        #check if numbers are removed
-        if len([i for i in content if i.isdigit()]) > 0:
-            raise ValueError('Document cannot be created because text includes numbers.')
+        if errors == 'raise' and len(rejected) > 0:
+            index, message = rejected[0]
+            error = TypeError if type(texts[index]) != str or len(texts[index]) == 0 else ValueError
+            raise error(f'Text at index {index} is rejected: {message}')
 
-        #check whitespace
-        if len([i for i in content if i in string.whitespace and i != ' ']) > 0 or '  ' in content:
-            raise ValueError('Document cannot be created because text includes whitespace other than space.')
+        skipped = {i for i, _ in rejected}
+        accepted = [t for i, t in enumerate(texts) if i not in skipped] if skipped else texts
+        docs = list()
+        for start in range(0, len(accepted), _BATCH_SIZE):
+            batch = accepted[start:start + _BATCH_SIZE]
+            for t, tokens in zip(batch, _intern_many([t.split() for t in batch])):
+                doc = cls.__new__(cls)
+                doc.__set_content(t, tokens)
+                docs.append(doc)
+        return docs, rejected if errors == 'collect' else []
 
+    def __set_content(self, content, tokens=None):
+        '''Sets the __content property and tokenizes it once, unless its token ids are given.'''
         self.__content = content
+        self.__tokens = _intern(content.split()) if tokens is None else tokens
+        self.__ngrams = dict()
 
     @property
     def content(self):
@@ -69,8 +277,18 @@ class Document:
 
     @property
     def words(self):
-        '''Calculates and returns the list of words in the document.'''
-        return self.content.split()
+        '''Returns the list of words in the document.'''
+        return list(map(_tokens.__getitem__, self.__tokens))
+
+    @property
+    def n_words(self):
+        '''Returns the number of words in the document.'''
+        return len(self.__tokens)
+
+    @property
+    def token_ids(self):
+        '''Returns the token ids of the words in the document. Token ids are only comparable within the same process.'''
+        return array('I', self.__tokens)
 
     @property
     def unique_words(self):
@@ -80,19 +298,77 @@ class Document:
     def n_gram(self, n):
         '''
         Calculates ngrams of the content of the document according to the n value.
+        If n is a range, ngrams of every length in the range are calculated in a single pass over the words,
+        ordered by their start positions and then by their lengths.
+        Ngrams are calculated once for each n value and cached.
 
                 Parameters:
-                        n (int): An integer in range 1 to len(content)-1
+                        n (int or tuple(int, int)): An integer in range 1 to len(content)-1 or a range (min_n, max_n) of such integers
                 Returns:
                         (str): list of ngrams of the content
+                Raises:
+                        TypeError: if n is not an integer or a tuple of two integers
+                        ValueError: if n is not in range 1 to len(content)-1 or min_n > max_n
+        '''
+        bounds = _ngram_bounds(n)
+        if bounds is None:
+            raise TypeError('n should be int or a tuple of two ints.')
+        min_n, max_n = bounds
+        if min_n <= 0 or min_n > max_n or max_n >= len(self.__tokens):
+            raise ValueError('n should be bigger than 0 and less than length of the document.')
+
+        key = min_n if min_n == max_n else bounds
+        ngrams = self.__ngrams.get(key)
+        if ngrams is None:
+            profiler = _profiling.active
+            if profiler is None:
+                ngrams = self.__ngram_tuple(min_n, max_n)
+            else:
+                with profiler.stage('document.n_gram'):
+                    ngrams = self.__ngram_tuple(min_n, max_n)
+                profiler.count('ngrams', len(ngrams))
+            self.__ngrams[key] = ngrams
+        elif _profiling.active is not None:
+            _profiling.active.count('ngram_memo_hits')
+        return list(ngrams)
+
+    def __ngram_tuple(self, min_n, max_n):
+        '''Calculates and returns the ngrams of every length in range min_n to max_n as a tuple, ordered by their start positions and then by their lengths.'''
+        words = self.words
+        if max_n == 1:
+            return tuple(words)
+        if min_n == max_n:
+            return tuple(' '.join(words[i:i+max_n]) for i in range(0,len(words)-max_n+1))
+        ngrams = list()
+        for i in range(0,len(words)-min_n+1):
+            seq = words[i]
+            for j in range(i+1, min(i+max_n, len(words))+1):
+                if j-i >= min_n:
+                    ngrams.append(seq)
+                if j < len(words):
+                    seq += ' ' + words[j]
+        return tuple(ngrams)
+
+    def n_gram_ids(self, n):
+        '''
+        Calculates ngrams of the document as tuples of token ids according to the n value.
+        Token id tuples are hashable and cheaper to compare than ngram strings, but only comparable within the same process.
+
+                Parameters:
+                        n (int): An integer in range 1 to len(content)-1
+                Returns:
+                        (list(tuple(int))): list of ngrams of the content as token id tuples
                 Raises:
                         TypeError: if n is not an integer
                         ValueError: if n is not in range 1 to len(content)-1
         '''
+        self.__check_n(n)
+        return list(zip(*(self.__tokens[i:] for i in range(n))))
+
+    def __check_n(self, n):
+        '''Raises TypeError if n is not an integer and ValueError if n is not in range 1 to len(content)-1.'''
         if type(n) == int:
-            if n > 0 and n < len(self.words):
-                return [' '.join(self.words[i:i+n]) for i in range(0,len(self.words)-n+1)]
-            else:
+            if n <= 0 or n >= len(self.__tokens):
                 raise ValueError('n should be bigger than 0 and less than length of the document.')
         else:
             raise TypeError('n should be int.')
@@ -107,6 +383,14 @@ class Document:
         Since the only settable property is content it hashes the content.'''
         return hash(self.content)
 
+    def __getstate__(self):
+        '''Pickles only the content, since token ids are not valid in other processes.'''
+        return self.__content
+
+    def __setstate__(self, content):
+        '''Unpickles the content, which was validated when the document was created, and tokenizes it.'''
+        self.__set_content(content)
+
     def __repr__(self):
         '''The representation function.'''
         return f'Document({self.content})'
\ No newline at end of file
@@ -0,0 +1,436 @@
+from .Document import Document, _ngram_bounds
+from .FeatureHasher import FeatureHasher
+from ._weighting import check_pruning
+from . import _profiling
+from collections import Counter
+import heapq
+import json
+import math
+import os
+import struct
+import numpy as np
+
+class DocumentFrequency:
+    '''
+    A class to represent the document frequencies of the ngrams in a collection of Document objects.
+    With a FeatureHasher the document frequencies of the columns of the ngrams are counted in a fixed-size array instead,
+    so that the memory of the index does not depend on the number of unique ngrams.
+
+    Attributes
+    ----------
+    n: int or tuple(int, int)
+        Length or range (min_n, max_n) of lengths of the counted ngrams
+    n_documents: int
+        Number of Document objects counted
+    counts: Counter or np.array(int)
+        Number of counted documents each ngram, or each column of the hasher, appears in
+    hasher: FeatureHasher
+        Mapping of ngrams to columns if the index counts columns instead of ngrams, otherwise None
+    cache: NgramCache
+        Persistent cache the ngram counts of the documents are read from and stored in, None to split every document into ngrams
+    '''
+    MAGIC = b'TFIDFDFQ'
+    FORMAT_VERSION = 1
+
+    def __init__(self, n, n_features=None, cache=None):
+        '''
+        Constructor for the DocumentFrequency object.
+        Creates an empty index for the ngrams of length n. A range (n, n) is the same as n.
+
+                Parameters:
+                        n (int or tuple(int, int)): An integer bigger than 0 or a range (min_n, max_n) of such integers
+                        n_features (int): Number of columns to hash the ngrams into, None to count the ngrams themselves
+                        cache (NgramCache): Persistent cache of the ngram counts of documents, None to split every document into ngrams
+                Raises:
+                        ValueError: if n is not an int or a tuple of two ints, n < 1, min_n > max_n
+                                    or n_features is not None or an int in range 1 to 2**31
+        '''
+        bounds = _ngram_bounds(n)
+        if bounds is None or bounds[0] < 1 or bounds[0] > bounds[1]:
+            raise ValueError('n value should be int or a range of ints and should be bigger than 0.')
+        self.__n = bounds[0] if bounds[0] == bounds[1] else bounds
+        self.__max_n = bounds[1]
+        self.__n_documents = 0
+        self.__cache = cache
+        if n_features is None:
+            self.__hasher = None
+            self.__counts = Counter()
+        else:
+            self.__hasher = FeatureHasher(n_features)
+            self.__counts = np.zeros(n_features, dtype=np.int64)
+
+    @classmethod
+    def from_stream(cls, source, n, validate=True, n_features=None, max_ngrams=None):
+        '''
+        Counts the ngrams of the documents in the given source, consuming it once without keeping the documents.
+        With max_ngrams the number of counted ngrams is bounded by dropping the half with the lowest counts whenever it
+        is exceeded, so the counts become lower bounds of the true document frequencies and ngrams that are rare early in
+        the source may be left out. Frequent ngrams, which are the ones kept by pruning, are counted almost exactly.
+
+                Parameters:
+                        source (iterable(Document or str) or str or os.PathLike): Documents, contents of documents
+                                or the path of a utf-8 text file with the content of a document on each non empty line
+                        n (int or tuple(int, int)): An integer bigger than 0 or a range (min_n, max_n) of such integers
+                        validate (bool): whether to check the contents, False only for contents that are known to be clean
+                        n_features (int): Number of columns to hash the ngrams into, None to count the ngrams themselves
+                        max_ngrams (int): Maximum number of ngrams to keep counts of, None to count every ngram exactly.
+                                Ignored with n_features since the memory of a hashed index is already fixed
+                Returns:
+                        (DocumentFrequency): document frequency index of the documents in the source
+                Raises:
+                        TypeError: if source is not iterable or includes items other than Document objects and strings
+                        ValueError: if n is not an int or a range of ints, n < 1, n_features is invalid,
+                                    max_ngrams is not None or an int bigger than 0 or a content cannot be a Document
+        '''
+        index = cls(n, n_features)
+        if max_ngrams is not None and (type(max_ngrams) != int or max_ngrams < 1):
+            raise ValueError('max_ngrams should be None or an int bigger than 0.')
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, encoding='utf-8') as f:
+                index.__add_stream((Document(line.rstrip('\r\n'), validate) for line in f if line.rstrip('\r\n')), max_ngrams)
+        else:
+            try:
+                items = iter(source)
+            except TypeError:
+                raise TypeError('Document frequencies can only be counted from an iterable or the path of a text file.')
+            index.__add_stream((cls.__document(item, validate) for item in items), max_ngrams)
+        return index
+
+    def __add_stream(self, docs, max_ngrams):
+        '''Counts the ngrams of the given documents, keeping at most max_ngrams ngrams if it is not None.'''
+        if max_ngrams is None or self.__hasher is not None:
+            self.add_documents(docs)
+            return
+        for ngrams in self.__ngram_sets(docs):
+            self.__counts.update(ngrams)
+            self.__n_documents += 1
+            if len(self.__counts) > max_ngrams:
+                kept = heapq.nsmallest(max(1, max_ngrams // 2), self.__counts.items(), key=lambda item: (-item[1], item[0]))
+                self.__counts = Counter(dict(kept))
+
+    @staticmethod
+    def __document(item, validate):
+        '''Returns the given item as a Document object, creating one if it is a string.'''
+        if isinstance(item, Document):
+            return item
+        if type(item) == str:
+            return Document(item, validate)
+        raise TypeError('Document frequencies can only be counted for Document objects or strings.')
+
+    @property
+    def n(self):
+        '''The getter method for the __n variable.'''
+        return self.__n
+
+    @property
+    def n_documents(self):
+        '''The getter method for the __n_documents variable.'''
+        return self.__n_documents
+
+    @property
+    def counts(self):
+        '''The getter method for the __counts variable.'''
+        return self.__counts
+
+    @property
+    def hasher(self):
+        '''The getter method for the __hasher variable.'''
+        return self.__hasher
+
+    @property
+    def cache(self):
+        '''The getter method for the __cache variable.'''
+        return self.__cache
+
+    def __ngrams(self, doc):
+        '''
+        Calculates and returns the set of ngrams, or the set of their columns if the index has a hasher, of the given document.
+        Documents that are too short to have ngrams of every length in n count as documents without any ngram.
+
+                Parameters:
+                        doc (Document): A Document object
+                Returns:
+                        (set(str) or set(int)): set of unique ngrams or columns of the document
+        '''
+        if self.__max_n < doc.n_words:
+            if self.__hasher is not None:
+                return self.__hasher.columns(doc.n_gram(self.n))
+            return set(doc.n_gram(self.n))
+        return set()
+
+    def __ngram_sets(self, docs):
+        '''Yields the set of ngrams, or columns, of each of the given documents, reading their counts from the cache in batches if there is one.'''
+        if self.__cache is None:
+            for d in docs:
+                yield self.__ngrams(d)
+            return
+        batch = list()
+        for d in docs:
+            batch.append(d)
+            if len(batch) == self.__cache.BATCH_SIZE:
+                yield from self.__cached_ngram_sets(batch)
+                batch = list()
+        yield from self.__cached_ngram_sets(batch)
+
+    def __cached_ngram_sets(self, docs):
+        '''Yields the set of ngrams, or columns, of each of the given documents from the ngram counts in the cache.'''
+        counts = iter(self.__cache.counts([d for d in docs if self.__max_n < d.n_words], self.n))
+        for d in docs:
+            if self.__max_n < d.n_words:
+                ngrams = next(counts)
+                yield self.__hasher.columns(ngrams) if self.__hasher is not None else set(ngrams)
+            else:
+                yield set()
+
+    def add_documents(self, docs):
+        '''
+        Counts the ngrams of the given documents.
+
+                Parameters:
+                        docs (iterable(Document)): Document object/s
+                Returns:
+                        (set(str) or set(int)): ngrams, or columns if the index has a hasher, whose document frequencies changed
+        '''
+        changed = set()
+        n_documents = self.__n_documents
+        with _profiling.stage('document_frequency.add_documents'):
+            for ngrams in self.__ngram_sets(docs):
+                if self.__hasher is not None:
+                    self.__counts[np.fromiter(ngrams, dtype=np.int64)] += 1
+                else:
+                    self.__counts.update(ngrams)
+                changed.update(ngrams)
+                self.__n_documents += 1
+        _profiling.count('documents_counted', self.__n_documents - n_documents)
+        return changed
+
+    def remove_documents(self, docs):
+        '''
+        Discounts the ngrams of the given documents. The documents should have been counted before.
+
+                Parameters:
+                        docs (iterable(Document)): Document object/s
+                Returns:
+                        (set(str) or set(int)): ngrams, or columns if the index has a hasher, whose document frequencies changed
+        '''
+        changed = set()
+        for ngrams in self.__ngram_sets(docs):
+            if self.__hasher is not None:
+                self.__counts[np.fromiter(ngrams, dtype=np.int64)] -= 1
+            else:
+                for seq in ngrams:
+                    count = self.__counts[seq] - 1
+                    if count > 0:
+                        self.__counts[seq] = count
+                    else:
+                        del self.__counts[seq]
+            changed.update(ngrams)
+            self.__n_documents -= 1
+        return changed
+
+    def update(self, other):
+        '''
+        Adds the counts of the given index, which was built over other documents, to this index.
+
+                Parameters:
+                        other (DocumentFrequency): document frequency index of the same ngram length and hasher
+                Raises:
+                        TypeError: if other is not a DocumentFrequency object
+                        ValueError: if the ngram lengths or the hashers of the indexes are different
+        '''
+        if not isinstance(other, DocumentFrequency):
+            raise TypeError('Only a DocumentFrequency object can be added to a DocumentFrequency object.')
+        if other.n != self.n:
+            raise ValueError('Document frequency indexes of different ngram lengths cannot be added.')
+        if other.hasher != self.hasher:
+            raise ValueError('Document frequency indexes of different hashers cannot be added.')
+        if self.__hasher is not None:
+            self.__counts += other.counts
+        else:
+            self.__counts.update(other.counts)
+        self.__n_documents += other.n_documents
+
+    @classmethod
+    def merge(cls, indexes):
+        '''
+        Creates and returns a new index with the counts of the given indexes, which were built over disjoint sets of documents,
+        e.g. the shards of a corpus on different machines. Merging is associative and commutative and exact,
+        so the merged index is the same as an index of all of the documents unless an index was pruned with max_ngrams.
+
+                Parameters:
+                        indexes (list(DocumentFrequency)): Non-empty list of document frequency indexes of the same ngram length and hasher
+                Returns:
+                        (DocumentFrequency): the merged index, without a cache
+                Raises:
+                        TypeError: if indexes is not a non-empty list of DocumentFrequency objects
+                        ValueError: if the ngram lengths or the hashers of the indexes are different
+        '''
+        if type(indexes) != list or len(indexes) == 0 or not all(isinstance(x, DocumentFrequency) for x in indexes):
+            raise TypeError('Only a non-empty list of DocumentFrequency objects can be merged.')
+        first = indexes[0]
+        merged = cls(first.n, None if first.hasher is None else first.hasher.n_features)
+        for index in indexes:
+            merged.update(index)
+        return merged
+
+    def to_bytes(self):
+        '''
+        Serializes the counts of the index into a compact binary format which is the same on every platform.
+        The data starts with the magic bytes, the length of the json header as a little endian uint64 and the header itself,
+        followed by the counts as a little endian uint32 array, or int64 if a count does not fit in 32 bits.
+        Without a hasher the counts are ordered by the utf-8 encoded ngrams, which follow as the offsets of each ngram
+        in the same integer type and the concatenated ngrams, so equal indexes always give the same bytes.
+        The cache of the index is not serialized.
+
+                Returns:
+                        (bytes): the serialized index
+        '''
+        if self.__hasher is not None:
+            encoded, counts = None, np.asarray(self.__counts)
+        else:
+            encoded = sorted((seq.encode('utf-8'), count) for seq, count in self.__counts.items())
+            counts = np.array([count for _, count in encoded], dtype=np.int64)
+            encoded = [seq for seq, _ in encoded]
+        count_dtype = self.__dtype(counts.min() if len(counts) > 0 else 0, counts.max() if len(counts) > 0 else 0)
+        header = {'format': self.FORMAT_VERSION, 'n': self.n, 'n_documents': self.n_documents, 'n_terms': len(counts),
+                  'n_features': None if self.__hasher is None else self.__hasher.n_features, 'count_dtype': count_dtype}
+        sections = [np.ascontiguousarray(counts, dtype=count_dtype).tobytes()]
+        if encoded is not None:
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(seq) for seq in encoded], out=offsets[1:])
+            header['offset_dtype'] = self.__dtype(0, offsets[-1])
+            sections += [offsets.astype(header['offset_dtype']).tobytes(), b''.join(encoded)]
+        header = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        return b''.join([self.MAGIC, struct.pack('<Q', len(header)), header, *sections])
+
+    @staticmethod
+    def __dtype(low, high):
+        '''Returns the little endian integer type of the serialized values in the given range.'''
+        return '<u4' if 0 <= low and high < 2**32 else '<i8'
+
+    @classmethod
+    def from_bytes(cls, data, cache=None):
+        '''
+        Deserializes an index serialized with the to_bytes method.
+
+                Parameters:
+                        data (bytes): The serialized index
+                        cache (NgramCache): Persistent cache of the ngram counts of documents for the documents added later
+                Returns:
+                        (DocumentFrequency): the index
+                Raises:
+                        ValueError: if data is not a serialized index
+        '''
+        data = memoryview(data)
+        if bytes(data[:len(cls.MAGIC)]) != cls.MAGIC or len(data) < len(cls.MAGIC) + 8:
+            raise ValueError('Data is not a serialized DocumentFrequency.')
+        header_size, = struct.unpack('<Q', data[len(cls.MAGIC):len(cls.MAGIC) + 8])
+        position = len(cls.MAGIC) + 8 + header_size
+        header = json.loads(bytes(data[len(cls.MAGIC) + 8:position]).decode('utf-8'))
+        if header['format'] != cls.FORMAT_VERSION:
+            raise ValueError('Data is serialized with an unsupported DocumentFrequency format.')
+        n = tuple(header['n']) if type(header['n']) == list else header['n']
+        index = cls(n, header['n_features'], cache)
+        n_terms = header['n_terms']
+        counts = np.frombuffer(data, dtype=header['count_dtype'], count=n_terms, offset=position).astype(np.int64)
+        position += counts.size*np.dtype(header['count_dtype']).itemsize
+        if header['n_features'] is not None:
+            index.__counts = counts
+        else:
+            offsets = np.frombuffer(data, dtype=header['offset_dtype'], count=n_terms + 1, offset=position).tolist()
+            table = bytes(data[position + (n_terms + 1)*np.dtype(header['offset_dtype']).itemsize:])
+            index.__counts = Counter({table[offsets[i]:offsets[i + 1]].decode('utf-8'): count for i, count in enumerate(counts.tolist())})
+        index.__n_documents = header['n_documents']
+        return index
+
+    def save(self, path):
+        '''
+        Saves the index to the given file in the format of the to_bytes method.
+
+                Parameters:
+                        path (str or os.PathLike): Path of the file
+        '''
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path, cache=None):
+        '''
+        Loads an index saved with the save method.
+
+                Parameters:
+                        path (str or os.PathLike): Path of the file
+                        cache (NgramCache): Persistent cache of the ngram counts of documents for the documents added later
+                Returns:
+                        (DocumentFrequency): the index
+                Raises:
+                        ValueError: if the file is not a saved index
+        '''
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read(), cache)
+
+    def terms(self, min_df=1, max_df=1.0, max_features=None):
+        '''
+        Calculates and returns the counted ngrams that are kept by the given pruning options, in sorted order.
+        Document frequency limits are numbers of documents if they are ints and ratios of the counted documents if they are floats.
+
+                Parameters:
+                        min_df (int or float): Minimum document frequency of the kept ngrams
+                        max_df (int or float): Maximum document frequency of the kept ngrams
+                        max_features (int): Number of ngrams with the highest document frequencies to keep, None to keep every ngram.
+                                Ties are broken by the order of the ngrams
+                Returns:
+                        (list(str)): sorted list of the kept ngrams
+                Raises:
+                        ValueError: if the index has a hasher, min_df or max_df is not a non-negative int or a float in range 0 to 1,
+                                    min_df is bigger than max_df or max_features is not None or an int bigger than 0
+        '''
+        if self.__hasher is not None:
+            raise ValueError('Ngrams of a document frequency index with a hasher cannot be pruned.')
+        check_pruning(min_df, max_df, max_features)
+        low, high = self.__df_count(min_df, math.ceil), self.__df_count(max_df, math.floor)
+        if low > high:
+            raise ValueError('min_df should not be bigger than max_df.')
+        terms = [seq for seq, count in self.__counts.items() if low <= count <= high]
+        if max_features is not None and max_features < len(terms):
+            terms = heapq.nsmallest(max_features, terms, key=lambda seq: (-self.__counts[seq], seq))
+        return sorted(terms)
+
+    def __df_count(self, df, rounding):
+        '''Returns the given document frequency limit, checked by check_pruning, as a number of documents, rounding ratios with the given function.'''
+        return df if type(df) == int else rounding(df*self.n_documents)
+
+    def idf(self, seq):
+        '''
+        Calculates and returns the idf value for the given sequence.
+        In order to eliminate division-by-zero errors for sequences that are not counted the formula is adjusted into
+        log(number of counted documents/(1 + number of documents where sequence appears)).
+
+                Parameters:
+                        seq (str): An ngram.
+                Returns:
+                        (float): IDF value for the given sequence
+        '''
+        return math.log(self.n_documents/(1 + self[seq]))
+
+    def __getitem__(self, seq):
+        '''Returns the number of counted documents the given sequence, or its column if the index has a hasher, appears in.'''
+        if self.__hasher is not None:
+            return int(self.__counts[self.__hasher.get(seq)])
+        return self.__counts.get(seq, 0)
+
+    def __contains__(self, seq):
+        '''Returns whether the given sequence, or its column if the index has a hasher, appears in any of the counted documents.'''
+        if self.__hasher is not None:
+            return self[seq] > 0
+        return seq in self.__counts
+
+    def __len__(self):
+        '''Returns the number of unique ngrams, or columns if the index has a hasher, counted.'''
+        if self.__hasher is not None:
+            return int(np.count_nonzero(self.__counts))
+        return len(self.__counts)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'DocumentFrequency(n={self.n}, n_documents={self.n_documents}, n_ngrams={len(self)})'
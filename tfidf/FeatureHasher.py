@@ -0,0 +1,103 @@
+from collections import Counter
+from zlib import crc32
+
+class FeatureHasher:
+    '''
+    A class to represent a mapping between ngrams and a fixed number of columns using the hashing trick.
+    Ngrams are mapped with the crc32 hash of their utf-8 encoding, which is the same in every process.
+    The column of an ngram is the hash modulo the number of columns and the sign of its counts is the highest bit of the hash,
+    so that ngrams colliding on a column cancel out on average instead of adding up. No ngram is stored.
+
+    Attributes
+    ----------
+    __n_features: int
+        Number of columns
+    frozen: bool
+        Always True since every ngram has a column
+    '''
+    MAX_FEATURES = 2**31
+
+    def __init__(self, n_features):
+        '''
+        Constructor for the FeatureHasher object.
+
+                Parameters:
+                        n_features (int): Number of columns, an integer in range 1 to 2**31
+                Raises:
+                        ValueError: if n_features is not an int in range 1 to 2**31
+        '''
+        if type(n_features) != int or n_features < 1 or n_features > self.MAX_FEATURES:
+            raise ValueError('n_features should be int in range 1 to 2**31.')
+        self.__n_features = n_features
+
+    @property
+    def n_features(self):
+        '''The getter method for the __n_features variable.'''
+        return self.__n_features
+
+    @property
+    def frozen(self):
+        '''A feature hasher is always frozen.'''
+        return True
+
+    def freeze(self):
+        '''Returns the feature hasher itself since it is always frozen.'''
+        return self
+
+    def get(self, term, default=None):
+        '''Returns the column of the given ngram.'''
+        return crc32(term.encode('utf-8')) % self.__n_features
+
+    def sign(self, term):
+        '''Returns the sign, 1 or -1, of the counts of the given ngram.'''
+        return -1 if crc32(term.encode('utf-8')) & 0x80000000 else 1
+
+    def columns(self, terms):
+        '''
+        Calculates and returns the set of columns of the given ngrams.
+
+                Parameters:
+                        terms (iterable(str)): Ngrams
+                Returns:
+                        (set(int)): columns of the ngrams
+        '''
+        n_features = self.__n_features
+        return {crc32(term.encode('utf-8')) % n_features for term in terms}
+
+    def count(self, ngrams):
+        '''
+        Counts the given ngrams in a single pass and returns their signed counts by column.
+        Columns where the counts of colliding ngrams cancel out are left out.
+
+                Parameters:
+                        ngrams (iterable(str) or dict(str, int)): Ngrams of a document or their numbers of occurrences
+                Returns:
+                        (dict(int, int)): signed number of occurrences of each column
+        '''
+        n_features = self.__n_features
+        counts = dict()
+        for term, count in (ngrams if isinstance(ngrams, dict) else Counter(ngrams)).items():
+            h = crc32(term.encode('utf-8'))
+            col = h % n_features
+            counts[col] = counts.get(col, 0) + (-count if h & 0x80000000 else count)
+        return {col: count for col, count in counts.items() if count != 0}
+
+    def __getitem__(self, term):
+        '''Returns the column of the given ngram.'''
+        return self.get(term)
+
+    def __len__(self):
+        '''Returns the number of columns.'''
+        return self.__n_features
+
+    def __eq__(self, other):
+        '''The equality function. Feature hashers with the same number of columns map ngrams in the same way.'''
+        return isinstance(other, FeatureHasher) and self.n_features == other.n_features
+
+    def __hash__(self):
+        '''The hash function.'''
+        return hash(self.n_features)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'FeatureHasher(n_features={self.n_features})'
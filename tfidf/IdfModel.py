@@ -0,0 +1,468 @@
+from .Document import Document, _ngram_bounds
+from .Vocabulary import Vocabulary
+from .MappedVocabulary import MappedVocabulary
+from .FeatureHasher import FeatureHasher
+from .CSRMatrix import CSRMatrix
+from .DocumentFrequency import DocumentFrequency
+from ._parallel import check_workers, shards
+from ._weighting import check_options, check_pruning, idf_values, count_arrays, weight, normalize
+from . import _profiling
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import warnings
+import json
+import struct
+import numpy as np
+
+_worker_model = None
+
+def _set_worker_model(model):
+    '''Sets the model used by _transform in a worker process.'''
+    global _worker_model
+    _worker_model = model
+
+def _transform(docs, cache):
+    '''Transforms a shard of documents in a worker process and returns the matrix with the messages of the warnings raised.'''
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        matrix = _worker_model.transform(docs, output='csr', cache=cache)
+    return matrix, [str(w.message) for w in caught]
+
+def _mapped_model(path, offset, vocabulary, n, n_documents, unseen, sublinear_tf, norm):
+    '''Creates a model with the idf values memory-mapped from the given file, when a memory-mapped model is unpickled.'''
+    idf = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(len(vocabulary),))
+    return IdfModel(vocabulary, idf, n, n_documents, unseen, sublinear_tf, norm)
+
+class IdfModel:
+    '''
+    A class to represent the idf values of a fitted Corpus. The model is immutable.
+
+    Attributes
+    ----------
+    __vocabulary: Vocabulary or MappedVocabulary or FeatureHasher
+        Frozen vocabulary of the ngrams in the fitted corpus, or the feature hasher mapping ngrams to columns
+    __idf: np.array(float)
+        IDF value of each column of the vocabulary
+    __n: int or tuple(int, int)
+        Length or range (min_n, max_n) of lengths of the ngrams of the model
+    __n_documents: int
+        Number of documents in the fitted corpus
+    __unseen: str
+        Policy for ngrams that are not in the vocabulary, one of 'ignore', 'warn' or 'error'
+    __sublinear_tf: bool
+        Whether term frequencies are calculated with 1 + log(count) instead of the counts
+    __norm: str
+        Normalization of the transformed rows, None, 'l1' or 'l2'
+    __mapping: tuple(str, int)
+        Path of the file and offset the idf values are memory-mapped from, None if they are in memory
+    '''
+    UNSEEN_POLICIES = ('ignore', 'warn', 'error')
+    MAGIC = b'TFIDFMDL'
+    FORMAT_VERSION = 1
+
+    def __init__(self, vocabulary, idf, n, n_documents, unseen='ignore', sublinear_tf=False, norm=None):
+        '''
+        Constructor for the IdfModel object.
+
+                Parameters:
+                        vocabulary (Vocabulary or MappedVocabulary or FeatureHasher): vocabulary of the ngrams, frozen by the model,
+                                or a feature hasher mapping ngrams to columns, in which case no ngram is unseen
+                        idf (array-like(float)): IDF value of each column of the vocabulary, copied unless it is read-only
+                        n (int or tuple(int, int)): Length or range (min_n, max_n) of lengths of the ngrams
+                        n_documents (int): Number of documents in the fitted corpus
+                        unseen (str): 'ignore' to leave out ngrams that are not in the vocabulary,
+                                      'warn' to leave them out with a warning or 'error' to raise ValueError
+                        sublinear_tf (bool): whether to calculate term frequencies with 1 + log(count) instead of the counts
+                        norm (str): None, 'l1' or 'l2' to divide the transformed rows by their norms
+                Raises:
+                        TypeError: if vocabulary is not a Vocabulary, MappedVocabulary or FeatureHasher object
+                        ValueError: if idf does not match the vocabulary, n is not an int or a range of ints,
+                                    unseen is unknown, sublinear_tf is not a bool or norm is unknown
+        '''
+        if not isinstance(vocabulary, (Vocabulary, MappedVocabulary, FeatureHasher)):
+            raise TypeError('An IdfModel can only be created with a Vocabulary object.')
+        self.__mapping = (idf.filename, idf.offset) if isinstance(idf, np.memmap) and idf.filename is not None else None
+        idf = np.asarray(idf, dtype=np.float64)
+        if idf.flags.writeable:
+            idf = idf.copy()
+        if idf.shape != (len(vocabulary),):
+            raise ValueError('IDF values should have one value for each ngram in the vocabulary.')
+        if unseen not in self.UNSEEN_POLICIES:
+            raise ValueError("unseen should be one of 'ignore', 'warn' or 'error'.")
+        bounds = _ngram_bounds(n)
+        if bounds is None:
+            raise ValueError('n value should be int or a range of ints.')
+        check_options(sublinear_tf, norm)
+        idf.setflags(write=False)
+        self.__vocabulary = vocabulary.freeze()
+        self.__idf = idf
+        self.__n = n
+        self.__max_n = bounds[1]
+        self.__n_documents = n_documents
+        self.__unseen = unseen
+        self.__sublinear_tf = sublinear_tf
+        self.__norm = norm
+
+    @classmethod
+    def from_document_frequency(cls, index, unseen='ignore', min_df=1, max_df=1.0, max_features=None,
+                                smooth_idf=False, sublinear_tf=False, norm=None):
+        '''
+        Creates a model from the given document frequency index. Columns are ordered by the ngrams,
+        or are the columns of the hasher of the index if it has one.
+        The vocabulary can be pruned by document frequency, in which case the pruned ngrams are unseen ngrams of the model.
+
+                Parameters:
+                        index (DocumentFrequency): document frequency index of a corpus
+                        unseen (str): Policy for ngrams that are not in the vocabulary, one of 'ignore', 'warn' or 'error'
+                        min_df (int or float): Minimum number, or ratio if it is a float, of documents an ngram appears in
+                        max_df (int or float): Maximum number, or ratio if it is a float, of documents an ngram appears in
+                        max_features (int): Number of ngrams with the highest document frequencies to keep, None to keep every ngram
+                        smooth_idf (bool): whether to calculate the idf values with log((1 + N)/(1 + df)) + 1 instead of log(N/(1 + df))
+                        sublinear_tf (bool): whether to calculate term frequencies with 1 + log(count) instead of the counts
+                        norm (str): None, 'l1' or 'l2' to divide the transformed rows by their norms
+                Returns:
+                        (IdfModel): the model
+                Raises:
+                        ValueError: if unseen is unknown, the pruning or weighting options are invalid
+                                    or the index has a hasher and the vocabulary is pruned
+        '''
+        if index.hasher is not None:
+            if cls.__pruned(min_df, max_df, max_features):
+                raise ValueError('Ngrams of a document frequency index with a hasher cannot be pruned.')
+            return cls(index.hasher, idf_values(index.counts, index.n_documents, smooth_idf), index.n, index.n_documents,
+                       unseen, sublinear_tf, norm)
+        terms = index.terms(min_df, max_df, max_features)
+        df = np.fromiter((index.counts[seq] for seq in terms), dtype=np.float64, count=len(terms))
+        return cls(Vocabulary(terms), idf_values(df, index.n_documents, smooth_idf), index.n, index.n_documents,
+                   unseen, sublinear_tf, norm)
+
+    @staticmethod
+    def __pruned(min_df, max_df, max_features):
+        '''Returns whether the given pruning options leave out any ngram of a corpus.'''
+        return not (type(min_df) == int and min_df <= 1 and type(max_df) == float and max_df >= 1.0 and max_features is None)
+
+    @classmethod
+    def fit_stream(cls, source, n, unseen='ignore', validate=True, n_features=None, min_df=1, max_df=1.0, max_features=None, max_ngrams=None,
+                   smooth_idf=False, sublinear_tf=False, norm=None):
+        '''
+        Fits and returns a model of the documents in the given source without keeping the documents in memory.
+        Only the document frequencies of the ngrams are kept while the source is consumed.
+        With n_features the ngrams are hashed into a fixed number of columns, so that the memory does not depend on the vocabulary.
+        With max_ngrams at most that many ngrams are counted at a time and the ngrams with the lowest counts are dropped
+        when it is exceeded, which bounds the memory at the cost of approximate document frequencies for rare ngrams.
+        It should be well above max_features so that the kept ngrams are counted almost exactly.
+        Documents that are too short to have ngrams of every length in n are counted as documents without any ngram.
+
+                Parameters:
+                        source (iterable(Document or str) or str or os.PathLike): Documents, contents of documents
+                                or the path of a utf-8 text file with the content of a document on each non empty line
+                        n (int or tuple(int, int)): An integer bigger than 0 or a range (min_n, max_n) of such integers
+                        unseen (str): Policy of the model for ngrams that are not in the source, one of 'ignore', 'warn' or 'error'
+                        validate (bool): whether to check the contents, False only for contents that are known to be clean
+                        n_features (int): Number of columns to hash the ngrams into, None to keep a vocabulary of the ngrams
+                        min_df (int or float): Minimum number, or ratio if it is a float, of documents an ngram appears in
+                        max_df (int or float): Maximum number, or ratio if it is a float, of documents an ngram appears in
+                        max_features (int): Number of ngrams with the highest document frequencies to keep, None to keep every ngram
+                        max_ngrams (int): Maximum number of ngrams to count at a time, None to count every ngram exactly
+                        smooth_idf (bool): whether to calculate the idf values with log((1 + N)/(1 + df)) + 1 instead of log(N/(1 + df))
+                        sublinear_tf (bool): whether to calculate term frequencies with 1 + log(count) instead of the counts
+                        norm (str): None, 'l1' or 'l2' to divide the transformed rows by their norms
+                Returns:
+                        (IdfModel): idf model of the documents
+                Raises:
+                        TypeError: if source is not iterable or includes items other than Document objects and strings
+                        ValueError: if n is not an int or a range of ints, n < 1, unseen is unknown, n_features is invalid,
+                                    the pruning or weighting options are invalid, a content cannot be a Document or source has no documents
+        '''
+        #the options are checked before the source is consumed, which can be a full pass over a large file
+        if unseen not in cls.UNSEEN_POLICIES:
+            raise ValueError("unseen should be one of 'ignore', 'warn' or 'error'.")
+        check_pruning(min_df, max_df, max_features)
+        if n_features is not None and cls.__pruned(min_df, max_df, max_features):
+            raise ValueError('Ngrams of a document frequency index with a hasher cannot be pruned.')
+        if type(smooth_idf) != bool:
+            raise ValueError('smooth_idf should be a bool.')
+        check_options(sublinear_tf, norm)
+        index = DocumentFrequency.from_stream(source, n, validate, n_features, max_ngrams)
+        if index.n_documents == 0:
+            raise ValueError('A model cannot be fitted because source has no documents.')
+        return cls.from_document_frequency(index, unseen, min_df, max_df, max_features, smooth_idf, sublinear_tf, norm)
+
+    @property
+    def vocabulary(self):
+        '''The getter method for the __vocabulary variable.'''
+        return self.__vocabulary
+
+    @property
+    def idf(self):
+        '''The getter method for the __idf variable.'''
+        return self.__idf
+
+    @property
+    def n(self):
+        '''The getter method for the __n variable.'''
+        return self.__n
+
+    @property
+    def n_documents(self):
+        '''The getter method for the __n_documents variable.'''
+        return self.__n_documents
+
+    @property
+    def unseen(self):
+        '''The getter method for the __unseen variable.'''
+        return self.__unseen
+
+    @property
+    def sublinear_tf(self):
+        '''The getter method for the __sublinear_tf variable.'''
+        return self.__sublinear_tf
+
+    @property
+    def norm(self):
+        '''The getter method for the __norm variable.'''
+        return self.__norm
+
+    def transform(self, docs, output='dense', workers=1, cache=None):
+        '''
+        Calculates and returns tfidf values for the given list of documents according to the model.
+        Term frequencies are calculated over all of the ngrams of a document, including the unseen ones,
+        and are weighted by the idf values and normalized with array operations over the whole batch.
+        Models with a feature hasher add the signed counts of the ngrams sharing a column.
+        With more than one worker the documents are split into shards which are transformed in a process pool,
+        which gives the same values as a single worker.
+
+                Parameters:
+                        docs (list(Document)): List of Document object/s
+                        output (str): 'dense' for a list of arrays, 'csr' for a CSRMatrix or 'scipy' for a scipy.sparse.csr_matrix
+                        workers (int or None): Number of worker processes, None for the number of CPUs
+                        cache (NgramCache): Persistent cache of the ngram counts of documents, None to split every document into ngrams
+                Returns:
+                        tf_idfs (list(np.array) or CSRMatrix or scipy.sparse.csr_matrix): tfidf values for the ngrams in the vocabulary
+                Raises:
+                        TypeError: if docs is not a list of Document object/s.
+                        ValueError: if n of the model is not less than the length of the shortest document, output is unknown,
+                                    workers is not None or an int bigger than 0
+                                    or a document has unseen ngrams and the unseen policy is 'error'
+                        ImportError: if output is 'scipy' and scipy is not installed
+                Warns:
+                        UserWarning: if a document has unseen ngrams and the unseen policy is 'warn'
+        '''
+        if type(docs) == list and len(docs) > 0 and all(isinstance(x, Document) for x in docs):
+            if output not in ('dense', 'csr', 'scipy'):
+                raise ValueError("output should be one of 'dense', 'csr' or 'scipy'.")
+            workers = check_workers(workers)
+            if self.__max_n >= min([d.n_words for d in docs]):
+                raise ValueError('n value of the model should be less than the length of the shortest given document.')
+
+            with _profiling.stage('idf_model.transform'):
+                if workers > 1 and len(docs) > 1:
+                    matrices = list()
+                    with ProcessPoolExecutor(workers, initializer=_set_worker_model, initargs=(self,)) as executor:
+                        for matrix, messages in executor.map(_transform, shards(docs, workers), repeat(cache)):
+                            matrices.append(matrix)
+                            for message in messages:
+                                warnings.warn(message)
+                    matrix = CSRMatrix.vstack(matrices)
+                else:
+                    matrix = self.__transform(docs, cache)
+
+            if output == 'csr':
+                return matrix
+            if output == 'scipy':
+                return matrix.to_scipy()
+            return list(matrix.toarray())
+        else:
+            raise TypeError('Tf-idf values can only be calculated for a list of Document objects.')
+
+    def rescore(self, matrix, previous, docs=None):
+        '''
+        Updates and returns the given tfidf values, transformed by a previous model of the same corpus, e.g. before documents were
+        added or removed, with the idf values of this model, without splitting the documents into ngrams again.
+        Term frequencies do not depend on the corpus, so each value is multiplied by the ratio of the new and the previous idf values
+        of its ngram and the rows are normalized again. Only the entries of ngrams whose idf values changed are updated,
+        entries of ngrams that are not in the vocabulary of this model are dropped and columns are mapped to the vocabulary of this model.
+        Values of ngrams with a previous idf value of zero cannot be rescaled, rows with such an ngram whose new idf value is not zero
+        are transformed again from the given documents.
+        Ngrams of this model that are not in the previous vocabulary, e.g. ngrams of added documents or ngrams that were pruned
+        by the previous model, have no entries in the matrix, so rows whose documents have such ngrams are transformed again as well.
+
+                Parameters:
+                        matrix (CSRMatrix): tfidf values transformed by the previous model
+                        previous (IdfModel): The model the matrix was transformed with, with the same ngram length and weighting options
+                        docs (list(Document)): Document object/s of the rows of the matrix, only needed if a row cannot be rescaled
+                                or this model has ngrams that are not in the vocabulary of the previous model
+                Returns:
+                        (CSRMatrix): tfidf values of the rows according to this model
+                Raises:
+                        TypeError: if matrix is not a CSRMatrix object, previous is not an IdfModel object
+                                   or docs is needed and has items other than Document objects
+                        ValueError: if the ngram lengths, weighting options or hashing of the models are different,
+                                    the matrix does not match the previous model
+                                    or docs is needed and is not a list with a document for each row
+        '''
+        if not isinstance(matrix, CSRMatrix):
+            raise TypeError('Only a CSRMatrix object can be rescored.')
+        if not isinstance(previous, IdfModel):
+            raise TypeError('A matrix can only be rescored from a previous IdfModel object.')
+        if (_ngram_bounds(previous.n), previous.sublinear_tf, previous.norm) != (_ngram_bounds(self.n), self.sublinear_tf, self.norm):
+            raise ValueError('Only a matrix of a model with the same ngram length and weighting options can be rescored.')
+        hashing = isinstance(self.vocabulary, FeatureHasher)
+        if hashing != isinstance(previous.vocabulary, FeatureHasher) or (hashing and self.vocabulary != previous.vocabulary):
+            raise ValueError('Only a matrix of a model with the same hashing can be rescored.')
+        if matrix.shape[1] != len(previous.vocabulary):
+            raise ValueError('Matrix should have one column for each ngram in the vocabulary of the previous model.')
+
+        indptr, indices, data = matrix.indptr, matrix.indices, matrix.data.copy()
+        added = set()
+        if hashing or previous.vocabulary is self.vocabulary:
+            columns = indices
+        else:
+            used = np.unique(indices)
+            mapping = np.fromiter((self.vocabulary.get(previous.vocabulary.term(int(col)), -1) for col in used), dtype=np.int64, count=len(used))
+            columns = mapping[np.searchsorted(used, indices)]
+            added = {seq for seq in self.vocabulary if seq not in previous.vocabulary}
+        kept = columns >= 0
+        old_idf = previous.idf[indices]
+        new_idf = np.where(kept, self.idf[np.where(kept, columns, 0)], 0.0)
+        changed = kept & (old_idf != new_idf) & (old_idf != 0)
+        data[changed] *= new_idf[changed]/old_idf[changed]
+
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(indptr))
+        lost = np.unique(rows[kept & (old_idf == 0) & (new_idf != 0)])
+        if len(lost) > 0 and (type(docs) != list or len(docs) != matrix.shape[0]):
+            raise ValueError('Rows with ngrams whose previous idf value is zero can only be rescored with a list of their documents.')
+        if len(added) > 0:
+            if type(docs) != list or len(docs) != matrix.shape[0]:
+                raise ValueError('Rows can only be rescored with a list of their documents if the model has ngrams that are not in the previous vocabulary.')
+            if not all(isinstance(d, Document) for d in docs):
+                raise TypeError('Tf-idf values can only be calculated for a list of Document objects.')
+            missing = np.fromiter((i for i, d in enumerate(docs) if not added.isdisjoint(d.n_gram(self.n))), dtype=np.int64)
+            lost = np.union1d(lost, missing)
+        if len(lost) > 0:
+            kept &= ~np.isin(rows, lost)
+            recomputed = self.transform([docs[i] for i in lost], output='csr')
+            rows = np.concatenate((rows[kept], np.repeat(lost, np.diff(recomputed.indptr))))
+            columns = np.concatenate((columns[kept], recomputed.indices))
+            data = np.concatenate((data[kept], recomputed.data))
+        else:
+            rows, columns, data = rows[kept], columns[kept], data[kept]
+
+        order = np.lexsort((columns, rows))
+        rows, columns, data = rows[order], columns[order], data[order]
+        indptr = np.zeros(matrix.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=matrix.shape[0]), out=indptr[1:])
+        if self.norm is not None:
+            normalize(indptr, data, self.norm, rows)
+        return CSRMatrix(data, columns, indptr, (matrix.shape[0], len(self.vocabulary)))
+
+    def __transform(self, docs, cache=None):
+        '''
+        Calculates and returns tfidf values for the given list of documents as a sparse matrix.
+
+                Parameters:
+                        docs (list(Document)): List of Document object/s
+                        cache (NgramCache): Persistent cache of the ngram counts of documents, None to split every document into ngrams
+                Returns:
+                        (CSRMatrix): tfidf values of the documents, one row per document and one column per ngram
+        '''
+        rows = list()
+        lengths = np.zeros(len(docs), dtype=np.int64)
+        ngram_counts = cache.counts(docs, self.n) if cache is not None else (d.n_gram(self.n) for d in docs)
+        for i, ngrams in enumerate(ngram_counts):
+            counts = self.vocabulary.count(ngrams)
+            length = sum(ngrams.values()) if isinstance(ngrams, dict) else len(ngrams)
+            if self.unseen != 'ignore' and not isinstance(self.vocabulary, FeatureHasher) and sum(counts.values()) != length:
+                if self.unseen == 'error':
+                    raise ValueError('Document includes ngram/s that are not in the vocabulary of the model.')
+                elif self.unseen == 'warn':
+                    warnings.warn('Ngram/s that are not in the vocabulary of the model are ignored.')
+            rows.append(counts)
+            lengths[i] = length
+        indptr, indices, data = count_arrays(rows)
+        weight(indptr, indices, data, lengths, self.idf, self.sublinear_tf, self.norm)
+        return CSRMatrix(data, indices, indptr, (len(docs), len(self.vocabulary)))
+
+    def save(self, path):
+        '''
+        Saves the model to the given file.
+        The file starts with the magic bytes, the length of the json header as a little endian uint64 and the header itself,
+        followed by the idf values as a raw little endian float64 array and the vocabulary section of MappedVocabulary.
+        Models with a feature hasher have no vocabulary section and keep the number of columns in the header.
+        Every section is aligned to 8 bytes so that the file can be memory-mapped by load.
+
+                Parameters:
+                        path (str): Path of the file
+        '''
+        hashing = isinstance(self.vocabulary, FeatureHasher)
+        header = json.dumps({'format': self.FORMAT_VERSION, 'n': self.n, 'n_documents': self.n_documents, 'unseen': self.unseen,
+                             'n_terms': len(self.vocabulary), 'n_features': len(self.vocabulary) if hashing else None,
+                             'sublinear_tf': self.sublinear_tf, 'norm': self.norm}).encode('utf-8')
+        header += b' '*(-len(header) % 8)
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            f.write(np.ascontiguousarray(self.idf, dtype='<f8').tobytes())
+            if not hashing:
+                f.write(MappedVocabulary.section(self.vocabulary.terms))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        '''
+        Loads a model saved with the save method.
+
+                Parameters:
+                        path (str): Path of the file
+                        mmap (bool): whether to memory-map the idf values and the vocabulary instead of reading them into memory
+                Returns:
+                        (IdfModel): the model
+                Raises:
+                        ValueError: if the file is not a saved model
+        '''
+        with open(path, 'rb') as f:
+            if f.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError('File is not a saved IdfModel.')
+            header_size, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            if header['format'] != cls.FORMAT_VERSION:
+                raise ValueError('File is saved with an unsupported IdfModel format.')
+            n_terms = header['n_terms']
+            n_features = header.get('n_features')
+            idf_offset = len(cls.MAGIC) + 8 + header_size
+            vocabulary_offset = idf_offset + 8*n_terms
+            if not mmap:
+                f.seek(idf_offset)
+                idf = np.frombuffer(f.read(8*n_terms), dtype='<f8')
+                if n_features is None:
+                    columns = np.frombuffer(f.read(8*n_terms), dtype='<i8')
+                    f.seek(8*n_terms, 1)
+                    offsets = np.frombuffer(f.read(8*(n_terms + 1)), dtype='<i8')
+                    table = f.read(int(offsets[-1]))
+                    terms = [None]*n_terms
+                    for position, col in enumerate(columns):
+                        terms[col] = table[offsets[position]:offsets[position + 1]].decode('utf-8')
+                    vocabulary = Vocabulary(terms)
+
+        if mmap:
+            idf = np.memmap(path, dtype='<f8', mode='r', offset=idf_offset, shape=(n_terms,)) if n_terms > 0 else np.zeros(0)
+            if n_features is None:
+                vocabulary = MappedVocabulary(path, vocabulary_offset, n_terms)
+        if n_features is not None:
+            vocabulary = FeatureHasher(n_features)
+        n = tuple(header['n']) if type(header['n']) == list else header['n']
+        return cls(vocabulary, idf, n, header['n_documents'], header['unseen'], header.get('sublinear_tf', False), header.get('norm'))
+
+    def __reduce__(self):
+        '''
+        Pickles the model with its idf values, or as a reference to the mapped file if they are memory-mapped,
+        so that unpickling maps the same file again instead of making a writeable copy.
+        '''
+        options = (self.__n, self.__n_documents, self.__unseen, self.__sublinear_tf, self.__norm)
+        if self.__mapping is not None:
+            return (_mapped_model, self.__mapping + (self.__vocabulary,) + options)
+        return (IdfModel, (self.__vocabulary, self.__idf) + options)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'IdfModel(n={self.n}, n_documents={self.n_documents}, n_terms={len(self.vocabulary)})'
@@ -0,0 +1,84 @@
+from collections import OrderedDict, namedtuple
+import threading
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'max_size', 'size'])
+
+class LRUCache:
+    '''
+    A class to represent a bounded in-process cache which evicts the least recently used entry when it is full.
+    The cache can be shared by threads.
+
+    Attributes
+    ----------
+    max_size: int
+        Maximum number of entries
+    hits: int
+        Number of lookups that found an entry
+    misses: int
+        Number of lookups that did not find an entry
+    '''
+    def __init__(self, max_size=1024):
+        '''
+        Constructor for the LRUCache object.
+
+                Parameters:
+                        max_size (int): Maximum number of entries, 0 to disable the cache
+                Raises:
+                        ValueError: if max_size is not an int bigger than or equal to 0
+        '''
+        if type(max_size) != int or max_size < 0:
+            raise ValueError('max_size should be an int bigger than or equal to 0.')
+        self.__max_size = max_size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self):
+        '''The getter method for the __max_size variable.'''
+        return self.__max_size
+
+    def get(self, key, default=None):
+        '''Returns the entry of the given key, marking it as the most recently used, or default if it is not present.'''
+        with self.__lock:
+            try:
+                value = self.__entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        '''Stores the given entry as the most recently used one, evicting the least recently used entry if the cache is full.'''
+        if self.__max_size == 0:
+            return
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+            if len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        '''Removes every entry. The hit and miss counters are kept.'''
+        with self.__lock:
+            self.__entries.clear()
+
+    def cache_info(self):
+        '''Returns the hit and miss counters, the maximum size and the number of entries of the cache.'''
+        with self.__lock:
+            return CacheInfo(self.hits, self.misses, self.__max_size, len(self.__entries))
+
+    def __contains__(self, key):
+        '''Returns whether the given key is present, without marking it as used.'''
+        return key in self.__entries
+
+    def __len__(self):
+        '''Returns the number of entries.'''
+        return len(self.__entries)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'LRUCache(max_size={self.max_size}, size={len(self)})'
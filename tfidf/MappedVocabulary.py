@@ -0,0 +1,148 @@
+from collections import Counter
+import mmap
+import numpy as np
+
+class MappedVocabulary:
+    '''
+    A class to represent a frozen vocabulary that is read from a memory-mapped file instead of being loaded into memory.
+    The ngrams are kept as a sorted string table and are looked up with binary search, so opening the vocabulary
+    does not depend on its size and the pages of the file are shared between processes mapping the same file.
+
+    The vocabulary section of the file consists of 8 byte aligned little endian arrays:
+    columns (int64, column id of the i-th sorted ngram), positions (int64, sorted position of the column id i),
+    offsets (int64, n_terms + 1 offsets into the string table) and the utf-8 encoded string table.
+
+    Attributes
+    ----------
+    __path: str
+        Path of the mapped file
+    __offset: int
+        Offset of the vocabulary section in the file
+    __n_terms: int
+        Number of ngrams in the vocabulary
+    frozen: bool
+        Always True since a mapped vocabulary cannot be changed
+    '''
+    def __init__(self, path, offset, n_terms):
+        '''
+        Constructor for the MappedVocabulary object. Maps the vocabulary section of the given file.
+
+                Parameters:
+                        path (str): Path of the file
+                        offset (int): Offset of the vocabulary section in the file, a multiple of 8
+                        n_terms (int): Number of ngrams in the vocabulary
+        '''
+        self.__path = str(path)
+        self.__offset = offset
+        self.__n_terms = n_terms
+        with open(self.__path, 'rb') as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.__columns = np.frombuffer(self.__mmap, dtype='<i8', count=n_terms, offset=offset)
+        self.__positions = np.frombuffer(self.__mmap, dtype='<i8', count=n_terms, offset=offset + 8*n_terms)
+        self.__offsets = np.frombuffer(self.__mmap, dtype='<i8', count=n_terms + 1, offset=offset + 16*n_terms)
+        self.__table = offset + 24*n_terms + 8
+
+    @staticmethod
+    def section(terms):
+        '''
+        Calculates and returns the vocabulary section of a file for the given ngrams.
+
+                Parameters:
+                        terms (list(str)): Ngrams ordered by their column ids
+                Returns:
+                        (bytes): the vocabulary section, padded to a multiple of 8 bytes
+        '''
+        encoded = [seq.encode('utf-8') for seq in terms]
+        columns = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype='<i8')
+        positions = np.empty(len(encoded), dtype='<i8')
+        positions[columns] = np.arange(len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype='<i8')
+        np.cumsum([len(encoded[col]) for col in columns], out=offsets[1:])
+        table = b''.join(encoded[col] for col in columns)
+        return columns.tobytes() + positions.tobytes() + offsets.tobytes() + table + b'\0'*(-len(table) % 8)
+
+    @property
+    def path(self):
+        '''The getter method for the __path variable.'''
+        return self.__path
+
+    @property
+    def frozen(self):
+        '''A mapped vocabulary is always frozen.'''
+        return True
+
+    @property
+    def terms(self):
+        '''Returns the list of ngrams ordered by their column ids.'''
+        return [self.term(col) for col in range(self.__n_terms)]
+
+    def freeze(self):
+        '''Returns the vocabulary itself since a mapped vocabulary is always frozen.'''
+        return self
+
+    def __entry(self, position):
+        '''Returns the utf-8 encoded ngram at the given sorted position.'''
+        return self.__mmap[self.__table + int(self.__offsets[position]):self.__table + int(self.__offsets[position + 1])]
+
+    def get(self, term, default=None):
+        '''Returns the column id of the given ngram or default if it is not present.'''
+        key = term.encode('utf-8')
+        lo, hi = 0, self.__n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__entry(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.__n_terms and self.__entry(lo) == key:
+            return int(self.__columns[lo])
+        return default
+
+    def count(self, ngrams):
+        '''
+        Counts the given ngrams in a single pass and returns the counts by column id, leaving out the ones that are not present.
+
+                Parameters:
+                        ngrams (iterable(str) or dict(str, int)): Ngrams of a document or their numbers of occurrences
+                Returns:
+                        (dict(int, int)): number of occurrences of each column id
+        '''
+        counts = dict()
+        for term, count in (ngrams if isinstance(ngrams, dict) else Counter(ngrams)).items():
+            col = self.get(term)
+            if col is not None:
+                counts[col] = count
+        return counts
+
+    def term(self, col):
+        '''Returns the ngram of the given column id.'''
+        if col < 0 or col >= self.__n_terms:
+            raise IndexError('Column id is out of range.')
+        return self.__entry(int(self.__positions[col])).decode('utf-8')
+
+    def __getitem__(self, term):
+        '''Returns the column id of the given ngram. Raises KeyError if it is not present.'''
+        col = self.get(term)
+        if col is None:
+            raise KeyError(term)
+        return col
+
+    def __contains__(self, term):
+        '''Returns whether the given ngram is present in the vocabulary.'''
+        return self.get(term) is not None
+
+    def __iter__(self):
+        '''Iterates over the ngrams ordered by their column ids.'''
+        return (self.term(col) for col in range(self.__n_terms))
+
+    def __len__(self):
+        '''Returns the number of ngrams in the vocabulary.'''
+        return self.__n_terms
+
+    def __reduce__(self):
+        '''Pickles the vocabulary as a reference to the mapped file, so that unpickling maps the same file again.'''
+        return (MappedVocabulary, (self.__path, self.__offset, self.__n_terms))
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'MappedVocabulary(path={self.path!r}, n_terms={len(self)})'
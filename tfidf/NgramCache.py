@@ -0,0 +1,195 @@
+from .Document import _ngram_bounds
+from . import _profiling
+from array import array
+from collections import Counter
+import hashlib
+import sqlite3
+import sys
+
+class NgramCache:
+    '''
+    A class to represent a persistent cache of the ngram counts of documents in a SQLite file.
+    Counts are keyed by the sha256 digest of the content of a document and the ngram length, so they are valid in every
+    process and across runs, and documents that are already in the cache are never split into ngrams again.
+    The total size of the stored counts is bounded, the least recently used counts are evicted when it is exceeded.
+    Counts are stored as a little endian uint32 array of the number of ngrams and the counts, followed by the null separated utf-8 ngrams,
+    which is decoded several times faster than json and than splitting a document into ngrams again.
+
+    Attributes
+    ----------
+    path: str
+        Path of the SQLite file
+    max_bytes: int
+        Maximum total size of the stored counts in bytes
+    hits: int
+        Number of counts found in the cache by this object
+    misses: int
+        Number of counts calculated and stored by this object
+    '''
+    #number of documents looked up with a single query, below the limit of SQLite for query parameters
+    BATCH_SIZE = 500
+    #version of the encoding of the counts, files of older versions are emptied when they are opened
+    FORMAT_VERSION = 2
+
+    def __init__(self, path, max_bytes=2**30):
+        '''
+        Constructor for the NgramCache object. Opens the given SQLite file, creating it if it does not exist.
+
+                Parameters:
+                        path (str or os.PathLike): Path of the SQLite file
+                        max_bytes (int): Maximum total size of the stored counts in bytes
+                Raises:
+                        ValueError: if max_bytes is not an int bigger than 0
+        '''
+        if type(max_bytes) != int or max_bytes < 1:
+            raise ValueError('max_bytes should be an int bigger than 0.')
+        self.__path = str(path)
+        self.__max_bytes = max_bytes
+        self.__connection = sqlite3.connect(self.__path)
+        with self.__connection:
+            if self.__connection.execute('PRAGMA user_version').fetchone()[0] != self.FORMAT_VERSION:
+                self.__connection.execute('DROP TABLE IF EXISTS ngram_counts')
+                self.__connection.execute(f'PRAGMA user_version = {self.FORMAT_VERSION}')
+            self.__connection.execute('CREATE TABLE IF NOT EXISTS ngram_counts (digest TEXT, n TEXT, counts BLOB, size INTEGER, used INTEGER, '
+                                      'PRIMARY KEY (digest, n))')
+            self.__connection.execute('CREATE INDEX IF NOT EXISTS ngram_counts_used ON ngram_counts (used)')
+        self.__clock, self.__size = self.__connection.execute('SELECT COALESCE(MAX(used), 0), COALESCE(SUM(size), 0) FROM ngram_counts').fetchone()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def path(self):
+        '''The getter method for the __path variable.'''
+        return self.__path
+
+    @property
+    def max_bytes(self):
+        '''The getter method for the __max_bytes variable.'''
+        return self.__max_bytes
+
+    @staticmethod
+    def digest(doc):
+        '''Returns the sha256 digest of the content of the given document, which is the same in every process.'''
+        return hashlib.sha256(doc.content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def __encode(counts):
+        '''
+        Encodes the given ngram counts as a little endian uint32 array of the number of ngrams and the counts, followed by the null separated utf-8 ngrams.
+        Returns None if an ngram includes a null character, so that the counts are not stored.
+        '''
+        ngrams = '\0'.join(counts)
+        if ngrams.count('\0') != max(0, len(counts) - 1):
+            return None
+        values = array('I', [len(counts)])
+        values.extend(counts.values())
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tobytes() + ngrams.encode('utf-8')
+
+    @staticmethod
+    def __decode(blob):
+        '''Decodes ngram counts encoded with the __encode method.'''
+        values = array('I')
+        values.frombytes(blob[:4])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        size = values[0]
+        if size == 0:
+            return dict()
+        values = array('I')
+        values.frombytes(blob[4:4 + 4*size])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return dict(zip(blob[4 + 4*size:].decode('utf-8').split('\0'), values))
+
+    @staticmethod
+    def __key(n):
+        '''Returns the key of the given ngram length, which is the same for n and (n, n).'''
+        min_n, max_n = _ngram_bounds(n)
+        return str(min_n) if min_n == max_n else f'{min_n},{max_n}'
+
+    def counts(self, docs, n):
+        '''
+        Returns the ngram counts of the given documents, looking them up in the cache and calculating and storing the missing ones.
+        Lookups and stores are done in batches, with one query and one transaction for each batch.
+
+                Parameters:
+                        docs (list(Document)): List of Document object/s, each longer than the ngrams
+                        n (int or tuple(int, int)): An ngram length or range of ngram lengths
+                Returns:
+                        (list(dict(str, int))): number of occurrences of each ngram of each document
+                Raises:
+                        ValueError: if n is not in range 1 to len(content)-1 for a document that is not in the cache
+        '''
+        key = self.__key(n)
+        hits, misses = self.hits, self.misses
+        result = list()
+        for start in range(0, len(docs), self.BATCH_SIZE):
+            batch = docs[start:start + self.BATCH_SIZE]
+            digests = [self.digest(d) for d in batch]
+            found = dict(self.__connection.execute(
+                f'SELECT digest, counts FROM ngram_counts WHERE n = ? AND digest IN ({",".join("?"*len(set(digests)))})',
+                [key, *set(digests)]).fetchall())
+            calculated = dict()
+            for d, digest in zip(batch, digests):
+                if digest in found:
+                    counts = self.__decode(found[digest])
+                    self.hits += 1
+                elif digest in calculated:
+                    counts = calculated[digest]
+                else:
+                    counts = calculated[digest] = dict(Counter(d.n_gram(n)))
+                    self.misses += 1
+                result.append(counts)
+            blobs = {digest: self.__encode(counts) for digest, counts in calculated.items()}
+            self.__store(key, found.keys(), {digest: blob for digest, blob in blobs.items() if blob is not None})
+        _profiling.count('ngram_cache_hits', self.hits - hits)
+        _profiling.count('ngram_cache_misses', self.misses - misses)
+        return result
+
+    def __store(self, key, used, rows):
+        '''Marks the given digests as used, stores the given counts and evicts the least recently used counts if the cache is full.'''
+        self.__clock += 1
+        with self.__connection:
+            self.__connection.executemany('UPDATE ngram_counts SET used = ? WHERE digest = ? AND n = ?',
+                                          [(self.__clock, digest, key) for digest in used])
+            self.__connection.executemany('INSERT OR REPLACE INTO ngram_counts VALUES (?, ?, ?, ?, ?)',
+                                          [(digest, key, blob, len(blob), self.__clock) for digest, blob in rows.items()])
+        self.__size += sum(len(blob) for blob in rows.values())
+        if self.__size > self.__max_bytes:
+            self.__evict()
+
+    def __evict(self):
+        '''Deletes the least recently used counts until the stored counts take at most half of max_bytes.'''
+        with self.__connection:
+            self.__size, = self.__connection.execute('SELECT COALESCE(SUM(size), 0) FROM ngram_counts').fetchone()
+            evicted = list()
+            for digest, n, size in self.__connection.execute('SELECT digest, n, size FROM ngram_counts ORDER BY used'):
+                if self.__size <= self.__max_bytes // 2:
+                    break
+                evicted.append((digest, n))
+                self.__size -= size
+            self.__connection.executemany('DELETE FROM ngram_counts WHERE digest = ? AND n = ?', evicted)
+
+    def clear(self):
+        '''Deletes every stored count.'''
+        with self.__connection:
+            self.__connection.execute('DELETE FROM ngram_counts')
+        self.__size = 0
+
+    def close(self):
+        '''Closes the SQLite file.'''
+        self.__connection.close()
+
+    def __len__(self):
+        '''Returns the number of stored counts.'''
+        return self.__connection.execute('SELECT COUNT(*) FROM ngram_counts').fetchone()[0]
+
+    def __reduce__(self):
+        '''Pickles the cache as a reference to the SQLite file, so that unpickling opens the same file again.'''
+        return (NgramCache, (self.__path, self.__max_bytes))
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'NgramCache(path={self.path!r}, max_bytes={self.max_bytes})'
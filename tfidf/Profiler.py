@@ -0,0 +1,176 @@
+from . import _profiling
+from collections import namedtuple
+from contextlib import contextmanager
+import threading
+import time
+import tracemalloc
+
+ProfileStats = namedtuple('ProfileStats', ['timers', 'counters', 'peak_bytes'])
+
+class Profiler:
+    '''
+    A class to represent an opt-in profiler of the stages of the package, e.g. validation, ngram extraction,
+    document frequency counting and the assembly of the outputs of Corpus.tf_idf.
+    The instrumented code reports to the profiler that is enabled, and only checks whether one is enabled otherwise,
+    so profiling has almost no overhead when it is disabled. Work done in worker processes is not reported.
+
+    Timers are inclusive, e.g. the 'document.n_gram' stages run inside a 'tf_idf.ngram_counts' stage are counted by both.
+    Counters include the numbers of created documents ('documents'), extracted ngrams ('ngrams'), n_gram calls served from the
+    ngrams cached by a document ('ngram_memo_hits'), documents counted by document frequency indexes ('documents_counted'),
+    hits and misses of NgramCache ('ngram_cache_hits', 'ngram_cache_misses') and of Corpus.transform
+    ('transform_cache_hits', 'transform_cache_misses') and the size of the last vocabulary built ('vocabulary_size').
+
+    Attributes
+    ----------
+    callback: callable
+        Function called with the name and the seconds of every finished stage, None for no callback
+    trace_memory: bool
+        Whether the peak allocation is traced with tracemalloc while the profiler is enabled, which slows down allocations
+    __timers: dict(str, list(int, float))
+        Number of calls and total seconds of each stage
+    __counters: dict(str, int)
+        Value of each counter
+    __peak_bytes: int
+        Highest traced allocation in bytes, None if memory is not traced
+    '''
+    def __init__(self, callback=None, trace_memory=False):
+        '''
+        Constructor for the Profiler object. The profiler is disabled until it is enabled or used as a context manager.
+
+                Parameters:
+                        callback (callable): Function called with the name and the seconds of every finished stage, None for no callback
+                        trace_memory (bool): whether to trace the peak allocation with tracemalloc while the profiler is enabled
+                Raises:
+                        ValueError: if callback is not None or callable or trace_memory is not a bool
+        '''
+        if callback is not None and not callable(callback):
+            raise ValueError('callback should be None or callable.')
+        if type(trace_memory) != bool:
+            raise ValueError('trace_memory should be a bool.')
+        self.__callback = callback
+        self.__trace_memory = trace_memory
+        self.__lock = threading.Lock()
+        self.__previous = list()
+        self.__started_tracing = False
+        self.reset()
+
+    @property
+    def callback(self):
+        '''The getter method for the __callback variable.'''
+        return self.__callback
+
+    @property
+    def trace_memory(self):
+        '''The getter method for the __trace_memory variable.'''
+        return self.__trace_memory
+
+    @property
+    def enabled(self):
+        '''Returns whether the profiler is the one the instrumented code reports to.'''
+        return _profiling.active is self
+
+    def enable(self):
+        '''Makes the instrumented code report to the profiler until it is disabled. The previously enabled profiler is restored then.'''
+        self.__previous.append(_profiling.active)
+        _profiling.active = self
+        if self.__trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+
+    def disable(self):
+        '''Stops the reporting to the profiler and restores the previously enabled profiler.'''
+        if not self.enabled:
+            return
+        if self.__trace_memory and tracemalloc.is_tracing():
+            self.__record_peak()
+            if self.__started_tracing:
+                tracemalloc.stop()
+                self.__started_tracing = False
+        _profiling.active = self.__previous.pop() if self.__previous else None
+
+    def __enter__(self):
+        '''Enables the profiler.'''
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        '''Disables the profiler.'''
+        self.disable()
+        return False
+
+    @contextmanager
+    def stage(self, name):
+        '''
+        Times the code run in the returned context manager as a call of the given stage and calls the callback with its seconds.
+
+                Parameters:
+                        name (str): Name of the stage
+        '''
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.__lock:
+                timer = self.__timers.setdefault(name, [0, 0.0])
+                timer[0] += 1
+                timer[1] += seconds
+            if self.__callback is not None:
+                self.__callback(name, seconds)
+
+    def count(self, name, value=1):
+        '''Adds the given value to the counter with the given name.'''
+        with self.__lock:
+            self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        '''Sets the counter with the given name to the given value.'''
+        with self.__lock:
+            self.__counters[name] = value
+
+    def __record_peak(self):
+        '''Records the peak traced allocation since the last call, if it is higher than the recorded one.'''
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        self.__peak_bytes = max(self.__peak_bytes or 0, peak)
+
+    def stats(self):
+        '''
+        Returns the statistics collected so far.
+
+                Returns:
+                        (ProfileStats): number of calls and total seconds of each stage, value of each counter
+                                and the peak traced allocation in bytes, which is None if memory is not traced
+        '''
+        if self.__trace_memory and self.enabled and tracemalloc.is_tracing():
+            self.__record_peak()
+        with self.__lock:
+            return ProfileStats({name: (calls, seconds) for name, (calls, seconds) in self.__timers.items()},
+                                dict(self.__counters), self.__peak_bytes)
+
+    def reset(self):
+        '''Clears the collected statistics.'''
+        self.__timers = dict()
+        self.__counters = dict()
+        self.__peak_bytes = None
+
+    def report(self):
+        '''
+        Formats the collected statistics as a table, stages in decreasing order of their total seconds.
+
+                Returns:
+                        (str): the report
+        '''
+        stats = self.stats()
+        lines = [f'{"stage":<32} {"calls":>10} {"seconds":>12}']
+        for name, (calls, seconds) in sorted(stats.timers.items(), key=lambda item: -item[1][1]):
+            lines.append(f'{name:<32} {calls:>10} {seconds:>12.6f}')
+        for name, value in sorted(stats.counters.items()):
+            lines.append(f'{name:<32} {value:>10}')
+        if stats.peak_bytes is not None:
+            lines.append(f'{"peak_bytes":<32} {stats.peak_bytes:>10}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'Profiler(enabled={self.enabled}, n_stages={len(self.__timers)}, n_counters={len(self.__counters)})'
@@ -0,0 +1,262 @@
+from .Document import Document, _ngram_bounds
+from .IdfModel import IdfModel
+from collections import deque
+import asyncio
+import json
+import time
+
+class ScoringService:
+    '''
+    A class to represent an asyncio front end scoring documents with a fitted IdfModel.
+    Concurrent requests are coalesced into micro-batches which are transformed with a single call of the model in an executor,
+    so the event loop is not blocked and the overhead of a call is shared by the documents of a batch.
+    A batch is sent as soon as it has max_batch_size documents or its first document has waited max_delay seconds.
+
+    Attributes
+    ----------
+    model: IdfModel
+        Model the documents are scored with
+    max_batch_size: int
+        Maximum number of documents in a batch
+    max_delay: float
+        Maximum number of seconds the first document of a batch waits for other documents
+    __latencies: deque(float)
+        Seconds taken by the most recent requests, from submission to result
+    n_requests: int
+        Number of scored documents
+    n_batches: int
+        Number of transformed batches
+    '''
+    #number of the most recent latencies kept for the percentiles
+    MAX_LATENCIES = 10000
+
+    def __init__(self, model, max_batch_size=64, max_delay=0.005, executor=None):
+        '''
+        Constructor for the ScoringService object. The service starts on its first request or with start.
+
+                Parameters:
+                        model (IdfModel): A fitted model
+                        max_batch_size (int): Maximum number of documents in a batch, an integer bigger than 0
+                        max_delay (int or float): Maximum number of seconds the first document of a batch waits for other documents
+                        executor (concurrent.futures.Executor): Executor the batches are transformed in, None for the default executor of the loop
+                Raises:
+                        TypeError: if model is not an IdfModel object
+                        ValueError: if max_batch_size is not an int bigger than 0 or max_delay is not a non-negative number
+        '''
+        if not isinstance(model, IdfModel):
+            raise TypeError('A ScoringService can only be created with an IdfModel object.')
+        if type(max_batch_size) != int or max_batch_size < 1:
+            raise ValueError('max_batch_size should be an int bigger than 0.')
+        if type(max_delay) not in (int, float) or max_delay < 0:
+            raise ValueError('max_delay should be a non-negative number.')
+        self.__model = model
+        self.__max_n = _ngram_bounds(model.n)[1]
+        self.__max_batch_size = max_batch_size
+        self.__max_delay = max_delay
+        self.__executor = executor
+        self.__queue = None
+        self.__batcher = None
+        self.__batch = list()
+        self.__latencies = deque(maxlen=self.MAX_LATENCIES)
+        self.n_requests = 0
+        self.n_batches = 0
+
+    @property
+    def model(self):
+        '''The getter method for the __model variable.'''
+        return self.__model
+
+    @property
+    def max_batch_size(self):
+        '''The getter method for the __max_batch_size variable.'''
+        return self.__max_batch_size
+
+    @property
+    def max_delay(self):
+        '''The getter method for the __max_delay variable.'''
+        return self.__max_delay
+
+    async def start(self):
+        '''Starts the task which collects the requests into batches, if it is not running.'''
+        if self.__batcher is None:
+            self.__queue = asyncio.Queue()
+            self.__batcher = asyncio.get_running_loop().create_task(self.__run())
+
+    async def stop(self):
+        '''Stops the task which collects the requests into batches. Requests waiting for a batch or in the running batch are cancelled.'''
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            try:
+                await self.__batcher
+            except asyncio.CancelledError:
+                pass
+            for _, future, _ in self.__batch:
+                future.cancel()
+            self.__batch = list()
+            while not self.__queue.empty():
+                _, future, _ = self.__queue.get_nowait()
+                future.cancel()
+            self.__batcher = None
+
+    async def __aenter__(self):
+        '''Starts the service.'''
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        '''Stops the service.'''
+        await self.stop()
+
+    async def score(self, doc):
+        '''
+        Scores the given document in the next batch and returns its tfidf values.
+
+                Parameters:
+                        doc (Document): A Document object
+                Returns:
+                        (dict(str, float)): tfidf value of each ngram of the document in the vocabulary of the model,
+                                or of each column if the model hashes ngrams
+                Raises:
+                        TypeError: if doc is not a Document object
+                        ValueError: if n of the model is not less than the length of the document
+                                    or the document has unseen ngrams and the unseen policy of the model is 'error'
+        '''
+        if not isinstance(doc, Document):
+            raise TypeError('Only a Document object can be scored.')
+        if self.__max_n >= doc.n_words:
+            raise ValueError('n value of the model should be less than the length of the document.')
+        await self.start()
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        await self.__queue.put((doc, future, start))
+        result = await future
+        self.__latencies.append(time.perf_counter() - start)
+        self.n_requests += 1
+        return result
+
+    async def __run(self):
+        '''Collects the queued requests into batches and transforms each batch in the executor.'''
+        loop = asyncio.get_running_loop()
+        while True:
+            #kept until its futures are resolved, so that stop can cancel the requests of a batch that is collected or running
+            batch = self.__batch = [await self.__queue.get()]
+            deadline = loop.time() + self.__max_delay
+            while len(batch) < self.__max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                results = await loop.run_in_executor(self.__executor, self.__score_batch, [doc for doc, _, _ in batch])
+            except Exception as e:
+                results = [e]*len(batch)
+            self.n_batches += 1
+            for (_, future, _), result in zip(batch, results):
+                if future.cancelled():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            self.__batch = list()
+
+    def __score_batch(self, docs):
+        '''
+        Transforms the given documents with a single call of the model and returns the values of each document as a dict.
+        If the batch fails, e.g. because a document has unseen ngrams, the documents are transformed one by one
+        so that only the failing requests get the error.
+        '''
+        try:
+            return self.__rows(self.__model.transform(docs, output='csr'))
+        except ValueError:
+            if len(docs) == 1:
+                raise
+        results = list()
+        for d in docs:
+            try:
+                results.append(self.__rows(self.__model.transform([d], output='csr'))[0])
+            except ValueError as e:
+                results.append(e)
+        return results
+
+    def __rows(self, matrix):
+        '''Returns the values of each row of the given CSRMatrix as a dict keyed by the ngram, or the column if the model hashes ngrams.'''
+        vocabulary = self.__model.vocabulary
+        term = vocabulary.term if hasattr(vocabulary, 'term') else str
+        return [{term(int(col)): float(value) for col, value in zip(matrix.indices[start:end], matrix.data[start:end])}
+                for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:])]
+
+    def stats(self):
+        '''
+        Calculates and returns the request statistics of the service.
+        Latency percentiles are calculated over the most recent requests, from submission to result.
+
+                Returns:
+                        (dict): numbers of requests and batches, the mean batch size and the p50, p90, p99 and max latencies in seconds
+        '''
+        latencies = sorted(self.__latencies)
+        stats = {'n_requests': self.n_requests, 'n_batches': self.n_batches,
+                 'mean_batch_size': self.n_requests/self.n_batches if self.n_batches > 0 else 0.0}
+        for name, q in (('p50', 0.5), ('p90', 0.9), ('p99', 0.99), ('max', 1.0)):
+            stats[name] = latencies[min(len(latencies) - 1, int(q*len(latencies)))] if latencies else None
+        return stats
+
+    async def serve(self, host='127.0.0.1', port=8080):
+        '''
+        Starts a minimal HTTP/JSON server for the service and returns it.
+        POST /score with {"content": str} or {"contents": list(str)} responds with {"scores": list(dict(str, float))}
+        and GET /stats responds with the statistics of the service. Every connection serves a single request.
+
+                Parameters:
+                        host (str): Host to listen on
+                        port (int): Port to listen on, 0 for any free port
+                Returns:
+                        (asyncio.Server): the server, which is stopped by closing it
+        '''
+        await self.start()
+        return await asyncio.start_server(self.__handle, host, port)
+
+    async def __handle(self, reader, writer):
+        '''Reads an HTTP request from the given connection, writes the JSON response and closes the connection.'''
+        try:
+            method, path, _ = (await reader.readline()).decode('latin-1').split(' ', 2)
+            length = 0
+            while True:
+                line = (await reader.readline()).decode('latin-1').strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                if name.strip().lower() == 'content-length':
+                    length = int(value)
+            body = await reader.readexactly(length) if length > 0 else b''
+            status, response = await self.__respond(method, path, body)
+        except (ValueError, UnicodeDecodeError, asyncio.IncompleteReadError) as e:
+            status, response = 400, {'error': str(e)}
+        payload = json.dumps(response).encode('utf-8')
+        writer.write(f'HTTP/1.1 {status} {"OK" if status == 200 else "Error"}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + payload)
+        await writer.drain()
+        writer.close()
+
+    async def __respond(self, method, path, body):
+        '''Returns the status and the JSON response of the given request.'''
+        if method == 'GET' and path == '/stats':
+            return 200, self.stats()
+        if method == 'POST' and path == '/score':
+            request = json.loads(body.decode('utf-8'))
+            if type(request) != dict or ('content' not in request and 'contents' not in request):
+                raise ValueError('Request should have a content or contents field.')
+            contents = request['contents'] if 'contents' in request else [request['content']]
+            try:
+                docs = [Document(content) for content in contents]
+            except TypeError as e:
+                raise ValueError(str(e))
+            return 200, {'scores': list(await asyncio.gather(*(self.score(d) for d in docs)))}
+        return 404, {'error': 'Unknown endpoint.'}
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'ScoringService(model={self.model}, max_batch_size={self.max_batch_size}, max_delay={self.max_delay})'
@@ -0,0 +1,141 @@
+from .Document import Document
+from .IdfModel import IdfModel
+from ._weighting import normalize
+import numpy as np
+
+class SimilarityIndex:
+    '''
+    A class to represent an inverted index over the tfidf vectors of a list of Document objects for top-k cosine similarity search.
+    Vectors are calculated with an IdfModel and normalized to unit l2 norm, so the dot product of two vectors is their cosine similarity.
+    The postings of each column keep the documents with a non-zero value in that column, ordered by document,
+    and the highest value of the column.
+
+    Queries accumulate the scores of the documents over the postings of the columns of the query only, in decreasing order of
+    their upper bounds (query value times the highest value of the column). Following the MaxScore strategy, once the k-th best
+    score found so far is higher than the sum of the upper bounds of the remaining columns, documents that have not been scored
+    yet cannot be in the top k, so the remaining postings only update the documents already scored.
+    The pruning is exact and is only used when every value is non-negative, which is the case unless the model hashes ngrams.
+
+    Attributes
+    ----------
+    model: IdfModel
+        Model the vectors of the documents and queries are calculated with
+    documents: tuple(Document)
+        Indexed Document objects, a result id is the position of its document
+    __postings: tuple(np.array(int), np.array(int), np.array(float))
+        Offsets of the columns, and the documents and values of the postings of each column
+    __max_values: np.array(float)
+        Highest absolute value of each column
+    __nonnegative: bool
+        Whether every value of the vectors is non-negative
+    '''
+    def __init__(self, model, docs):
+        '''
+        Constructor for the SimilarityIndex object. Calculates the vectors of the given documents and builds the postings.
+
+                Parameters:
+                        model (IdfModel): A fitted model
+                        docs (list(Document)): List of Document object/s to index
+                Raises:
+                        TypeError: if model is not an IdfModel object or docs is not a list of Document object/s
+                        ValueError: if n of the model is not less than the length of the shortest document
+                                    or a document has unseen ngrams and the unseen policy of the model is 'error'
+        '''
+        if not isinstance(model, IdfModel):
+            raise TypeError('A SimilarityIndex can only be created with an IdfModel object.')
+        matrix = model.transform(docs, output='csr')
+        data = normalize(matrix.indptr, matrix.data.copy(), 'l2')
+        rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+        nonzero = data != 0
+        rows, columns, data = rows[nonzero], matrix.indices[nonzero], data[nonzero]
+        order = np.argsort(columns, kind='stable')
+        offsets = np.zeros(matrix.shape[1] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(columns, minlength=matrix.shape[1]), out=offsets[1:])
+        max_values = np.zeros(matrix.shape[1])
+        np.maximum.at(max_values, columns, np.abs(data))
+        self.__model = model
+        self.__documents = tuple(docs)
+        self.__postings = (offsets, rows[order], data[order])
+        self.__max_values = max_values
+        self.__nonnegative = bool(np.all(data >= 0))
+
+    @property
+    def model(self):
+        '''The getter method for the __model variable.'''
+        return self.__model
+
+    @property
+    def documents(self):
+        '''The getter method for the __documents variable.'''
+        return self.__documents
+
+    def most_similar(self, doc, k=10):
+        '''
+        Finds and returns the k indexed documents most similar to the given document by the cosine similarity of their tfidf vectors.
+        Documents that share no ngram with a non-zero value with the given document are not returned.
+
+                Parameters:
+                        doc (Document): A Document object
+                        k (int): Number of documents to return, an integer bigger than 0
+                Returns:
+                        (list(tuple(int, Document, float))): id, document and similarity of the most similar documents,
+                                in decreasing order of similarity
+                Raises:
+                        TypeError: if doc is not a Document object
+                        ValueError: if k is not an int bigger than 0, n of the model is not less than the length of the document
+                                    or the document has unseen ngrams and the unseen policy of the model is 'error'
+        '''
+        if not isinstance(doc, Document):
+            raise TypeError('Similar documents can only be found for a Document object.')
+        if type(k) != int or k < 1:
+            raise ValueError('k should be an int bigger than 0.')
+        ids, scores = self.__scores(doc, k)
+        top = np.argsort(-scores, kind='stable')[:k]
+        return [(int(ids[i]), self.__documents[ids[i]], float(scores[i])) for i in top]
+
+    def __scores(self, doc, k):
+        '''
+        Accumulates and returns the scores of the documents that share a column with the given document.
+        Documents that cannot be in the top k may be left out.
+
+                Parameters:
+                        doc (Document): A Document object
+                        k (int): Number of documents that will be returned
+                Returns:
+                        ids (np.array(int)): sorted ids of the scored documents
+                        scores (np.array(float)): score of each scored document
+        '''
+        query = self.__model.transform([doc], output='csr')
+        if query.nnz == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        columns, values = query.indices, normalize(query.indptr, query.data.copy(), 'l2')
+        pruning = self.__nonnegative and bool(np.all(values >= 0))
+        bounds = np.abs(values)*self.__max_values[columns]
+        order = np.argsort(-bounds, kind='stable')
+        remaining = np.cumsum(bounds[order][::-1])[::-1]
+        offsets, posting_ids, posting_values = self.__postings
+
+        ids = np.zeros(0, dtype=np.int64)
+        scores = np.zeros(0)
+        for i, t in enumerate(order):
+            start, end = offsets[columns[t]], offsets[columns[t] + 1]
+            if start == end:
+                continue
+            term_ids, term_scores = posting_ids[start:end], values[t]*posting_values[start:end]
+            if pruning and len(scores) >= k and remaining[i] < np.partition(scores, len(scores) - k)[len(scores) - k]:
+                #documents only found from now on cannot reach the k-th best score
+                positions = np.minimum(np.searchsorted(term_ids, ids), len(term_ids) - 1)
+                found = term_ids[positions] == ids
+                scores[found] += term_scores[positions[found]]
+            else:
+                ids, inverse = np.unique(np.concatenate((ids, term_ids)), return_inverse=True)
+                scores = np.bincount(inverse, np.concatenate((scores, term_scores)), minlength=len(ids))
+        return ids, scores
+
+    def __len__(self):
+        '''Returns the number of indexed documents.'''
+        return len(self.__documents)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'SimilarityIndex(n_documents={len(self)}, n_postings={len(self.__postings[1])})'
@@ -0,0 +1,129 @@
+from collections import Counter
+
+class Vocabulary:
+    '''
+    A class to represent a mapping between ngrams and column ids.
+    Column ids are given in the order the ngrams are added. A frozen vocabulary does not accept new ngrams.
+
+    Attributes
+    ----------
+    __columns: dict(str, int)
+        Column id of each ngram
+    __terms: list(str)
+        Ngram of each column id
+    frozen: bool
+        Whether the vocabulary accepts new ngrams
+    '''
+    def __init__(self, terms=None):
+        '''
+        Constructor for the Vocabulary object.
+        Adds the given ngrams in order, ignoring duplicates.
+
+                Parameters:
+                        terms (iterable(str)): Ngrams to add to the vocabulary
+        '''
+        self.__columns = dict()
+        self.__terms = list()
+        self.__frozen = False
+        if terms is not None:
+            self.update(terms)
+
+    @property
+    def frozen(self):
+        '''The getter method for the __frozen variable.'''
+        return self.__frozen
+
+    @property
+    def terms(self):
+        '''Returns the list of ngrams ordered by their column ids.'''
+        return list(self.__terms)
+
+    def freeze(self):
+        '''
+        Freezes the vocabulary so that no more ngrams can be added.
+
+                Returns:
+                        (Vocabulary): the vocabulary itself
+        '''
+        self.__frozen = True
+        return self
+
+    def add(self, term):
+        '''
+        Adds the given ngram to the vocabulary if it is not present and returns its column id.
+
+                Parameters:
+                        term (str): An ngram
+                Returns:
+                        (int): column id of the ngram
+                Raises:
+                        ValueError: if the ngram is not present and the vocabulary is frozen
+        '''
+        col = self.__columns.get(term)
+        if col is None:
+            if self.__frozen:
+                raise ValueError('Ngram cannot be added because the vocabulary is frozen.')
+            col = len(self.__terms)
+            self.__columns[term] = col
+            self.__terms.append(term)
+        return col
+
+    def update(self, terms):
+        '''
+        Adds the given ngrams to the vocabulary in order, ignoring the ones that are present.
+
+                Parameters:
+                        terms (iterable(str)): Ngrams to add to the vocabulary
+                Raises:
+                        ValueError: if an ngram is not present and the vocabulary is frozen
+        '''
+        for term in terms:
+            self.add(term)
+
+    def count(self, ngrams):
+        '''
+        Counts the given ngrams in a single pass and returns the counts by column id.
+        Ngrams that are not present are added unless the vocabulary is frozen, in which case they are left out.
+
+                Parameters:
+                        ngrams (iterable(str) or dict(str, int)): Ngrams of a document or their numbers of occurrences
+                Returns:
+                        (dict(int, int)): number of occurrences of each column id
+        '''
+        counts = dict()
+        for term, count in (ngrams if isinstance(ngrams, dict) else Counter(ngrams)).items():
+            col = self.__columns.get(term)
+            if col is None:
+                if self.__frozen:
+                    continue
+                col = self.add(term)
+            counts[col] = count
+        return counts
+
+    def get(self, term, default=None):
+        '''Returns the column id of the given ngram or default if it is not present.'''
+        return self.__columns.get(term, default)
+
+    def term(self, col):
+        '''Returns the ngram of the given column id.'''
+        return self.__terms[col]
+
+    def __getitem__(self, term):
+        '''Returns the column id of the given ngram. Raises KeyError if it is not present.'''
+        return self.__columns[term]
+
+    def __contains__(self, term):
+        '''Returns whether the given ngram is present in the vocabulary.'''
+        return term in self.__columns
+
+    def __iter__(self):
+        '''Iterates over the ngrams ordered by their column ids.'''
+        return iter(self.__terms)
+
+    def __len__(self):
+        '''Returns the number of ngrams in the vocabulary.'''
+        return len(self.__terms)
+
+    def __repr__(self):
+        '''The representation function.'''
+        return f'Vocabulary(n_terms={len(self)}, frozen={self.frozen})'
@@ -1,2 +1,51 @@
-from .Corpus import Corpus
-from .Document import Document
\ No newline at end of file
+from .Document import Document
+import sys
+import types
+
+#classes that depend on numpy are imported on first access, so that importing the package stays cheap
+_LAZY = ('Corpus', 'DocumentFrequency', 'CSRMatrix', 'Vocabulary', 'IdfModel', 'MappedVocabulary', 'FeatureHasher', 'SimilarityIndex', 'NgramCache', 'LRUCache', 'ScoringService', 'Profiler')
+
+__all__ = ['Document', *_LAZY]
+
+def _load():
+    '''Imports the lazily imported classes and binds them to the package.'''
+    from .Corpus import Corpus
+    from .DocumentFrequency import DocumentFrequency
+    from .CSRMatrix import CSRMatrix
+    from .Vocabulary import Vocabulary
+    from .IdfModel import IdfModel
+    from .MappedVocabulary import MappedVocabulary
+    from .FeatureHasher import FeatureHasher
+    from .SimilarityIndex import SimilarityIndex
+    from .NgramCache import NgramCache
+    from .LRUCache import LRUCache
+    from .ScoringService import ScoringService
+    from .Profiler import Profiler
+    globals().update(Corpus=Corpus, DocumentFrequency=DocumentFrequency, CSRMatrix=CSRMatrix,
+                     Vocabulary=Vocabulary, IdfModel=IdfModel, MappedVocabulary=MappedVocabulary, FeatureHasher=FeatureHasher,
+                     SimilarityIndex=SimilarityIndex, NgramCache=NgramCache, LRUCache=LRUCache, ScoringService=ScoringService,
+                     Profiler=Profiler)
+
+class _Package(types.ModuleType):
+    '''
+    The type of the package, which resolves the lazily imported classes even after their modules are imported.
+    Importing a module of the package, e.g. tfidf.Corpus, binds the module to the name of its class in the package,
+    in which case __getattr__ is not called, so such a module is replaced with the class on access.
+    '''
+    def __getattribute__(self, name):
+        if name in _LAZY and isinstance(types.ModuleType.__getattribute__(self, '__dict__').get(name), types.ModuleType):
+            _load()
+        return super().__getattribute__(name)
+
+sys.modules[__name__].__class__ = _Package
+
+def __getattr__(name):
+    '''Imports the lazily imported classes on first access.'''
+    if name in _LAZY:
+        _load()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    '''Lists the attributes of the package including the lazily imported classes.'''
+    return sorted(set(globals()) | set(_LAZY))
\ No newline at end of file
@@ -0,0 +1,38 @@
+import os
+
+def check_workers(workers):
+    '''
+    Validates and returns the number of worker processes.
+
+            Parameters:
+                    workers (int or None): Number of worker processes, None for the number of CPUs
+            Returns:
+                    (int): number of worker processes
+            Raises:
+                    ValueError: if workers is not None or an int bigger than 0
+    '''
+    if workers is None:
+        return os.cpu_count() or 1
+    if type(workers) != int or workers < 1:
+        raise ValueError('workers should be None or an int bigger than 0.')
+    return workers
+
+def shards(items, k):
+    '''
+    Splits the given list into at most k contiguous shards of nearly equal length, keeping the order of the items.
+
+            Parameters:
+                    items (list): Items to split
+                    k (int): Number of shards
+            Returns:
+                    (list(list)): non-empty shards of the items
+    '''
+    size, rest = divmod(len(items), k)
+    result = list()
+    start = 0
+    for i in range(k):
+        end = start + size + (1 if i < rest else 0)
+        if end > start:
+            result.append(items[start:end])
+        start = end
+    return result
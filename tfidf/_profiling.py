@@ -0,0 +1,37 @@
+#profiler of the process that the instrumented code reports to, None when profiling is disabled
+active = None
+
+class _NullStage:
+    '''A context manager that does nothing, returned by stage when profiling is disabled.'''
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+def stage(name):
+    '''
+    Returns a context manager timing the given stage with the active profiler, or one that does nothing if profiling is disabled.
+    Hot paths called for every document check active themselves instead, to avoid the call when profiling is disabled.
+
+            Parameters:
+                    name (str): Name of the stage
+            Returns:
+                    (context manager): the timer of the stage
+    '''
+    profiler = active
+    return _NULL_STAGE if profiler is None else profiler.stage(name)
+
+def count(name, value=1):
+    '''Adds the given value to the counter of the active profiler with the given name, if profiling is enabled.'''
+    profiler = active
+    if profiler is not None:
+        profiler.count(name, value)
+
+def gauge(name, value):
+    '''Sets the counter of the active profiler with the given name to the given value, if profiling is enabled.'''
+    profiler = active
+    if profiler is not None:
+        profiler.gauge(name, value)
@@ -0,0 +1,129 @@
+import numpy as np
+
+NORMS = (None, 'l1', 'l2')
+
+def check_options(sublinear_tf, norm):
+    '''
+    Validates the weighting options of tfidf values.
+
+            Parameters:
+                    sublinear_tf (bool): whether to replace the counts of the ngrams with 1 + log(count)
+                    norm (str or None): None, 'l1' or 'l2' for the normalization of the rows
+            Raises:
+                    ValueError: if sublinear_tf is not a bool or norm is unknown
+    '''
+    if type(sublinear_tf) != bool:
+        raise ValueError('sublinear_tf should be a bool.')
+    if norm not in NORMS:
+        raise ValueError("norm should be one of None, 'l1' or 'l2'.")
+
+def check_pruning(min_df, max_df, max_features):
+    '''
+    Validates the pruning options of a vocabulary as far as possible before any document is counted.
+    A count and a ratio limit can only be compared once the number of documents is known.
+
+            Parameters:
+                    min_df (int or float): Minimum number, or ratio if it is a float, of documents an ngram appears in
+                    max_df (int or float): Maximum number, or ratio if it is a float, of documents an ngram appears in
+                    max_features (int): Number of ngrams with the highest document frequencies to keep, None to keep every ngram
+            Raises:
+                    ValueError: if min_df or max_df is not a non-negative int or a float in range 0 to 1,
+                                min_df is bigger than max_df or max_features is not None or an int bigger than 0
+    '''
+    for df in (min_df, max_df):
+        if not ((type(df) == int and df >= 0) or (type(df) == float and 0.0 <= df <= 1.0)):
+            raise ValueError('Document frequency limits should be non-negative ints or floats in range 0 to 1.')
+    if type(min_df) == type(max_df) and min_df > max_df:
+        raise ValueError('min_df should not be bigger than max_df.')
+    if max_features is not None and (type(max_features) != int or max_features < 1):
+        raise ValueError('max_features should be None or an int bigger than 0.')
+
+def idf_values(df, n_documents, smooth_idf=False):
+    '''
+    Calculates and returns the idf values of the given document frequencies.
+    The standard formula is log(n_documents/(1 + df)) and the smooth formula is log((1 + n_documents)/(1 + df)) + 1,
+    which acts as if every ngram appears in one more document and keeps the idf values of common ngrams above zero.
+
+            Parameters:
+                    df (array-like(int)): Number of documents each ngram appears in
+                    n_documents (int): Number of documents
+                    smooth_idf (bool): whether to use the smooth formula
+            Returns:
+                    (np.array(float)): idf value of each ngram
+            Raises:
+                    ValueError: if smooth_idf is not a bool
+    '''
+    if type(smooth_idf) != bool:
+        raise ValueError('smooth_idf should be a bool.')
+    df = np.asarray(df, dtype=np.float64)
+    if smooth_idf:
+        return np.log((1 + n_documents)/(1 + df)) + 1
+    return np.log(n_documents/(1 + df))
+
+def count_arrays(counts):
+    '''
+    Concatenates the given counts of the rows into the arrays of a CSR matrix with sorted columns in each row.
+
+            Parameters:
+                    counts (list(dict(int, int))): counts of the columns of each row
+            Returns:
+                    indptr (np.array(int)): offsets of the rows
+                    indices (np.array(int)): columns of the counts
+                    data (np.array(float)): counts
+    '''
+    sizes = np.fromiter((len(c) for c in counts), dtype=np.int64, count=len(counts))
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=indptr[1:])
+    indices = np.fromiter((col for c in counts for col in c), dtype=np.int64, count=indptr[-1])
+    data = np.fromiter((count for c in counts for count in c.values()), dtype=np.float64, count=indptr[-1])
+    order = np.lexsort((indices, np.repeat(np.arange(len(counts)), sizes)))
+    return indptr, indices[order], data[order]
+
+def weight(indptr, indices, data, lengths, idf, sublinear_tf=False, norm=None):
+    '''
+    Turns the given counts of a CSR matrix into tfidf values in place, without a loop over the ngrams.
+    Term frequencies are the counts, or 1 + log(count) keeping the sign of the count if sublinear_tf is True,
+    divided by the number of ngrams of the row. They are multiplied by the idf values of their columns and the rows are
+    optionally divided by their l1 or l2 norms.
+
+            Parameters:
+                    indptr (np.array(int)): offsets of the rows
+                    indices (np.array(int)): columns of the counts
+                    data (np.array(float)): counts, replaced by the tfidf values
+                    lengths (np.array(int)): number of ngrams of each row
+                    idf (np.array(float)): idf value of each column
+                    sublinear_tf (bool): whether to replace the counts with 1 + log(count)
+                    norm (str or None): None, 'l1' or 'l2' for the normalization of the rows
+            Returns:
+                    (np.array(float)): data
+    '''
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    if sublinear_tf:
+        np.copysign(1 + np.log(np.abs(data)), data, out=data)
+    data /= np.asarray(lengths, dtype=np.float64)[rows]
+    data *= idf[indices]
+    if norm is not None:
+        normalize(indptr, data, norm, rows)
+    return data
+
+def normalize(indptr, data, norm, rows=None):
+    '''
+    Divides the rows of a CSR matrix by their l1 or l2 norms in place. Rows of zeros are left as they are.
+
+            Parameters:
+                    indptr (np.array(int)): offsets of the rows
+                    data (np.array(float)): values of the matrix
+                    norm (str): 'l1' or 'l2'
+                    rows (np.array(int)): row of each value, calculated from indptr if it is None
+            Returns:
+                    (np.array(float)): data
+    '''
+    if rows is None:
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    #bincount returns ints for an empty matrix, which the in-place sqrt cannot write to
+    norms = np.bincount(rows, np.abs(data) if norm == 'l1' else data*data, minlength=len(indptr) - 1).astype(np.float64)
+    if norm == 'l2':
+        np.sqrt(norms, out=norms)
+    norms[norms == 0] = 1
+    data /= norms[rows]
+    return data